@@ -0,0 +1 @@
+"""Maintenance commands, run from apps/backend as ``python -m app.commands.<name>``."""
@@ -0,0 +1,223 @@
+"""Run every router query shape through explain() and report how it is served.
+
+For each query the report shows the winning plan, keys and documents examined, documents
+returned and median wall-clock latency. The command exits non-zero if any query that is
+expected to be indexed falls back to a COLLSCAN, so it can gate deploys and CI.
+
+Usage (from apps/backend):
+    # audit the configured database
+    python -m app.commands.index_audit
+    # audit a throwaway database seeded with 20k synthetic players
+    python -m app.commands.index_audit --db walle_audit --seed 20000
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Iterator, Literal
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from app.commands.seed import seed_database
+from app.core.config import get_settings
+from app.core.database import init_database
+from app.models.payment import PaymentStatus
+from app.models.player import PlayedJyplS7, RegistrationStatus, TshirtSize
+from app.services.player_search import build_player_filter
+from app.services.waitlist import SLOT_HOLDING_STATUSES
+
+NEWEST_FIRST = {"created_at": -1}
+ADMIN_PAGE_SIZE = 50
+
+
+@dataclass
+class QueryShape:
+    name: str
+    collection: Literal["players", "payments"]
+    filter: dict[str, Any]
+    kind: Literal["find", "count", "distinct"] = "find"
+    sort: dict[str, int] = field(default_factory=dict)
+    limit: int = 0
+    distinct_key: str | None = None
+
+
+async def admin_listing_shapes() -> list[tuple[str, dict[str, Any]]]:
+    """(label, filter) for each filter and search the admin listing supports."""
+    cases = {
+        "no filter": {},
+        "registration_status": {"registration_status": RegistrationStatus.WAITLIST},
+        "payment_status": {"payment_status": PaymentStatus.CAPTURED},
+        "tshirt_size": {"tshirt_size": TshirtSize.M},
+        "played_jypl_s7": {"played_jypl_s7": PlayedJyplS7.YES},
+        "status + tshirt_size": {"registration_status": RegistrationStatus.PAID, "tshirt_size": TshirtSize.L},
+        "search email prefix": {"q": "player12@"},
+        "search phone prefix": {"q": "98000012"},
+        "search text": {"q": "Rahul"},
+        "status + search text": {"registration_status": RegistrationStatus.WAITLIST, "q": "Shah"},
+    }
+    return [(label, await build_player_filter(**kwargs)) for label, kwargs in cases.items()]
+
+
+async def build_query_shapes(database: AsyncIOMotorDatabase) -> list[QueryShape]:
+    """The queries the routers and services issue, filled in with real sample values."""
+    player = await database.players.find_one({}, sort=[("created_at", -1)]) or {}
+    payment = await database.payments.find_one({}) or {}
+    player_id = player.get("_id", ObjectId())
+    page_ids = [doc["_id"] async for doc in database.players.find({}, {"_id": 1}).limit(ADMIN_PAGE_SIZE)]
+    order_id = payment.get("razorpay_order_id", "order_missing")
+
+    shapes = [
+        QueryShape("register: duplicate email", "players", {"email_key": player.get("email_key", "x@example.com")}, limit=1),
+        QueryShape("register: duplicate phone", "players", {"phone_key": player.get("phone_key", "+910000000000")}, limit=1),
+        QueryShape("resume-payment: by email", "players", {"email_key": player.get("email_key", "x@example.com")}, limit=1),
+        QueryShape("player detail / create-order: by id", "players", {"_id": player_id}, limit=1),
+        QueryShape(
+            "admin bulk: oldest waitlisted",
+            "players",
+            {"registration_status": RegistrationStatus.WAITLIST.value},
+            sort={"created_at": 1},
+            limit=150,
+        ),
+        QueryShape("admin bulk: by ids", "players", {"_id": {"$in": page_ids}}),
+        QueryShape(
+            "scheduler: slot-holding count",
+            "players",
+            {"registration_status": {"$in": [s.value for s in SLOT_HOLDING_STATUSES]}},
+            kind="count",
+        ),
+        QueryShape(
+            "scheduler: payment-window expiry",
+            "players",
+            {
+                "registration_status": RegistrationStatus.APPROVED.value,
+                "approved_at": {"$lt": datetime.now(timezone.utc)},
+            },
+        ),
+        QueryShape(
+            "create-order: already captured?",
+            "payments",
+            {"player_id": player_id, "status": PaymentStatus.CAPTURED.value},
+            limit=1,
+        ),
+        QueryShape(
+            "verify: order + player",
+            "payments",
+            {"razorpay_order_id": order_id, "player_id": payment.get("player_id", player_id)},
+            limit=1,
+        ),
+        QueryShape("webhook: by order id", "payments", {"razorpay_order_id": order_id}, limit=1),
+        QueryShape("admin listing: payments join", "payments", {"player_id": {"$in": page_ids}}),
+        QueryShape(
+            "admin filter: players by payment status",
+            "payments",
+            {"status": PaymentStatus.CAPTURED.value},
+            kind="distinct",
+            distinct_key="player_id",
+        ),
+    ]
+    for label, filter_ in await admin_listing_shapes():
+        shapes.append(
+            QueryShape(f"admin listing: {label}", "players", filter_, sort=NEWEST_FIRST, limit=ADMIN_PAGE_SIZE)
+        )
+        if filter_:
+            shapes.append(QueryShape(f"admin listing: {label} (count)", "players", filter_, kind="count"))
+    return shapes
+
+
+def plan_stages(node: Any) -> Iterator[str]:
+    """Yield every stage name in an explain plan tree (classic and SBE layouts)."""
+    if isinstance(node, dict):
+        if "stage" in node:
+            yield node["stage"]
+        for value in node.values():
+            yield from plan_stages(value)
+    elif isinstance(node, list):
+        for item in node:
+            yield from plan_stages(item)
+
+
+async def explain_shape(database: AsyncIOMotorDatabase, shape: QueryShape) -> dict[str, Any]:
+    if shape.kind == "count":
+        command: dict[str, Any] = {"count": shape.collection, "query": shape.filter}
+    elif shape.kind == "distinct":
+        command = {"distinct": shape.collection, "key": shape.distinct_key, "query": shape.filter}
+    else:
+        command = {"find": shape.collection, "filter": shape.filter}
+        if shape.sort:
+            command["sort"] = shape.sort
+        if shape.limit:
+            command["limit"] = shape.limit
+    return await database.command("explain", command, verbosity="executionStats")
+
+
+async def time_shape(database: AsyncIOMotorDatabase, shape: QueryShape, repeat: int) -> float:
+    """Median wall-clock milliseconds for actually running the query."""
+    collection = database[shape.collection]
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        if shape.kind == "count":
+            await collection.count_documents(shape.filter)
+        elif shape.kind == "distinct":
+            await collection.distinct(shape.distinct_key, shape.filter)
+        else:
+            cursor = collection.find(shape.filter)
+            if shape.sort:
+                cursor = cursor.sort(list(shape.sort.items()))
+            if shape.limit:
+                cursor = cursor.limit(shape.limit)
+            await cursor.to_list(length=None)
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", default=None, help="Database to audit (defaults to MONGO_DB)")
+    parser.add_argument("--seed", type=int, default=0, help="Drop --db and seed this many synthetic players")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per query")
+    args = parser.parse_args()
+
+    settings = get_settings()
+    database_name = args.db or settings.mongo_db
+    if args.seed and database_name == settings.mongo_db:
+        raise SystemExit("--seed needs a scratch --db, not the configured database")
+
+    client = await init_database(settings, database_name)
+    database = client[database_name]
+    failures = 0
+    try:
+        if args.seed:
+            await database.players.delete_many({})
+            await database.payments.delete_many({})
+            await seed_database(database, args.seed, settings.registration_fee_inr * 100)
+            print(f"🌱 Seeded {args.seed} players into '{database_name}'")
+
+        print(f"{'':2} {'query':<52} {'plan':<34} {'keys':>7} {'docs':>7} {'nret':>6} {'ms':>8}")
+        for shape in await build_query_shapes(database):
+            explain = await explain_shape(database, shape)
+            stages = list(plan_stages(explain["queryPlanner"]["winningPlan"]))
+            stats = explain.get("executionStats", {})
+            latency = await time_shape(database, shape, args.repeat)
+            ok = "COLLSCAN" not in stages
+            failures += not ok
+            print(
+                f"{'✅' if ok else '❌'} {shape.name:<52} {' <- '.join(stages)[:34]:<34} "
+                f"{stats.get('totalKeysExamined', '-'):>7} {stats.get('totalDocsExamined', '-'):>7} "
+                f"{stats.get('nReturned', '-'):>6} {latency:>8.2f}"
+            )
+    finally:
+        client.close()
+
+    if failures:
+        print(f"❌ {failures} query shape(s) fell back to a collection scan")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,208 @@
+"""Prepare the database for this build. Run once per deploy, before the web workers start.
+
+The web app no longer builds indexes or seeds documents during boot, so this is where that
+happens:
+
+- the indexes declared on the Beanie models are synced; indexes that are no longer declared
+  (or were created with different options, such as the non-unique email_1/phone_1/
+  razorpay_order_id_1 left by older builds) are dropped and the declared set is built
+- the rate_limits TTL index is created when RATE_LIMIT_STORE=mongo
+- the GridFS bucket indexes are created when STORAGE_MODE=gridfs (the driver would otherwise
+  build them on the first upload of a fresh bucket)
+- numbered data migrations that have not run yet are applied in order and recorded in the
+  `migrations` collection; migration 1 rewrites players stored with flat, free-form fields
+  into the personal/cricket/jersey subdocuments with coded enums, in bulk batches, and
+  rebuilds the dashboard stats. Players whose values do not fit the schema are listed and
+  left unconverted (and the migration unrecorded) until they are fixed and the command rerun.
+  Workers from before the migration cannot read or write the nested shape, so this build
+  cannot be rolled out alongside them: stop the old workers before migrating
+- players written before email_key/phone_key existed are backfilled in bulk batches; players
+  whose keys clash with another player's (the same email in a different case, the same
+  number typed differently) are listed and left unkeyed for an admin to merge
+- the default AppConfig document is created if missing, and its slots_held counter (players
+  holding a registration_cap slot, which the waitlist scheduler promotes against) is recounted
+
+The command exits with status 1 when a migration is left incomplete, so `release:` and
+`migrate && server` do not start the web workers.
+
+Usage (from apps/backend):
+    python -m app.commands.migrate [--batch-size 500]
+"""
+
+import argparse
+import asyncio
+from datetime import datetime, timezone
+from typing import Awaitable, Callable
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pydantic import ValidationError
+from pymongo import ASCENDING, UpdateOne
+from pymongo.errors import BulkWriteError
+
+from app.core.config import get_settings
+from app.core.database import DOCUMENT_MODELS, init_database
+from app.core.identity import email_key, phone_key
+from app.models.config import AppConfig
+from app.models.player import FIELD_PATHS, PATH_FIELDS, SECTION_MODELS, Player, nest_details
+from app.services.rate_limit import MongoBucketStore
+from app.services.stats import rebuild_stats
+from app.services.waitlist import sync_slot_counter
+
+DUPLICATE_KEY_ERROR = 11000
+FLAT_PLAYER = {"personal": {"$exists": False}}
+
+
+async def compact_players(batch_size: int) -> tuple[int, list[str]]:
+    """Move flat player fields into the subdocuments, storing enum codes instead of labels.
+
+    Returns (rewritten, problem descriptions). Labels are matched case-insensitively, so
+    "YES" and "Yes" both become "Y"; anything else that does not validate is reported and
+    the player is left as it was.
+    """
+    collection = Player.get_motor_collection()
+    cursor = collection.find(FLAT_PLAYER, dict.fromkeys(FIELD_PATHS, 1), batch_size=batch_size)
+    rewritten = 0
+    problems: list[str] = []
+    batch: list[UpdateOne] = []
+    async for document in cursor:
+        details = {field: document[field] for field in FIELD_PATHS if document.get(field) is not None}
+        sections = {}
+        try:
+            for section, values in nest_details(details).items():
+                sections[section] = SECTION_MODELS[section].model_validate(values).model_dump(mode="json")
+        except ValidationError as exc:
+            error = exc.errors()[0]
+            path = ".".join([section, *(str(part) for part in error["loc"])])
+            problems.append(f"{document['_id']}: {PATH_FIELDS.get(path, path)} {error.get('input')!r}: {error['msg']}")
+            continue
+        if len(sections) < len(SECTION_MODELS):
+            problems.append(f"{document['_id']}: missing {', '.join(sorted(set(SECTION_MODELS) - set(sections)))}")
+            continue
+        batch.append(UpdateOne(
+            {"_id": document["_id"], **FLAT_PLAYER},
+            # The stored representation changes, so cached ETags must not match any more
+            {"$set": sections, "$unset": dict.fromkeys(FIELD_PATHS, ""), "$inc": {"revision": 1}},
+        ))
+        if len(batch) >= batch_size:
+            rewritten += (await collection.bulk_write(batch, ordered=False)).modified_count
+            batch = []
+    if batch:
+        rewritten += (await collection.bulk_write(batch, ordered=False)).modified_count
+
+    # The breakdowns were keyed by whatever free-form strings had been submitted
+    await rebuild_stats()
+    return rewritten, problems
+
+
+# Data migrations, each applied once, in order; applied versions are kept in `migrations`
+MIGRATIONS: list[tuple[int, str, Callable[[int], Awaitable[tuple[int, list[str]]]]]] = [
+    (1, "compact player schema", compact_players),
+]
+
+
+async def run_migrations(database: AsyncIOMotorDatabase, batch_size: int) -> bool:
+    """Apply pending migrations; False if one left problems behind (later ones are not run)."""
+    applied = {document["_id"] async for document in database.migrations.find({}, {"_id": 1})}
+    for version, name, migration in MIGRATIONS:
+        if version in applied:
+            continue
+        rewritten, problems = await migration(batch_size)
+        print(f"🧱 Migration {version} ({name}): rewrote {rewritten} players")
+        for problem in problems:
+            print(f"   ⚠️  {problem}")
+        if problems:
+            print(f"   ❌ Migration {version} is incomplete; fix the players above and run this again")
+            return False
+        await database.migrations.insert_one(
+            {"_id": version, "name": name, "applied_at": datetime.now(timezone.utc)}
+        )
+    return True
+
+
+async def backfill_identity_keys(batch_size: int) -> tuple[int, list[str]]:
+    """Set email_key/phone_key on players missing them. Returns (updated, problem descriptions)."""
+    collection = Player.get_motor_collection()
+    cursor = collection.find(
+        {"$or": [{"email_key": {"$exists": False}}, {"phone_key": {"$exists": False}}]},
+        # Players a migration could not convert yet still have the flat fields
+        {"personal.email": 1, "personal.phone": 1, "email": 1, "phone": 1},
+        batch_size=batch_size,
+    )
+    updated = 0
+    problems: list[str] = []
+
+    async def flush(batch: list[UpdateOne], ids: list) -> None:
+        nonlocal updated
+        try:
+            result = await collection.bulk_write(batch, ordered=False)
+            updated += result.modified_count
+        except BulkWriteError as exc:
+            updated += exc.details.get("nModified", 0)
+            for error in exc.details.get("writeErrors", []):
+                if error.get("code") != DUPLICATE_KEY_ERROR:
+                    raise
+                problems.append(f"{ids[error['index']]}: duplicate of {error.get('keyValue') or error.get('errmsg')}")
+
+    batch: list[UpdateOne] = []
+    ids: list = []
+    async for document in cursor:
+        contact = document.get("personal") or document
+        keys = {"email_key": email_key(contact.get("email", "")), "phone_key": phone_key(contact.get("phone", ""))}
+        if not keys["email_key"]:
+            keys["email_key"] = None
+            problems.append(f"{document['_id']}: no email")
+        if keys["phone_key"] is None:
+            problems.append(f"{document['_id']}: unparseable phone {contact.get('phone')!r}")
+        batch.append(UpdateOne({"_id": document["_id"]}, {"$set": keys}))
+        ids.append(document["_id"])
+        if len(batch) >= batch_size:
+            await flush(batch, ids)
+            batch, ids = [], []
+    if batch:
+        await flush(batch, ids)
+    return updated, problems
+
+
+async def main(batch_size: int) -> None:
+    settings = get_settings()
+    client = await init_database(settings, allow_index_dropping=True)
+    try:
+        for model in DOCUMENT_MODELS:
+            info = await model.get_motor_collection().index_information()
+            print(f"🗂️  {model.get_settings().name}: {', '.join(sorted(info))}")
+
+        if settings.rate_limit_store == "mongo":
+            await MongoBucketStore(client[settings.mongo_db]).ensure_indexes()
+            print("🗂️  rate_limits: expires_at_ttl")
+
+        if settings.storage_mode == "gridfs":
+            database = client[settings.mongo_db]
+            bucket = settings.gridfs_bucket
+            await database[f"{bucket}.files"].create_index([("filename", ASCENDING), ("uploadDate", ASCENDING)])
+            await database[f"{bucket}.chunks"].create_index([("files_id", ASCENDING), ("n", ASCENDING)], unique=True)
+            print(f"🗂️  {bucket}.files / {bucket}.chunks: GridFS indexes")
+
+        migrated = await run_migrations(client[settings.mongo_db], batch_size)
+
+        updated, problems = await backfill_identity_keys(batch_size)
+        print(f"🔑 Backfilled identity keys on {updated} players")
+        for problem in problems:
+            print(f"   ⚠️  {problem}")
+
+        await AppConfig.get_or_create()
+        held = await sync_slot_counter()
+        print(f"🎟️  {held} players hold a registration slot")
+    finally:
+        client.close()
+
+    if not migrated:
+        # A non-zero exit stops the release step from starting this build on a half-migrated database
+        raise SystemExit(1)
+    print("✅ Database is ready")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=500, help="players per bulk write")
+    args = parser.parse_args()
+    asyncio.run(main(args.batch_size))
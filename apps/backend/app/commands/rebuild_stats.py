@@ -0,0 +1,26 @@
+"""Recompute the admin dashboard stats document from the players and payments collections.
+
+Usage (from apps/backend):
+    python -m app.commands.rebuild_stats
+"""
+
+import asyncio
+
+from app.core.config import get_settings
+from app.core.database import init_database
+from app.services.stats import rebuild_stats
+
+
+async def main() -> None:
+    client = await init_database(get_settings())
+    try:
+        stats = await rebuild_stats()
+        print(f"📊 Rebuilt stats: {stats.total} players, {stats.payments_captured} captured payments")
+        for status_name, count in sorted(stats.by_status.items()):
+            print(f"   {status_name}: {count}")
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
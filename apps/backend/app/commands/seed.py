@@ -0,0 +1,131 @@
+"""Seed a scratch database with synthetic players and payments for audits and benchmarks.
+
+Usage (from apps/backend):
+    python -m app.commands.seed --players 5000 --db walle_bench
+"""
+
+import argparse
+import asyncio
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+
+from app.core.config import get_settings
+from app.models.player import BattingType, BowlingType, PlayedJyplS7, TshirtSize, WicketKeeper
+
+FIRST_NAMES = ["Meet", "Sanyam", "Vinod", "Rakesh", "Rahul", "Amit", "Karan", "Nikhil", "Jay", "Harsh"]
+LAST_NAMES = ["Jain", "Bafna", "Chauhan", "Shah", "Mehta", "Soni", "Kothari", "Zaveri"]
+AREAS = ["Mumbai", "Borivali", "Byculla", "Prabhadevi", "Zaveri Bazaar", "Malad"]
+WAIST_SIZES = [28, 30, 32, 34, 36, 38, 40, 42]
+# Roughly the status mix of a registration season in progress
+STATUS_WEIGHTS = {"WAITLIST": 40, "APPROVED": 10, "PENDING_PAYMENT": 10, "PAID": 30, "REJECTED": 5, "EXPIRED": 5}
+
+
+def fake_player_document(index: int, rng: random.Random, created_at: datetime) -> dict[str, Any]:
+    """A raw players-collection document shaped like the ones the registration route writes."""
+    first_name = rng.choice(FIRST_NAMES)
+    last_name = rng.choice(LAST_NAMES)
+    registration_status = rng.choices(list(STATUS_WEIGHTS), weights=list(STATUS_WEIGHTS.values()))[0]
+    played = rng.random() < 0.7
+    return {
+        "_id": ObjectId(),
+        "personal": {
+            "first_name": first_name,
+            "last_name": last_name,
+            "email": f"player{index}@example.com",
+            "phone": f"98{index:08d}",
+            "area": rng.choice(AREAS),
+            "firm": f"{last_name} Jewellers {index % 97}",
+            "designation": rng.choice(["Partner", "Owner", "Director"]),
+            "photo_url": f"/uploads/{index:032x}.png",
+            "card_url": f"/uploads/{index:032x}-card.png",
+        },
+        "cricket": {
+            "batting": rng.choice(list(BattingType)).value,
+            "bowling": rng.choice(list(BowlingType)).value,
+            "keeper": rng.choice(list(WicketKeeper)).value,
+            "jypl_s7": (PlayedJyplS7.YES if played else PlayedJyplS7.NO).value,
+            "jypl_s7_team": f"Team {rng.randint(1, 12)}" if played else "",
+        },
+        "jersey": {
+            "name": first_name,
+            "size": rng.choice(list(TshirtSize)).value,
+            "waist": rng.choice(WAIST_SIZES),
+        },
+        "email_key": f"player{index}@example.com",
+        "phone_key": f"+9198{index:08d}",
+        "registration_status": registration_status,
+        "created_at": created_at,
+        "approved_at": created_at + timedelta(hours=6) if registration_status != "WAITLIST" else None,
+    }
+
+
+def fake_payment_document(player: dict[str, Any], index: int, amount_paise: int) -> dict[str, Any]:
+    captured = player["registration_status"] == "PAID"
+    return {
+        "_id": ObjectId(),
+        "player_id": player["_id"],
+        "razorpay_order_id": f"order_seed{index:010d}",
+        "razorpay_payment_id": f"pay_seed{index:010d}" if captured else None,
+        "razorpay_signature": None,
+        "status": "CAPTURED" if captured else "CREATED",
+        "amount": amount_paise,
+        "currency": "INR",
+        "created_at": player["created_at"] + timedelta(hours=7),
+        "confirmation_email_sent": captured,
+    }
+
+
+async def seed_database(
+    database: AsyncIOMotorDatabase,
+    players: int,
+    amount_paise: int = 1500000,
+    batch_size: int = 1000,
+    random_seed: int = 8,
+) -> None:
+    """Replace the players and payments collections with `players` synthetic registrations."""
+    rng = random.Random(random_seed)
+    await database.players.delete_many({})
+    await database.payments.delete_many({})
+
+    start = datetime.now(timezone.utc) - timedelta(days=30)
+    step = timedelta(days=30) / max(players, 1)
+    for offset in range(0, players, batch_size):
+        player_docs = [
+            fake_player_document(index, rng, start + step * index)
+            for index in range(offset, min(offset + batch_size, players))
+        ]
+        payment_docs = [
+            fake_payment_document(player, offset + position, amount_paise)
+            for position, player in enumerate(player_docs)
+            if player["registration_status"] in ("PAID", "APPROVED", "PENDING_PAYMENT")
+        ]
+        await database.players.insert_many(player_docs, ordered=False)
+        if payment_docs:
+            await database.payments.insert_many(payment_docs, ordered=False)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--players", type=int, default=5000)
+    parser.add_argument("--db", required=True, help="Scratch database name (never the live one)")
+    parser.add_argument("--mongo-url", default=None)
+    args = parser.parse_args()
+
+    settings = get_settings()
+    if args.db == settings.mongo_db:
+        raise SystemExit(f"Refusing to seed the configured database '{args.db}'")
+
+    client = AsyncIOMotorClient(args.mongo_url or settings.mongo_url)
+    try:
+        await seed_database(client[args.db], args.players, settings.registration_fee_inr * 100)
+        print(f"🌱 Seeded {args.players} players into '{args.db}'")
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -18,15 +18,20 @@ load_dotenv(ROOT_ENV_PATH, override=False)
 class Settings(BaseSettings):
 	mongo_url: str = Field(..., alias="MONGO_URL")
 	mongo_db: str = Field(..., alias="MONGO_DB")
+	# Per worker process; total connections = workers x MONGO_MAX_POOL_SIZE
+	mongo_max_pool_size: int = Field(default=20, alias="MONGO_MAX_POOL_SIZE")
+	mongo_min_pool_size: int = Field(default=2, alias="MONGO_MIN_POOL_SIZE")
 	cors_origins: str | list[str] = Field(default_factory=list, alias="CORS_ORIGINS")
 
 	razorpay_key_id: str = Field(..., alias="RAZORPAY_KEY_ID")
 	razorpay_key_secret: str = Field(..., alias="RAZORPAY_KEY_SECRET")
 	razorpay_webhook_secret: str | None = Field(default=None, alias="RAZORPAY_WEBHOOK_SECRET")
+	razorpay_api_url: str = Field(default="https://api.razorpay.com/v1", alias="RAZORPAY_API_URL")
 
 	registration_fee_inr: int = Field(default=15000, alias="REGISTRATION_FEE_INR")
 
-	storage_mode: Literal["local", "s3", "cloudinary"] = Field(default="local", alias="STORAGE_MODE")
+	uploads_dir: Path | None = Field(default=None, alias="UPLOADS_DIR")
+	storage_mode: Literal["local", "s3", "cloudinary", "gridfs"] = Field(default="local", alias="STORAGE_MODE")
 	s3_bucket: str | None = Field(default=None, alias="S3_BUCKET")
 	s3_region: str | None = Field(default=None, alias="S3_REGION")
 	s3_access_key_id: str | None = Field(default=None, alias="S3_ACCESS_KEY_ID")
@@ -37,11 +42,59 @@ class Settings(BaseSettings):
 	cloudinary_api_secret: str | None = Field(default=None, alias="CLOUDINARY_API_SECRET")
 	cloudinary_folder: str = Field(default="walle-register", alias="CLOUDINARY_FOLDER")
 
+	# STORAGE_MODE=gridfs: files live in MONGO_DB and are served by /api/files/{id}
+	gridfs_bucket: str = Field(default="uploads", alias="GRIDFS_BUCKET")
+	gridfs_chunk_bytes: int = Field(default=255 * 1024, alias="GRIDFS_CHUNK_BYTES")
+
+	# Resumable uploads (/api/uploads): largest accepted PATCH, and how long an upload lives
+	upload_chunk_bytes: int = Field(default=1024 * 1024, alias="UPLOAD_CHUNK_BYTES")
+	upload_expiry_hours: int = Field(default=24, alias="UPLOAD_EXPIRY_HOURS")
+
+	# Waitlist auto-promotion
+	waitlist_auto_promote: bool = Field(default=False, alias="WAITLIST_AUTO_PROMOTE")
+	waitlist_scheduler_interval_seconds: int = Field(default=60, alias="WAITLIST_SCHEDULER_INTERVAL_SECONDS")
+	payment_window_hours: int = Field(default=48, alias="PAYMENT_WINDOW_HOURS")
+
 	admin_username: str = Field(default="admin", alias="ADMIN_USERNAME")
 	admin_password: str = Field(..., alias="ADMIN_PASSWORD")
 
 	# Email Settings
 	resend_api_key: str | None = Field(default=None, alias="RESEND_API_KEY")
+	resend_api_url: str = Field(default="https://api.resend.com/emails", alias="RESEND_API_URL")
+	email_queue_concurrency: int = Field(default=4, alias="EMAIL_QUEUE_CONCURRENCY")
+	email_rate_per_second: float = Field(default=2.0, alias="EMAIL_RATE_PER_SECOND")
+
+	# Server (python -m app.server)
+	host: str = Field(default="0.0.0.0", alias="HOST")
+	port: int = Field(default=8000, alias="PORT")
+	web_concurrency: int | None = Field(default=None, alias="WEB_CONCURRENCY")
+	keep_alive_seconds: int = Field(default=75, alias="KEEP_ALIVE_SECONDS")
+	backlog: int = Field(default=2048, alias="BACKLOG")
+	graceful_timeout_seconds: int = Field(default=30, alias="GRACEFUL_TIMEOUT_SECONDS")
+	# Peers (IPs or CIDRs, comma-separated) whose X-Forwarded-For is trusted, so per-IP rate limits
+	# see real clients. Set it to the platform proxy's addresses; uvicorn then keys the client on the
+	# right-most hop not in this list. Never "*": any client could pick its own rate-limit bucket.
+	forwarded_allow_ips: str = Field(default="127.0.0.1", alias="FORWARDED_ALLOW_IPS")
+
+	# Rate limiting ("<count>/<second|minute|hour|day>")
+	rate_limit_enabled: bool = Field(default=True, alias="RATE_LIMIT_ENABLED")
+	rate_limit_store: Literal["memory", "mongo"] = Field(default="memory", alias="RATE_LIMIT_STORE")
+	rate_limit_register_per_ip: str = Field(default="10/minute", alias="RATE_LIMIT_REGISTER_PER_IP")
+	rate_limit_resume_payment_per_ip: str = Field(default="30/minute", alias="RATE_LIMIT_RESUME_PAYMENT_PER_IP")
+	rate_limit_create_order_per_ip: str = Field(default="20/minute", alias="RATE_LIMIT_CREATE_ORDER_PER_IP")
+	rate_limit_upload_per_ip: str = Field(default="30/minute", alias="RATE_LIMIT_UPLOAD_PER_IP")
+	rate_limit_per_email: str = Field(default="5/minute", alias="RATE_LIMIT_PER_EMAIL")
+	rate_limit_per_player: str = Field(default="10/minute", alias="RATE_LIMIT_PER_PLAYER")
+
+	# Logging
+	log_level: str = Field(default="INFO", alias="LOG_LEVEL")
+	log_format: Literal["json", "text"] = Field(default="json", alias="LOG_FORMAT")
+	log_sample_rate: float = Field(default=1.0, alias="LOG_SAMPLE_RATE")
+
+	# Request profiling
+	profiling_token: str | None = Field(default=None, alias="PROFILING_TOKEN")
+	profiling_slow_request_ms: int = Field(default=0, alias="PROFILING_SLOW_REQUEST_MS")
+	profiling_buffer_size: int = Field(default=50, alias="PROFILING_BUFFER_SIZE")
 
 	model_config = SettingsConfigDict(
 		env_file=ROOT_ENV_PATH,
@@ -70,6 +123,14 @@ class Settings(BaseSettings):
 		# Simple comma-separated list
 		return [v.strip() for v in value.split(",") if v.strip()]
 
+	@field_validator("web_concurrency", mode="before")
+	@classmethod
+	def parse_web_concurrency(cls, value: str | int | None) -> str | int | None:
+		"""Treat an empty WEB_CONCURRENCY as unset (default: available CPUs)."""
+		if isinstance(value, str) and not value.strip():
+			return None
+		return value
+
 
 @lru_cache
 def get_settings() -> Settings:
@@ -0,0 +1,46 @@
+"""MongoDB client and Beanie initialisation shared by the app and maintenance commands."""
+
+from beanie import init_beanie
+from beanie.odm.utils.init import Initializer
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from app.core.config import Settings
+from app.core.metrics import MongoCommandMetrics
+from app.models.config import AppConfig
+from app.models.payment import Payment
+from app.models.player import Player
+from app.models.stats import DashboardStats
+from app.models.upload import UploadChunk, UploadSession
+
+DOCUMENT_MODELS = [Player, Payment, AppConfig, DashboardStats, UploadSession, UploadChunk]
+
+
+class _InitializerWithoutIndexes(Initializer):
+    """Beanie 1.23 has no switch to skip index builds; they belong to app.commands.migrate."""
+
+    async def init_indexes(self, cls, allow_index_dropping: bool = False):
+        return None
+
+
+async def init_database(
+    settings: Settings,
+    database_name: str | None = None,
+    allow_index_dropping: bool = False,
+    create_indexes: bool = True,
+) -> AsyncIOMotorClient:
+    client = AsyncIOMotorClient(
+        settings.mongo_url,
+        maxPoolSize=settings.mongo_max_pool_size,
+        minPoolSize=settings.mongo_min_pool_size,
+        event_listeners=[MongoCommandMetrics()],
+    )
+    database = client[database_name or settings.mongo_db]
+    if create_indexes:
+        await init_beanie(
+            database=database,
+            document_models=DOCUMENT_MODELS,
+            allow_index_dropping=allow_index_dropping,
+        )
+    else:
+        await _InitializerWithoutIndexes(database=database, document_models=DOCUMENT_MODELS)
+    return client
@@ -0,0 +1,60 @@
+"""Canonical lookup keys for the contact details players type in.
+
+Players register with whatever spelling they like ("Rahul@Gmail.com ", "+91 98200 12345",
+"098200-12345"). Duplicate checks and lookups go through these keys instead of the raw
+strings, which are stored as submitted for display.
+"""
+
+import re
+
+# Numbers typed without a country code are Indian mobiles
+DEFAULT_COUNTRY_CODE = "91"
+NATIONAL_NUMBER_DIGITS = 10
+# E.164 allows at most 15 digits including the country code
+MAX_E164_DIGITS = 15
+
+_NON_DIGITS = re.compile(r"\D")
+
+
+def email_key(email: str) -> str:
+    """Lower-cased, trimmed email address."""
+    return email.strip().lower()
+
+
+def phone_key(phone: str) -> str | None:
+    """E.164 form of a phone number (``+919820012345``), or None if it cannot be one.
+
+    ``+CC...`` and ``00CC...`` are taken as international; ten digits, optionally behind a
+    trunk ``0``, are national numbers in DEFAULT_COUNTRY_CODE; ``91`` followed by ten digits
+    is a national number typed with its country code but no ``+``.
+    """
+    text = phone.strip()
+    digits = _NON_DIGITS.sub("", text)
+    if text.startswith("+"):
+        international = digits
+    elif digits.startswith("00"):
+        international = digits[2:]
+    else:
+        national = digits[1:] if digits.startswith("0") else digits
+        if len(national) == NATIONAL_NUMBER_DIGITS:
+            international = DEFAULT_COUNTRY_CODE + national
+        elif len(digits) == len(DEFAULT_COUNTRY_CODE) + NATIONAL_NUMBER_DIGITS and digits.startswith(DEFAULT_COUNTRY_CODE):
+            international = digits
+        else:
+            return None
+
+    if not NATIONAL_NUMBER_DIGITS < len(international) <= MAX_E164_DIGITS or international.startswith("0"):
+        return None
+    return f"+{international}"
+
+
+def phone_key_prefix(query: str) -> str:
+    """Best-effort E.164 prefix for a partially typed phone number, for prefix search."""
+    full = phone_key(query)
+    if full is not None:
+        return full
+    text = query.strip()
+    digits = _NON_DIGITS.sub("", text)
+    if text.startswith("+"):
+        return f"+{digits}"
+    return f"+{DEFAULT_COUNTRY_CODE}{digits.lstrip('0')}"
@@ -0,0 +1,150 @@
+"""Prometheus metrics and the low-overhead instrumentation that feeds them.
+
+Set PROMETHEUS_MULTIPROC_DIR when running several uvicorn workers so /metrics aggregates
+across processes.
+"""
+
+import os
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from pymongo import monitoring
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.profiling import span
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+MONGO_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+SIZE_BUCKETS = (16_384, 65_536, 262_144, 1_048_576, 2_097_152, 5_242_880, 10_485_760, 20_971_520)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being served",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+MONGO_COMMAND_DURATION = Histogram(
+    "mongo_command_duration_seconds",
+    "MongoDB command latency as reported by the driver",
+    ["command", "outcome"],
+    buckets=MONGO_BUCKETS,
+)
+STORAGE_UPLOAD_DURATION = Histogram(
+    "storage_upload_duration_seconds",
+    "Time spent persisting an uploaded file",
+    ["backend"],
+    buckets=LATENCY_BUCKETS,
+)
+STORAGE_UPLOAD_BYTES = Histogram(
+    "storage_upload_bytes",
+    "Size of persisted uploads",
+    ["backend"],
+    buckets=SIZE_BUCKETS,
+)
+EXTERNAL_CALL_DURATION = Histogram(
+    "external_call_duration_seconds",
+    "Latency of calls to third-party APIs",
+    ["service", "operation", "outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+EMAIL_QUEUE_DEPTH = Gauge(
+    "email_queue_depth",
+    "Emails waiting in the in-process delivery queue",
+    multiprocess_mode="livesum",
+)
+EMAILS_SENT = Counter("emails_sent_total", "Emails handed to the provider", ["outcome"])
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware: per-route latency histogram and in-flight gauge."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_flight = HTTP_REQUESTS_IN_FLIGHT.labels(method)
+        in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            in_flight.dec()
+            # The router stores the matched route in the scope; use its template, not the raw path
+            route = scope.get("route")
+            route_label = getattr(route, "path", None) or "unmatched"
+            HTTP_REQUEST_DURATION.labels(method, route_label, str(status_code)).observe(
+                time.perf_counter() - started
+            )
+
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    """Records driver-measured command durations; register via AsyncIOMotorClient(event_listeners=...)."""
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        pass
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        MONGO_COMMAND_DURATION.labels(event.command_name, "ok").observe(event.duration_micros / 1_000_000)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        MONGO_COMMAND_DURATION.labels(event.command_name, "error").observe(event.duration_micros / 1_000_000)
+
+
+@contextmanager
+def track_storage_upload(backend: str, size: int) -> Iterator[None]:
+    started = time.perf_counter()
+    try:
+        with span(f"storage.{backend}"):
+            yield
+    finally:
+        STORAGE_UPLOAD_DURATION.labels(backend).observe(time.perf_counter() - started)
+        STORAGE_UPLOAD_BYTES.labels(backend).observe(size)
+
+
+@contextmanager
+def track_external_call(service: str, operation: str) -> Iterator[None]:
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        with span(f"{service}.{operation}"):
+            yield
+        outcome = "ok"
+    finally:
+        EXTERNAL_CALL_DURATION.labels(service, operation, outcome).observe(time.perf_counter() - started)
+
+
+def render_metrics() -> tuple[bytes, str]:
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
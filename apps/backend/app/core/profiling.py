@@ -0,0 +1,216 @@
+"""Opt-in request profiling.
+
+A request is profiled when it carries ``X-Profile: <PROFILING_TOKEN>``, when an admin has armed
+profiling for its path, or (span breakdown only) when it exceeds PROFILING_SLOW_REQUEST_MS.
+Explicitly requested profiles also capture a pyinstrument sampling profile when it is installed.
+With no token, no armed paths and no threshold the middleware is a straight pass-through.
+"""
+
+import hmac
+import importlib.util
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Iterator
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# pyinstrument is optional and only imported once a profile is actually requested
+SAMPLING_AVAILABLE = importlib.util.find_spec("pyinstrument") is not None
+
+PROFILE_HEADER = b"x-profile"
+
+
+@dataclass
+class Span:
+    name: str
+    start_ms: float
+    duration_ms: float
+    depth: int
+
+
+@dataclass
+class Trace:
+    started: float = field(default_factory=time.perf_counter)
+    spans: list[Span] = field(default_factory=list)
+    depth: int = 0
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+
+_current_trace: ContextVar[Trace | None] = ContextVar("profiling_trace", default=None)
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """Time a stage of the current request; a no-op unless the request is being profiled."""
+    trace = _current_trace.get()
+    if trace is None:
+        yield
+        return
+
+    begin = time.perf_counter()
+    trace.depth += 1
+    try:
+        yield
+    finally:
+        trace.depth -= 1
+        trace.spans.append(
+            Span(
+                name=name,
+                start_ms=round((begin - trace.started) * 1000, 3),
+                duration_ms=round((time.perf_counter() - begin) * 1000, 3),
+                depth=trace.depth,
+            )
+        )
+
+
+@dataclass
+class ProfileRecord:
+    id: str
+    method: str
+    path: str
+    route: str | None
+    status_code: int
+    duration_ms: float
+    reason: str
+    started_at: datetime
+    spans: list[Span]
+    html: str | None = None
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "route": self.route,
+            "status_code": self.status_code,
+            "duration_ms": self.duration_ms,
+            "reason": self.reason,
+            "started_at": self.started_at.isoformat(),
+            "has_sampling_profile": self.html is not None,
+        }
+
+    def detail(self) -> dict[str, Any]:
+        return {**self.summary(), "spans": [asdict(item) for item in sorted(self.spans, key=lambda s: s.start_ms)]}
+
+
+class ProfileStore:
+    """Bounded in-memory ring of captured profiles plus the per-path arming counters."""
+
+    def __init__(self, capacity: int = 50):
+        self._records: deque[ProfileRecord] = deque(maxlen=capacity)
+        self._armed: dict[str, int] = {}
+
+    def add(self, record: ProfileRecord) -> None:
+        self._records.append(record)
+
+    def list(self) -> list[ProfileRecord]:
+        return list(reversed(self._records))
+
+    def get(self, profile_id: str) -> ProfileRecord | None:
+        return next((record for record in self._records if record.id == profile_id), None)
+
+    @property
+    def armed(self) -> dict[str, int]:
+        return dict(self._armed)
+
+    def arm(self, path_prefix: str, count: int) -> None:
+        if count <= 0:
+            self._armed.pop(path_prefix, None)
+        else:
+            self._armed[path_prefix] = count
+
+    def take_armed(self, path: str) -> bool:
+        if not self._armed:
+            return False
+        for prefix, remaining in self._armed.items():
+            if path.startswith(prefix):
+                if remaining <= 1:
+                    del self._armed[prefix]
+                else:
+                    self._armed[prefix] = remaining - 1
+                return True
+        return False
+
+
+class ProfilingMiddleware:
+    def __init__(self, app: ASGIApp, store: ProfileStore, token: str | None = None, slow_request_ms: int = 0):
+        self.app = app
+        self.store = store
+        self.token = token.encode() if token else None
+        self.slow_request_ms = slow_request_ms
+
+    def _requested(self, scope: Scope) -> bool:
+        if self.token is not None:
+            for name, value in scope["headers"]:
+                if name == PROFILE_HEADER:
+                    return hmac.compare_digest(value, self.token)
+        return self.store.take_armed(scope["path"])
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        requested = self._requested(scope)
+        if not requested and self.slow_request_ms <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        trace = Trace()
+        status_code = 500
+        body_received = False
+
+        async def receive_wrapper() -> Message:
+            nonlocal body_received
+            message = await receive()
+            if message["type"] == "http.request" and not message.get("more_body") and not body_received:
+                body_received = True
+                trace.spans.append(Span("request.body", 0.0, round(trace.elapsed_ms(), 3), 0))
+            return message
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        profiler = None
+        if requested and SAMPLING_AVAILABLE:
+            from pyinstrument import Profiler
+
+            profiler = Profiler(async_mode="enabled")
+        started_at = datetime.now(timezone.utc)
+        context_token = _current_trace.set(trace)
+        if profiler is not None:
+            profiler.start()
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
+        finally:
+            if profiler is not None:
+                profiler.stop()
+            _current_trace.reset(context_token)
+
+            duration_ms = round(trace.elapsed_ms(), 3)
+            if requested or duration_ms >= self.slow_request_ms:
+                route = scope.get("route")
+                self.store.add(
+                    ProfileRecord(
+                        id=uuid.uuid4().hex,
+                        method=scope["method"],
+                        path=scope["path"],
+                        route=getattr(route, "path", None),
+                        status_code=status_code,
+                        duration_ms=duration_ms,
+                        reason="requested" if requested else "slow",
+                        started_at=started_at,
+                        spans=trace.spans,
+                        html=profiler.output_html() if profiler is not None else None,
+                    )
+                )
@@ -0,0 +1,230 @@
+"""Reject oversized or mistyped multipart uploads while the body is still streaming in.
+
+The guard runs a streaming multipart parser alongside the application's own: a declared
+Content-Length over the limit is refused before any body is read, a streamed body is cut off
+as soon as it crosses the limit, and each file part is checked against its field's allowed
+types, first by its declared Content-Type and then by sniffing its leading bytes. Once a
+request is rejected the application sees a disconnect and its response is replaced with a
+413 or 415.
+"""
+
+import re
+from functools import cache
+from typing import Callable, Iterable, Mapping
+
+from python_multipart.multipart import MultipartParser, parse_options_header
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+SNIFF_BYTES = 2048
+
+# Used only when libmagic is unavailable
+_SIGNATURES: tuple[tuple[bytes, int, str], ...] = (
+    (b"\xff\xd8\xff", 0, "image/jpeg"),
+    (b"\x89PNG\r\n\x1a\n", 0, "image/png"),
+    (b"%PDF-", 0, "application/pdf"),
+    (b"ftypheic", 4, "image/heic"),
+    (b"ftypheix", 4, "image/heic"),
+    (b"ftypmif1", 4, "image/heif"),
+    (b"ftypmsf1", 4, "image/heif"),
+)
+
+
+@cache
+def _magic():
+    # Loading libmagic and its database is deferred to the first upload
+    try:
+        import magic
+    except ImportError:  # pragma: no cover - libmagic missing from the host
+        return None
+    return magic
+
+
+def sniff_mime(head: bytes) -> str:
+    magic = _magic()
+    if magic is not None:
+        return magic.from_buffer(head, mime=True)
+    for signature, offset, mime in _SIGNATURES:
+        if head[offset:offset + len(signature)] == signature:
+            return mime
+    return "application/octet-stream"
+
+
+class UploadRejected(Exception):
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+class _MultipartGuard:
+    def __init__(self, boundary: bytes, field_types: Mapping[str, Iterable[str]], max_part_bytes: int):
+        self.field_types = field_types
+        self.max_part_bytes = max_part_bytes
+        self.rejection: UploadRejected | None = None
+        self._header_field = b""
+        self._header_value = b""
+        self._reset_part()
+        self.parser = MultipartParser(
+            boundary,
+            callbacks={
+                "on_part_begin": self._reset_part,
+                "on_header_field": self._on_header_field,
+                "on_header_value": self._on_header_value,
+                "on_header_end": self._on_header_end,
+                "on_headers_finished": self._on_headers_finished,
+                "on_part_data": self._on_part_data,
+                "on_part_end": self._on_part_end,
+            },
+        )
+
+    def feed(self, chunk: bytes) -> None:
+        if self.parser is None or self.rejection is not None or not chunk:
+            return
+        try:
+            self.parser.write(chunk)
+        except UploadRejected as exc:
+            self.rejection = exc
+        except Exception:
+            # Malformed multipart is the application's to report; stop inspecting
+            self.parser = None
+
+    def _reset_part(self) -> None:
+        self.name: str | None = None
+        self.filename: str | None = None
+        self.content_type: str | None = None
+        self.size = 0
+        self.head = bytearray()
+        self.sniffed = False
+
+    def _on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_field += data[start:end]
+
+    def _on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def _on_header_end(self) -> None:
+        field = self._header_field.lower()
+        if field == b"content-disposition":
+            _, options = parse_options_header(self._header_value)
+            self.name = options.get(b"name", b"").decode("latin-1") or None
+            filename = options.get(b"filename")
+            self.filename = filename.decode("latin-1") if filename is not None else None
+        elif field == b"content-type":
+            self.content_type = self._header_value.decode("latin-1").split(";")[0].strip().lower()
+        self._header_field = b""
+        self._header_value = b""
+
+    def _allowed(self) -> Iterable[str] | None:
+        if self.filename is None or self.name is None:
+            return None
+        return self.field_types.get(self.name)
+
+    def _on_headers_finished(self) -> None:
+        allowed = self._allowed()
+        if allowed is not None and self.content_type not in allowed:
+            raise UploadRejected(415, f"Unsupported file type: {self.content_type}")
+
+    def _on_part_data(self, data: bytes, start: int, end: int) -> None:
+        self.size += end - start
+        if self.size > self.max_part_bytes:
+            raise UploadRejected(413, "File exceeds maximum allowed size")
+        if not self.sniffed and self._allowed() is not None:
+            self.head += data[start:min(end, start + SNIFF_BYTES - len(self.head))]
+            if len(self.head) >= SNIFF_BYTES:
+                self._check_content()
+
+    def _on_part_end(self) -> None:
+        # Empty files are left for the handler, which reports them explicitly
+        if not self.sniffed and self.head and self._allowed() is not None:
+            self._check_content()
+
+    def _check_content(self) -> None:
+        self.sniffed = True
+        detected = sniff_mime(bytes(self.head))
+        if detected not in self._allowed():
+            raise UploadRejected(415, f"File content ({detected}) does not match an allowed type")
+
+
+class UploadGuardMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        routes: Iterable[tuple[str, str]],
+        max_body_bytes: int,
+        max_part_bytes: int,
+        field_types: Mapping[str, Iterable[str]],
+    ):
+        self.app = app
+        self.routes: list[tuple[str, Callable[[str], re.Match | None]]] = [
+            (method, re.compile(pattern).fullmatch) for method, pattern in routes
+        ]
+        self.max_body_bytes = max_body_bytes
+        self.max_part_bytes = max_part_bytes
+        self.field_types = {name: frozenset(types) for name, types in field_types.items()}
+
+    def _guarded(self, scope: Scope) -> bool:
+        return any(scope["method"] == method and match(scope["path"]) for method, match in self.routes)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._guarded(scope):
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        content_length = headers.get("content-length", "")
+        if content_length.isdigit() and int(content_length) > self.max_body_bytes:
+            await self._reject(UploadRejected(413, "Upload exceeds maximum allowed size"), scope, receive, send)
+            return
+
+        guard = None
+        media_type, options = parse_options_header(headers.get("content-type", ""))
+        if media_type == b"multipart/form-data" and options.get(b"boundary"):
+            guard = _MultipartGuard(options[b"boundary"], self.field_types, self.max_part_bytes)
+
+        rejection: UploadRejected | None = None
+        received = 0
+        response_started = False
+
+        async def guarded_receive() -> Message:
+            nonlocal rejection, received
+            if rejection is not None:
+                return {"type": "http.disconnect"}
+            message = await receive()
+            if message["type"] == "http.request":
+                body = message.get("body", b"")
+                received += len(body)
+                if received > self.max_body_bytes:
+                    rejection = UploadRejected(413, "Upload exceeds maximum allowed size")
+                elif guard is not None:
+                    guard.feed(body)
+                    rejection = guard.rejection
+                if rejection is not None:
+                    return {"type": "http.disconnect"}
+            return message
+
+        async def guarded_send(message: Message) -> None:
+            nonlocal response_started
+            if rejection is not None and not response_started:
+                return
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, guarded_receive, guarded_send)
+        except Exception:
+            if rejection is None or response_started:
+                raise
+        if rejection is not None and not response_started:
+            await self._reject(rejection, scope, receive, send)
+
+    @staticmethod
+    async def _reject(rejection: UploadRejected, scope: Scope, receive: Receive, send: Send) -> None:
+        response = JSONResponse(
+            {"detail": rejection.detail},
+            status_code=rejection.status_code,
+            headers={"Connection": "close"},
+        )
+        await response(scope, receive, send)
@@ -1,29 +1,39 @@
 from contextlib import asynccontextmanager
+from datetime import timedelta
 from pathlib import Path
 
-from beanie import init_beanie
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from motor.motor_asyncio import AsyncIOMotorClient
 
 from app.core.config import get_settings
-from app.models.payment import Payment
-from app.models.player import Player
-from app.models.config import AppConfig
-from app.routers import payments, registration, admin
+from app.core.database import init_database
+from app.core.logging import RequestIdMiddleware, configure_logging
+from app.core.metrics import MetricsMiddleware, render_metrics
+from app.core.profiling import ProfileStore, ProfilingMiddleware
+from app.core.upload_guard import UploadGuardMiddleware
+from app.routers import payments, registration, admin, files, uploads
+from app.services.change_feed import ChangeFeedHub
+from app.services.email_queue import EmailQueue
+from app.services.payment_events import PaymentEvents
+from app.services.rate_limit import IP_LIMITED_ROUTES, MongoBucketStore, RateLimitMiddleware, build_rate_limiter
 from app.services.razorpay import RazorpayService
 from app.services.storage import build_storage_service
+from app.services.uploads import ResumableUploads
+from app.services.waitlist import WaitlistScheduler
 
 settings = get_settings()
-UPLOADS_DIR = Path(__file__).resolve().parent / "uploads"
+UPLOADS_DIR = settings.uploads_dir or Path(__file__).resolve().parent / "uploads"
+UPLOADS_DIR.mkdir(parents=True, exist_ok=True)
+profile_store = ProfileStore(settings.profiling_buffer_size)
+rate_limiter = build_rate_limiter(settings)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    client = AsyncIOMotorClient(settings.mongo_url)
-    database = client[settings.mongo_db]
-    await init_beanie(database=database, document_models=[Player, Payment, AppConfig])
+    log_listener = configure_logging(settings.log_level, settings.log_format, settings.log_sample_rate)
+    # Indexes and the default AppConfig are created by `python -m app.commands.migrate`
+    client = await init_database(settings, create_indexes=False)
 
     storage = build_storage_service(
         settings.storage_mode, 
@@ -32,38 +42,89 @@ async def lifespan(app: FastAPI):
         cloudinary_cloud_name=settings.cloudinary_cloud_name,
         cloudinary_api_key=settings.cloudinary_api_key,
         cloudinary_api_secret=settings.cloudinary_api_secret,
-        cloudinary_folder=settings.cloudinary_folder
+        cloudinary_folder=settings.cloudinary_folder,
+        database=client[settings.mongo_db],
+        gridfs_bucket=settings.gridfs_bucket,
+        gridfs_chunk_bytes=settings.gridfs_chunk_bytes,
     )
-    razorpay = RazorpayService(settings.razorpay_key_id, settings.razorpay_key_secret)
+    razorpay = RazorpayService(settings.razorpay_key_id, settings.razorpay_key_secret, settings.razorpay_api_url)
+    email_queue = EmailQueue(settings.email_queue_concurrency, settings.email_rate_per_second)
+    email_queue.start()
 
     app.state.storage = storage
+    app.state.uploads = ResumableUploads(
+        storage,
+        registration.UPLOAD_FIELD_TYPES,
+        registration.MAX_FILE_BYTES,
+        chunk_bytes=settings.upload_chunk_bytes,
+        expiry=timedelta(hours=settings.upload_expiry_hours),
+    )
     app.state.settings = settings
     app.state.razorpay = razorpay
-    # Ensure default app config exists
-    cfg = await AppConfig.find_one({})
-    if cfg is None:
-        cfg = AppConfig(registration_open=True)
-        await cfg.insert()
+    app.state.email_queue = email_queue
+    app.state.profiles = profile_store
+    app.state.rate_limiter = rate_limiter
+    # Starts watching on the first subscriber, so idle workers hold no change stream
+    change_feed = ChangeFeedHub(client[settings.mongo_db])
+    app.state.change_feed = change_feed
+    payment_events = PaymentEvents(change_feed)
+    app.state.payment_events = payment_events
+    if settings.rate_limit_store == "mongo":
+        rate_limiter.store = MongoBucketStore(client[settings.mongo_db])
+
+    scheduler = WaitlistScheduler(
+        email_queue,
+        interval_seconds=settings.waitlist_scheduler_interval_seconds,
+        payment_window_hours=settings.payment_window_hours,
+    )
+    if settings.waitlist_auto_promote:
+        scheduler.start()
 
     yield
 
+    await scheduler.aclose()
+    await payment_events.aclose()
+    await change_feed.aclose()
+    await email_queue.aclose()
     await razorpay.aclose()
     client.close()
+    log_listener.stop()
 
 
 app = FastAPI(title="Walle Registration", version="1.0.0", lifespan=lifespan)
 
+app.add_middleware(
+    UploadGuardMiddleware,
+    routes=registration.UPLOAD_ROUTES,
+    max_body_bytes=registration.MAX_UPLOAD_REQUEST_BYTES,
+    max_part_bytes=registration.MAX_FILE_BYTES,
+    field_types=registration.UPLOAD_FIELD_TYPES,
+)
+app.add_middleware(RateLimitMiddleware, limiter=rate_limiter, routes=IP_LIMITED_ROUTES)
+# Added after (so outside) the upload guard and rate limiter, so their 413/415/429 carry CORS
+# headers and the browser can read them instead of reporting a network error
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.cors_origins or ["*"],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(
+    ProfilingMiddleware,
+    store=profile_store,
+    token=settings.profiling_token,
+    slow_request_ms=settings.profiling_slow_request_ms,
+)
+app.add_middleware(RequestIdMiddleware)
 
 app.include_router(registration.router)
 app.include_router(payments.router)
 app.include_router(admin.router)
+app.include_router(uploads.router)
+app.include_router(files.router)
 
 app.mount("/uploads", StaticFiles(directory=UPLOADS_DIR), name="uploads")
 
@@ -73,6 +134,12 @@ async def health():
     return {"status": "ok"}
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
+
 @app.get("/")
 async def root():
     return {"message": "Walle Register API is running", "status": "ok"}
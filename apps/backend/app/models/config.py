@@ -1,9 +1,26 @@
+from datetime import datetime
+
 from beanie import Document
 from pydantic import Field
 
 class AppConfig(Document):
     registration_open: bool = Field(default=True)
     registration_cap: int = Field(default=200)
+    # Players holding a cap slot (approved, pending payment or paid), kept by app.services.waitlist;
+    # None until first counted
+    slots_held: int | None = None
+    # Leader lease for the waitlist scheduler so only one worker promotes at a time
+    scheduler_lease_owner: str | None = None
+    scheduler_lease_until: datetime | None = None
 
     class Settings:
         name = "app_config"
+
+    @classmethod
+    async def get_or_create(cls) -> "AppConfig":
+        """The singleton config document, created with defaults on first use."""
+        cfg = await cls.find_one({})
+        if cfg is None:
+            cfg = cls()
+            await cfg.insert()
+        return cfg
@@ -6,6 +6,7 @@ from beanie import Document, Indexed
 from beanie.odm.fields import PydanticObjectId
 from pydantic import Field
 from pydantic.config import ConfigDict
+from pymongo import ASCENDING, IndexModel
 
 
 class PaymentStatus(str, Enum):
@@ -34,9 +35,15 @@ class Payment(Document):
 
     class Settings:
         name = "payments"
+        # razorpay_order_id is unique-indexed via Indexed() above; it also serves
+        # the verify lookup (order_id + player_id).
         indexes = [
-            "player_id",
-            "razorpay_order_id",
-            "status",
-            "-created_at",
+            # "Already captured?" checks and the admin listing's player_id $in join
+            IndexModel([("player_id", ASCENDING), ("status", ASCENDING)], name="player_id_status"),
+            # payment_status filter (distinct player_id by status) and the covered revenue rebuild.
+            # Beanie compares index keys as a set, so this needs a third key to coexist with the one above.
+            IndexModel(
+                [("status", ASCENDING), ("player_id", ASCENDING), ("amount", ASCENDING)],
+                name="status_player_id_amount",
+            ),
         ]
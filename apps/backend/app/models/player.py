@@ -1,10 +1,14 @@
 from datetime import datetime, timezone
+from typing import Any
 from zoneinfo import ZoneInfo
 from enum import Enum
 
-from beanie import Document, Indexed
-from pydantic import EmailStr, Field
+from beanie import Document, Insert, Replace, Save, before_event
+from pydantic import BaseModel, EmailStr, Field
 from pydantic.config import ConfigDict
+from pymongo import ASCENDING, DESCENDING, TEXT, IndexModel
+
+from app.core.identity import email_key, phone_key
 
 
 class RegistrationStatus(str, Enum):
@@ -14,6 +18,7 @@ class RegistrationStatus(str, Enum):
     PENDING_PAYMENT = "PENDING_PAYMENT"
     PAID = "PAID"
     FAILED = "FAILED"
+    EXPIRED = "EXPIRED"
 
 
 def ist_now() -> datetime:
@@ -21,42 +26,247 @@ def ist_now() -> datetime:
     return datetime.now(ZoneInfo("Asia/Kolkata"))
 
 
-class Player(Document):
-    # Personal Details
+class CodedEnum(str, Enum):
+    """A str enum stored as a short code and shown to people as a label.
+
+    Members are declared as ``(code, label)``. Looking a member up by its label (ignoring
+    case and surrounding spaces) also works, so form values such as "Right-Hand" validate
+    straight into the enum while the document stores "R".
+    """
+
+    label: str
+
+    def __new__(cls, code: str, label: str):
+        member = str.__new__(cls, code)
+        member._value_ = code
+        member.label = label
+        return member
+
+    @classmethod
+    def _missing_(cls, value: object):
+        if isinstance(value, str):
+            text = value.strip().casefold()
+            for member in cls:
+                if member.label.casefold() == text:
+                    return member
+        return None
+
+
+class BattingType(CodedEnum):
+    RIGHT = ("R", "Right-Hand")
+    LEFT = ("L", "Left-Hand")
+
+
+class BowlingType(CodedEnum):
+    RIGHT_FAST = ("RF", "Right Arm Fast")
+    LEFT_FAST = ("LF", "Left Arm Fast")
+    RIGHT_MEDIUM = ("RM", "Right Arm Medium")
+    LEFT_MEDIUM = ("LM", "Left Arm Medium")
+    RIGHT_OFF_SPIN = ("RO", "Right Arm Spin (Off)")
+    RIGHT_LEG_SPIN = ("RL", "Right Arm Spin (Leg)")
+    LEFT_ORTHODOX = ("LO", "Left Arm Spin (Orthodox)")
+    LEFT_CHINAMAN = ("LC", "Left Arm Spin (Chinaman)")
+    NON_BOWLER = ("NB", "Non-Bowler")
+
+
+class WicketKeeper(CodedEnum):
+    YES = ("Y", "Yes")
+    NO = ("N", "No")
+
+
+class PlayedJyplS7(CodedEnum):
+    # The registration form submits these in lower case
+    YES = ("Y", "yes")
+    NO = ("N", "no")
+
+
+class TshirtSize(CodedEnum):
+    S = ("S", "S")
+    M = ("M", "M")
+    L = ("L", "L")
+    XL = ("XL", "XL")
+    XXL = ("XXL", "XXL")
+    XXXL = ("XXXL", "XXXL")
+
+
+class PersonalDetails(BaseModel):
     first_name: str
     last_name: str
-    email: Indexed(EmailStr, unique=True)  # type: ignore[assignment]
-    phone: Indexed(str, unique=True)  # type: ignore[assignment]
-    residential_area: str
-    firm_name: str
+    # As submitted, for display; uniqueness and lookups go through Player.email_key/phone_key
+    email: EmailStr
+    phone: str
+    area: str
+    firm: str
     designation: str
     photo_url: str
-    visiting_card_url: str
-    
-    # Cricket Details
-    batting_type: str
-    bowling_type: str
-    wicket_keeper: str
-    
-    # Jersey Details
-    name_on_jersey: str
-    tshirt_size: str
-    waist_size: int
-    
-    # JYPL Season 8 Details
-    played_jypl_s7: str
+    card_url: str
+
+    model_config = ConfigDict(str_strip_whitespace=True)
+
+
+class CricketDetails(BaseModel):
+    batting: BattingType
+    bowling: BowlingType
+    keeper: WicketKeeper
+    # JYPL Season 7 history
+    jypl_s7: PlayedJyplS7
     jypl_s7_team: str = ""
-    
+
+    model_config = ConfigDict(str_strip_whitespace=True)
+
+
+class JerseyDetails(BaseModel):
+    name: str
+    size: TshirtSize
+    waist: int
+
+    model_config = ConfigDict(str_strip_whitespace=True)
+
+
+# Flat field names used by the forms, the API responses and the CSV -> stored dotted path.
+# Keys inside the subdocuments are short because every document carries them.
+FIELD_PATHS: dict[str, str] = {
+    "first_name": "personal.first_name",
+    "last_name": "personal.last_name",
+    "email": "personal.email",
+    "phone": "personal.phone",
+    "residential_area": "personal.area",
+    "firm_name": "personal.firm",
+    "designation": "personal.designation",
+    "photo_url": "personal.photo_url",
+    "visiting_card_url": "personal.card_url",
+    "batting_type": "cricket.batting",
+    "bowling_type": "cricket.bowling",
+    "wicket_keeper": "cricket.keeper",
+    "played_jypl_s7": "cricket.jypl_s7",
+    "jypl_s7_team": "cricket.jypl_s7_team",
+    "name_on_jersey": "jersey.name",
+    "tshirt_size": "jersey.size",
+    "waist_size": "jersey.waist",
+}
+PATH_FIELDS = {path: field for field, path in FIELD_PATHS.items()}
+SECTION_MODELS: dict[str, type[BaseModel]] = {
+    "personal": PersonalDetails,
+    "cricket": CricketDetails,
+    "jersey": JerseyDetails,
+}
+CODED_PATHS: dict[str, type[CodedEnum]] = {
+    f"{section}.{name}": field.annotation
+    for section, model in SECTION_MODELS.items()
+    for name, field in model.model_fields.items()
+    if isinstance(field.annotation, type) and issubclass(field.annotation, CodedEnum)
+}
+
+
+def display_value(path: str, value: Any) -> Any:
+    """A stored value the way the API shows it: coded enums become their labels."""
+    coded = CODED_PATHS.get(path)
+    if coded is None or value is None:
+        return value
+    return coded(value).label
+
+
+def nest_details(details: dict[str, Any]) -> dict[str, dict[str, Any]]:
+    """Group flat fields (first_name, tshirt_size, ...) into the stored subdocuments."""
+    nested: dict[str, dict[str, Any]] = {}
+    for field, value in details.items():
+        section, key = FIELD_PATHS[field].split(".", 1)
+        nested.setdefault(section, {})[key] = value
+    return nested
+
+
+def flatten_details(document: dict[str, Any]) -> dict[str, Any]:
+    """Flat, labelled fields for whatever player details `document` holds.
+
+    Accepts raw or dumped documents (subdocuments under personal/cricket/jersey) as well
+    as change-stream updates whose keys are dotted paths such as ``jersey.size``; other
+    keys are left out.
+    """
+    flat: dict[str, Any] = {}
+    for key, value in document.items():
+        if key in SECTION_MODELS and isinstance(value, dict):
+            items = [(f"{key}.{name}", item) for name, item in value.items()]
+        else:
+            items = [(key, value)]
+        for path, item in items:
+            field = PATH_FIELDS.get(path)
+            if field is not None:
+                flat[field] = display_value(path, item)
+    return flat
+
+
+class Player(Document):
+    # Details, one subdocument per form step so reads can project just the part they need
+    personal: PersonalDetails
+    cricket: CricketDetails
+    jersey: JerseyDetails
+
     # Registration Status
     registration_status: RegistrationStatus = RegistrationStatus.PENDING_PAYMENT
     created_at: datetime = Field(default_factory=ist_now)
+    # Start of the payment window; set whenever a player leaves the waitlist as APPROVED
+    approved_at: datetime | None = None
+    # Bumped by every write; exposed as the ETag of GET/PUT /api/player/{id}
+    revision: int = 0
+    # Canonical lookup keys (app.core.identity); filled in on every write
+    email_key: str | None = None
+    phone_key: str | None = None
 
     model_config = ConfigDict(str_strip_whitespace=True)
 
+    @before_event(Insert, Replace, Save)
+    def fill_identity_keys(self) -> None:
+        self.email_key = email_key(self.personal.email)
+        self.phone_key = phone_key(self.personal.phone)
+
     class Settings:
         name = "players"
         indexes = [
-            "email",
-            "phone",
+            # Duplicate checks, resume-payment and admin email/phone search. Partial so that
+            # documents the backfill could not key (unparseable phone, clashing duplicates)
+            # do not collide on null.
+            IndexModel(
+                [("email_key", ASCENDING)],
+                name="email_key",
+                unique=True,
+                partialFilterExpression={"email_key": {"$type": "string"}},
+            ),
+            IndexModel(
+                [("phone_key", ASCENDING)],
+                name="phone_key",
+                unique=True,
+                partialFilterExpression={"phone_key": {"$type": "string"}},
+            ),
+            # Admin listing default order
             "-created_at",
+            # Status filter, waitlist FIFO (walked backwards) and slot counts ($in on status)
+            IndexModel(
+                [("registration_status", ASCENDING), ("created_at", DESCENDING)],
+                name="registration_status_created_at",
+            ),
+            # Payment-window expiry sweep
+            IndexModel(
+                [("registration_status", ASCENDING), ("approved_at", ASCENDING)],
+                name="registration_status_approved_at",
+            ),
+            # Admin listing filters, each sorted by newest first
+            IndexModel(
+                [("jersey.size", ASCENDING), ("created_at", DESCENDING)],
+                name="jersey_size_created_at",
+            ),
+            IndexModel(
+                [("cricket.jypl_s7", ASCENDING), ("created_at", DESCENDING)],
+                name="cricket_jypl_s7_created_at",
+            ),
+            # Admin free-text search over name, contact and firm
+            IndexModel(
+                [
+                    ("personal.first_name", TEXT),
+                    ("personal.last_name", TEXT),
+                    ("personal.email", TEXT),
+                    ("personal.phone", TEXT),
+                    ("personal.firm", TEXT),
+                ],
+                name="player_search_text",
+            ),
         ]
@@ -0,0 +1,85 @@
+"""Lightweight projection models for queries that only need a few Player/Payment fields.
+
+Passing one of these to ``.project()`` makes Mongo return just the listed fields and
+skips validating the rest of the document.
+"""
+
+from datetime import datetime
+
+from beanie import PydanticObjectId
+from pydantic import BaseModel, Field
+
+from app.models.payment import PaymentStatus
+from app.models.player import CricketDetails, JerseyDetails, RegistrationStatus
+
+
+def projection_of(model: type[BaseModel]) -> dict[str, int]:
+    """Raw Mongo projection for a model's fields, for reads that skip Pydantic entirely.
+
+    Nested models are projected field by field (``personal.first_name``), so a view can
+    take part of a subdocument.
+    """
+    projection: dict[str, int] = {}
+    for name, field in model.model_fields.items():
+        key = field.alias or name
+        if isinstance(field.annotation, type) and issubclass(field.annotation, BaseModel):
+            projection.update({f"{key}.{path}": 1 for path in projection_of(field.annotation)})
+        else:
+            projection[key] = 1
+    return projection
+
+
+class PersonalNameView(BaseModel):
+    first_name: str
+    last_name: str
+    email: str
+
+
+class PersonalContactView(PersonalNameView):
+    phone: str
+
+
+class PersonalListView(PersonalContactView):
+    area: str
+    firm: str
+    designation: str
+
+
+class PlayerIdView(BaseModel):
+    """Existence checks (duplicate email/phone)."""
+
+    id: PydanticObjectId = Field(alias="_id")
+
+
+class PlayerStateView(PlayerIdView):
+    """Status gates such as create-order."""
+
+    registration_status: RegistrationStatus
+
+
+class PlayerStatusView(PlayerStateView):
+    """Identity, contact and status: enough to report a transition and email the player."""
+
+    personal: PersonalNameView
+
+
+class PlayerContactView(PlayerStatusView):
+    """Resume-payment lookup."""
+
+    personal: PersonalContactView
+
+
+class PlayerListView(PlayerContactView):
+    """Admin listing row: every displayed field, without upload URLs."""
+
+    personal: PersonalListView
+    cricket: CricketDetails
+    jersey: JerseyDetails
+    created_at: datetime | None = None
+
+
+class PaymentStatusView(BaseModel):
+    """Per-player payment status for the admin listing."""
+
+    player_id: PydanticObjectId
+    status: PaymentStatus
@@ -0,0 +1,23 @@
+from datetime import datetime
+
+from beanie import Document, Indexed
+from pydantic import Field
+
+
+class DashboardStats(Document):
+    """Precomputed admin dashboard counters, kept current with $inc deltas on every write."""
+
+    key: Indexed(str, unique=True) = "dashboard"  # type: ignore[assignment]
+    total: int = 0
+    by_status: dict[str, int] = Field(default_factory=dict)
+    by_tshirt_size: dict[str, int] = Field(default_factory=dict)
+    by_waist_size: dict[str, int] = Field(default_factory=dict)
+    by_batting_type: dict[str, int] = Field(default_factory=dict)
+    by_bowling_type: dict[str, int] = Field(default_factory=dict)
+    payments_captured: int = 0
+    revenue_paise: int = 0
+    updated_at: datetime | None = None
+    rebuilt_at: datetime | None = None
+
+    class Settings:
+        name = "stats"
@@ -0,0 +1,49 @@
+from datetime import datetime
+from uuid import uuid4
+
+from beanie import Document
+from pydantic import Field
+from pymongo import ASCENDING, IndexModel
+
+
+class UploadSession(Document):
+    """A resumable file upload (/api/uploads), in progress or finished and awaiting use.
+
+    The id doubles as the client's capability to append to and reference the upload, so it
+    is a random token rather than a guessable ObjectId.
+    """
+
+    id: str = Field(default_factory=lambda: uuid4().hex)  # type: ignore[assignment]
+    field: str
+    filename: str
+    content_type: str
+    length: int
+    offset: int = 0
+    # Set once every byte has arrived and the file has been handed to storage
+    url: str | None = None
+    created_at: datetime
+    expires_at: datetime
+
+    class Settings:
+        name = "upload_sessions"
+        indexes = [
+            # Unfinished and unused uploads disappear on their own
+            IndexModel([("expires_at", ASCENDING)], name="expires_at_ttl", expireAfterSeconds=0),
+        ]
+
+
+class UploadChunk(Document):
+    """One PATCH worth of bytes of an UploadSession, kept until the upload completes."""
+
+    upload_id: str
+    offset: int
+    data: bytes
+    expires_at: datetime
+
+    class Settings:
+        name = "upload_chunks"
+        indexes = [
+            # Assembly order, and a second PATCH at the same offset loses
+            IndexModel([("upload_id", ASCENDING), ("offset", ASCENDING)], name="upload_id_offset", unique=True),
+            IndexModel([("expires_at", ASCENDING)], name="expires_at_ttl", expireAfterSeconds=0),
+        ]
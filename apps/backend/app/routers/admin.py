@@ -1,13 +1,27 @@
-from fastapi import APIRouter, Depends, HTTPException, Request, status
-from pydantic import BaseModel
+import asyncio
+from datetime import datetime, timezone
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, status
+from fastapi.responses import HTMLResponse, ORJSONResponse, StreamingResponse
+from pydantic import BaseModel, Field
 
 from app.core.config import Settings
-from app.models.player import Player, RegistrationStatus
+from app.core.profiling import ProfileStore
+from app.models.player import PlayedJyplS7, Player, RegistrationStatus, TshirtSize, flatten_details
 from app.models.payment import Payment, PaymentStatus
 from app.models.config import AppConfig
-from beanie.operators import In
+from app.models.projections import PaymentStatusView, PlayerListView, PlayerStatusView, projection_of
+from beanie import PydanticObjectId
+from beanie.operators import In, Inc, Set
 
+from app.services.change_feed import SSE_KEEPALIVE, ChangeFeedHub, sse_message
+from app.services.columnar_export import EXPORT_FORMATS, columnar_export_available, export_players
+from app.services.email_queue import EmailQueue
 from app.services.email_service import send_approval_email
+from app.services.player_search import build_player_filter
+from app.services.stats import get_stats, record_status_change
+from app.services.waitlist import adjust_slots
 
 router = APIRouter(prefix="/api/admin", tags=["admin"])
 
@@ -49,10 +63,69 @@ class PlayerResponse(BaseModel):
     created_at: str | None
 
 
+class BulkStatusRequest(BaseModel):
+    action: Literal["approve", "reject"]
+    player_ids: list[str] = Field(default_factory=list)
+    # Alternatively (or additionally) pick the N oldest waitlisted players
+    oldest_waitlisted: int | None = Field(default=None, ge=1, le=1000)
+
+
+class BulkStatusResult(BaseModel):
+    player_id: str
+    result: Literal["approved", "rejected", "not_found", "not_in_waitlist"]
+    registration_status: str | None = None
+
+
+class BulkStatusResponse(BaseModel):
+    updated: int
+    emails_queued: int
+    results: list[BulkStatusResult]
+
+
+class DashboardStatsResponse(BaseModel):
+    total: int
+    total_paid: int
+    by_status: dict[str, int]
+    by_tshirt_size: dict[str, int]
+    by_waist_size: dict[str, int]
+    by_batting_type: dict[str, int]
+    by_bowling_type: dict[str, int]
+    payments_captured: int
+    revenue_inr: int
+    updated_at: str | None
+
+
+PLAYER_RESPONSE_FIELDS = tuple(PlayerResponse.model_fields)
+
+
+def _player_row(document: dict, payment_status: str | None) -> dict:
+    """Shape a raw projected player document like PlayerResponse, without validating it."""
+    details = flatten_details(document)
+    row = {field: details.get(field, document.get(field)) for field in PLAYER_RESPONSE_FIELDS}
+    created_at = document.get("created_at")
+    row["id"] = str(document["_id"])
+    row["jypl_s7_team"] = row["jypl_s7_team"] or ""
+    row["payment_status"] = payment_status
+    row["created_at"] = created_at.isoformat() if created_at else None
+    return row
+
+
 async def get_settings(request: Request) -> Settings:
     return request.app.state.settings  # type: ignore[attr-defined]
 
 
+async def get_email_queue(request: Request) -> EmailQueue:
+    return request.app.state.email_queue  # type: ignore[attr-defined]
+
+
+async def get_change_feed(request: Request) -> ChangeFeedHub:
+    return request.app.state.change_feed  # type: ignore[attr-defined]
+
+
+async def get_profiles(request: Request) -> ProfileStore:
+    return request.app.state.profiles  # type: ignore[attr-defined]
+
+
 def verify_admin_credentials(username: str, password: str, settings: Settings) -> bool:
     """Verify admin credentials against environment variables."""
     return (
@@ -85,9 +158,14 @@ async def get_all_players(
     password: str,
     page: int = 1,
     limit: int = 50,
+    registration_status: RegistrationStatus | None = None,
+    payment_status: PaymentStatus | None = None,
+    tshirt_size: TshirtSize | None = None,
+    played_jypl_s7: PlayedJyplS7 | None = None,
+    q: str | None = None,
     settings: Settings = Depends(get_settings),
 ):
-    """Get registered players with pagination (requires authentication)."""
+    """Get registered players with pagination, filters and search (requires authentication)."""
     if not verify_admin_credentials(username, password, settings):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -97,57 +175,41 @@ async def get_all_players(
     # Use pagination
     skip = (page - 1) * limit
     
-    # Get total count
-    total = await Player.find_all().count()
+    # Totals come from the precomputed stats document instead of count() queries
+    stats = await get_stats()
+    total = stats.total
+    total_paid = stats.by_status.get(RegistrationStatus.PAID.value, 0)
+
+    query = await build_player_filter(
+        registration_status=registration_status,
+        payment_status=payment_status,
+        tshirt_size=tshirt_size,
+        played_jypl_s7=played_jypl_s7,
+        q=q,
+    )
+    matched = await Player.find(query).count() if query else total
 
-    # Get total paid count (based on registration_status)
-    total_paid = await Player.find(Player.registration_status == "PAID").count()
-    
-    # Fetch players with pagination
-    players = await Player.find_all().skip(skip).limit(limit).sort("-created_at").to_list()
+    # Fetch raw projected documents and render them straight to JSON bytes
+    cursor = Player.get_motor_collection().find(query, projection_of(PlayerListView))
+    players = await cursor.sort("created_at", -1).skip(skip).limit(limit).to_list(length=limit)
     
     # Optimize N+1 query: Fetch all payments for these players in one go
-    player_ids = [player.id for player in players]
-    payments = await Payment.find(In(Payment.player_id, player_ids)).to_list()
+    player_ids = [player["_id"] for player in players]
+    payments = await Payment.get_motor_collection().find(
+        {"player_id": {"$in": player_ids}}, projection_of(PaymentStatusView)
+    ).to_list(length=None)
     
     # Create a map for O(1) lookup
-    payment_map = {payment.player_id: payment for payment in payments}
-    
-    result = []
-    for player in players:
-        payment = payment_map.get(player.id)
-        
-        result.append(
-            PlayerResponse(
-                id=str(player.id),
-                first_name=player.first_name,
-                last_name=player.last_name,
-                email=player.email,
-                phone=player.phone,
-                residential_area=player.residential_area,
-                firm_name=player.firm_name,
-                designation=player.designation,
-                batting_type=player.batting_type,
-                bowling_type=player.bowling_type,
-                wicket_keeper=player.wicket_keeper,
-                name_on_jersey=player.name_on_jersey,
-                tshirt_size=player.tshirt_size,
-                waist_size=player.waist_size,
-                played_jypl_s7=player.played_jypl_s7,
-                jypl_s7_team=player.jypl_s7_team,
-                registration_status=player.registration_status.value,
-                payment_status=payment.status.value if payment else None,
-                created_at=player.created_at.isoformat() if player.created_at else None,
-            )
-        )
+    payment_map = {payment["player_id"]: payment["status"] for payment in payments}
     
-    return {
-        "players": result,
+    return ORJSONResponse({
+        "players": [_player_row(player, payment_map.get(player["_id"])) for player in players],
         "total": total,
         "total_paid": total_paid,
+        "matched": matched,
         "page": page,
         "limit": limit
-    }
+    })
 
 
 @router.get("/players/csv")
@@ -205,29 +267,30 @@ async def export_players_csv(
     # Write player data
     for player in players:
         payment = payment_map.get(player.id)
+        personal, cricket, jersey = player.personal, player.cricket, player.jersey
         
         writer.writerow([
             str(player.id),
-            player.first_name,
-            player.last_name,
-            player.email,
-            player.phone,
-            player.residential_area,
-            player.firm_name,
-            player.designation,
-            player.batting_type,
-            player.bowling_type,
-            player.wicket_keeper,
-            player.name_on_jersey,
-            player.tshirt_size,
-            player.waist_size,
-            player.played_jypl_s7,
-            player.jypl_s7_team,
+            personal.first_name,
+            personal.last_name,
+            personal.email,
+            personal.phone,
+            personal.area,
+            personal.firm,
+            personal.designation,
+            cricket.batting.label,
+            cricket.bowling.label,
+            cricket.keeper.label,
+            jersey.name,
+            jersey.size.label,
+            jersey.waist,
+            cricket.jypl_s7.label,
+            cricket.jypl_s7_team,
             player.registration_status.value,
             payment.status.value if payment else "N/A",
             player.created_at.isoformat() if player.created_at else "",
-            player.photo_url,
-            player.visiting_card_url
+            personal.photo_url,
+            personal.card_url
         ])
     
     output.seek(0)
@@ -239,12 +302,220 @@ async def export_players_csv(
     )
 
 
+@router.get("/players/export")
+async def export_players_columnar(
+    username: str,
+    password: str,
+    file_format: Literal["parquet", "arrow"] = Query(default="parquet", alias="format"),
+    settings: Settings = Depends(get_settings),
+):
+    """Stream every player joined with their payment as Parquet or an Arrow IPC stream.
+
+    Typed columns (ints, UTC timestamps, categoricals) for season analysis; rows are read
+    and written in batches, so memory stays flat however many players there are.
+    """
+    if not verify_admin_credentials(username, password, settings):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid credentials"
+        )
+    if not columnar_export_available():
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail="Columnar export needs pyarrow installed on the server; use the CSV export"
+        )
+
+    media_type, extension = EXPORT_FORMATS[file_format]
+    return StreamingResponse(
+        export_players(file_format),
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename=players.{extension}"}
+    )
+
+
+@router.get("/stats", response_model=DashboardStatsResponse)
+async def get_dashboard_stats(
+    username: str,
+    password: str,
+    settings: Settings = Depends(get_settings),
+):
+    """Precomputed registration, jersey, cricket and revenue breakdowns (requires authentication)."""
+    if not verify_admin_credentials(username, password, settings):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid credentials"
+        )
+
+    stats = await get_stats()
+    return DashboardStatsResponse(
+        total=stats.total,
+        total_paid=stats.by_status.get(RegistrationStatus.PAID.value, 0),
+        by_status=stats.by_status,
+        by_tshirt_size=stats.by_tshirt_size,
+        by_waist_size=stats.by_waist_size,
+        by_batting_type=stats.by_batting_type,
+        by_bowling_type=stats.by_bowling_type,
+        payments_captured=stats.payments_captured,
+        revenue_inr=stats.revenue_paise // 100,
+        updated_at=stats.updated_at.isoformat() if stats.updated_at else None,
+    )
+
+
+FEED_KEEPALIVE_SECONDS = 15
+FEED_EVENT_NAMES = {"players": "player", "payments": "payment"}
+
+
+@router.get("/feed")
+async def admin_feed(
+    username: str,
+    password: str,
+    last_event_id: str | None = None,
+    last_event_id_header: str | None = Header(default=None, alias="Last-Event-ID"),
+    settings: Settings = Depends(get_settings),
+    hub: ChangeFeedHub = Depends(get_change_feed),
+):
+    """Server-Sent Events stream of player and payment changes (requires authentication).
+
+    Emits ``player`` and ``payment`` events with the changed listing fields. A ``reset``
+    event means the client missed changes and should reload /players.
+    """
+    if not verify_admin_credentials(username, password, settings):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid credentials"
+        )
+
+    resume_from = last_event_id_header or last_event_id
+    subscription, replay = hub.subscribe(last_event_id=resume_from)
+
+    async def stream():
+        try:
+            yield b"retry: 3000\n\n"
+            if replay is None:
+                yield sse_message("reset", {"reason": "history_unavailable"})
+            for event in replay or []:
+                yield sse_message(FEED_EVENT_NAMES[event.collection], event.payload(), event.id)
+            while True:
+                if subscription.take_lag():
+                    yield sse_message("reset", {"reason": "lagged"})
+                event = await subscription.get(FEED_KEEPALIVE_SECONDS)
+                if event is None:
+                    yield SSE_KEEPALIVE
+                    continue
+                yield sse_message(FEED_EVENT_NAMES[event.collection], event.payload(), event.id)
+        finally:
+            hub.unsubscribe(subscription)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+class ProfileArmRequest(BaseModel):
+    path: str = Field(..., min_length=1)
+    count: int = Field(default=1, ge=0, le=100)
+
+
+@router.get("/profiles")
+async def list_profiles(
+    username: str,
+    password: str,
+    settings: Settings = Depends(get_settings),
+    profiles: ProfileStore = Depends(get_profiles),
+):
+    """List captured request profiles, newest first (requires authentication)."""
+    if not verify_admin_credentials(username, password, settings):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid credentials"
+        )
+
+    return {
+        "profiles": [record.summary() for record in profiles.list()],
+        "armed": profiles.armed,
+        "slow_request_ms": settings.profiling_slow_request_ms,
+    }
+
+
+@router.post("/profiles/arm")
+async def arm_profiling(
+    payload: ProfileArmRequest,
+    username: str,
+    password: str,
+    settings: Settings = Depends(get_settings),
+    profiles: ProfileStore = Depends(get_profiles),
+):
+    """Profile the next `count` requests whose path starts with `path` on this worker (requires authentication)."""
+    if not verify_admin_credentials(username, password, settings):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid credentials"
+        )
+
+    profiles.arm(payload.path, payload.count)
+    return {"armed": profiles.armed}
+
+
+@router.get("/profiles/{profile_id}")
+async def get_profile(
+    profile_id: str,
+    username: str,
+    password: str,
+    settings: Settings = Depends(get_settings),
+    profiles: ProfileStore = Depends(get_profiles),
+):
+    """Span breakdown for a captured profile (requires authentication)."""
+    if not verify_admin_credentials(username, password, settings):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid credentials"
+        )
+
+    record = profiles.get(profile_id)
+    if not record:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
+    return record.detail()
+
+
+@router.get("/profiles/{profile_id}/download")
+async def download_profile(
+    profile_id: str,
+    username: str,
+    password: str,
+    settings: Settings = Depends(get_settings),
+    profiles: ProfileStore = Depends(get_profiles),
+):
+    """Download the pyinstrument HTML report for an explicitly profiled request (requires authentication)."""
+    if not verify_admin_credentials(username, password, settings):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid credentials"
+        )
+
+    record = profiles.get(profile_id)
+    if not record:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
+    if record.html is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No sampling profile for this request; only the span breakdown was captured"
+        )
+    return HTMLResponse(
+        content=record.html,
+        headers={"Content-Disposition": f"attachment; filename=profile-{record.id}.html"}
+    )
+
+
 class ConfigResponse(BaseModel):
     registration_open: bool
+    registration_cap: int
 
 
 class ConfigUpdateRequest(BaseModel):
     registration_open: bool
+    registration_cap: int | None = Field(default=None, ge=0)
 
 
 @router.get("/config", response_model=ConfigResponse)
@@ -260,11 +531,8 @@ async def get_config(
             detail="Invalid credentials"
         )
 
-    cfg = await AppConfig.find_one({})
-    if cfg is None:
-        cfg = AppConfig(registration_open=True)
-        await cfg.insert()
-    return ConfigResponse(registration_open=cfg.registration_open)
+    cfg = await AppConfig.get_or_create()
+    return ConfigResponse(registration_open=cfg.registration_open, registration_cap=cfg.registration_cap)
 
 
 @router.post("/config", response_model=ConfigResponse)
@@ -281,14 +549,13 @@ async def update_config(
             detail="Invalid credentials"
         )
 
-    cfg = await AppConfig.find_one({})
-    if cfg is None:
-        cfg = AppConfig(registration_open=payload.registration_open)
-        await cfg.insert()
-    else:
-        cfg.registration_open = payload.registration_open
-        await cfg.save()
-    return ConfigResponse(registration_open=cfg.registration_open)
+    cfg = await AppConfig.get_or_create()
+    changes: dict = {AppConfig.registration_open: payload.registration_open}
+    if payload.registration_cap is not None:
+        changes[AppConfig.registration_cap] = payload.registration_cap
+    # Partial write: a full save would reset the slot counter and scheduler lease to stale values
+    await cfg.set(changes)
+    return ConfigResponse(registration_open=cfg.registration_open, registration_cap=cfg.registration_cap)
 
 
 @router.post("/approve/{player_id}")
@@ -320,13 +587,23 @@ async def approve_player(
             detail=f"Player is not in waitlist (Status: {player.registration_status})"
         )
         
-    player.registration_status = RegistrationStatus.APPROVED
-    await player.save()
+    # Guarded partial write: a concurrent edit or approval is not overwritten
+    result = await Player.find(
+        Player.id == player.id,
+        Player.registration_status == RegistrationStatus.WAITLIST,
+    ).update_many(
+        Set({Player.registration_status: RegistrationStatus.APPROVED, Player.approved_at: datetime.now(timezone.utc)}),
+        Inc({Player.revision: 1}),
+    )
+    if result.modified_count != 1:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Player status changed concurrently")
+    await record_status_change(RegistrationStatus.WAITLIST, RegistrationStatus.APPROVED)
+    await adjust_slots(1)
     
     # Send email
     await send_approval_email(
-        to_email=player.email,
-        name=f"{player.first_name} {player.last_name}",
+        to_email=player.personal.email,
+        name=f"{player.personal.first_name} {player.personal.last_name}",
         player_id=str(player.id)
     )
     
@@ -362,12 +639,125 @@ async def reject_player(
             detail=f"Player is not in waitlist (Status: {player.registration_status})"
         )
         
-    player.registration_status = RegistrationStatus.REJECTED
-    await player.save()
+    result = await Player.find(
+        Player.id == player.id,
+        Player.registration_status == RegistrationStatus.WAITLIST,
+    ).update_many(Set({Player.registration_status: RegistrationStatus.REJECTED}), Inc({Player.revision: 1}))
+    if result.modified_count != 1:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Player status changed concurrently")
+    await record_status_change(RegistrationStatus.WAITLIST, RegistrationStatus.REJECTED)
     
     return {"message": "Player rejected"}
 
 
+@router.post("/players/bulk-status", response_model=BulkStatusResponse)
+async def bulk_update_status(
+    payload: BulkStatusRequest,
+    username: str,
+    password: str,
+    settings: Settings = Depends(get_settings),
+    email_queue: EmailQueue = Depends(get_email_queue),
+):
+    """Approve or reject many waitlisted players in one call; approval emails are queued."""
+    if not verify_admin_credentials(username, password, settings):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid credentials"
+        )
+
+    if not payload.player_ids and payload.oldest_waitlisted is None:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Provide player_ids or oldest_waitlisted"
+        )
+
+    results: dict[str, BulkStatusResult] = {}
+    requested: list[PydanticObjectId] = []
+    for raw_id in payload.player_ids:
+        try:
+            requested.append(PydanticObjectId(raw_id))
+        except Exception:
+            results[raw_id] = BulkStatusResult(player_id=raw_id, result="not_found")
+
+    if payload.oldest_waitlisted:
+        oldest = await Player.find(
+            Player.registration_status == RegistrationStatus.WAITLIST
+        ).sort("+created_at").limit(payload.oldest_waitlisted).project(PlayerStatusView).to_list()
+        requested.extend(player.id for player in oldest)
+
+    # Preserve request order while dropping duplicates
+    object_ids = list(dict.fromkeys(requested))
+
+    snapshots = await Player.find(In(Player.id, object_ids)).project(PlayerStatusView).to_list()
+    snapshot_map = {player.id: player for player in snapshots}
+    waitlisted_ids = [
+        player.id for player in snapshots
+        if player.registration_status == RegistrationStatus.WAITLIST
+    ]
+
+    if payload.action == "approve":
+        target_status, outcome = RegistrationStatus.APPROVED, "approved"
+    else:
+        target_status, outcome = RegistrationStatus.REJECTED, "rejected"
+
+    changes: dict = {Player.registration_status: target_status}
+    if target_status == RegistrationStatus.APPROVED:
+        changes[Player.approved_at] = datetime.now(timezone.utc)
+
+    async def transition(player_id: PydanticObjectId) -> bool:
+        # Guarded per player so modified_count says whether this request made the change; a
+        # player approved by another admin or the scheduler meanwhile is untouched and not emailed
+        result = await Player.find(
+            Player.id == player_id,
+            Player.registration_status == RegistrationStatus.WAITLIST,
+        ).update_many(Set(changes), Inc({Player.revision: 1}))
+        return result.modified_count == 1
+
+    applied = await asyncio.gather(*(transition(player_id) for player_id in waitlisted_ids))
+    transitioned = {player_id for player_id, changed in zip(waitlisted_ids, applied) if changed}
+    updated = len(transitioned)
+    await record_status_change(RegistrationStatus.WAITLIST, target_status, count=updated)
+    if target_status == RegistrationStatus.APPROVED:
+        await adjust_slots(updated)
+
+    if updated < len(waitlisted_ids):
+        # Lost a race for some players; re-read to report their current status
+        lost = [player_id for player_id in waitlisted_ids if player_id not in transitioned]
+        for player in await Player.find(In(Player.id, lost)).project(PlayerStatusView).to_list():
+            snapshot_map[player.id] = player
+
+    emails_queued = 0
+    for object_id in object_ids:
+        player = snapshot_map.get(object_id)
+        key = str(object_id)
+        if player is None:
+            results[key] = BulkStatusResult(player_id=key, result="not_found")
+        elif object_id in transitioned:
+            results[key] = BulkStatusResult(
+                player_id=key, result=outcome, registration_status=target_status.value
+            )
+            if target_status == RegistrationStatus.APPROVED:
+                email_queue.enqueue(
+                    send_approval_email,
+                    to_email=player.personal.email,
+                    name=f"{player.personal.first_name} {player.personal.last_name}",
+                    player_id=key,
+                )
+                emails_queued += 1
+        else:
+            results[key] = BulkStatusResult(
+                player_id=key,
+                result="not_in_waitlist",
+                registration_status=player.registration_status.value,
+            )
+
+    return BulkStatusResponse(
+        updated=updated,
+        emails_queued=emails_queued,
+        results=list(results.values()),
+    )
+
+
 @router.post("/resend-email/{player_id}")
 async def resend_email(
     player_id: str,
@@ -396,8 +786,8 @@ async def resend_email(
     if player.registration_status == RegistrationStatus.APPROVED:
         # Resend Approval Email
         success = await send_approval_email(
-            to_email=player.email,
-            name=f"{player.first_name} {player.last_name}",
+            to_email=player.personal.email,
+            name=f"{player.personal.first_name} {player.personal.last_name}",
             player_id=str(player.id)
         )
         if not success:
@@ -405,16 +795,16 @@ async def resend_email(
         return {"message": "Approval email resent"}
 
     elif player.registration_status == RegistrationStatus.PAID:
-        # Resend Success Email
-        # We might need payment amount. Defaulting to 12500 if not found, 
-        # or we could fetch payment but for email resend it might be overkill (?)
-        # Let's try to fetch payment to be accurate.
-        payment = await Payment.find_one(Payment.player_id == str(player.id))
-        amount = payment.amount if payment else 12500
+        # Resend Success Email with the captured amount; falls back to the ₹12,500 fee
+        payment = await Payment.find_one(
+            Payment.player_id == player.id,
+            Payment.status == PaymentStatus.CAPTURED,
+        )
+        amount = payment.amount // 100 if payment else 12500  # Payment.amount is in paise
 
         success = await send_success_email(
-            to_email=player.email,
-            name=f"{player.first_name} {player.last_name}",
+            to_email=player.personal.email,
+            name=f"{player.personal.first_name} {player.personal.last_name}",
             player_id=str(player.id),
             amount=amount
         )
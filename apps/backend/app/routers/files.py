@@ -0,0 +1,106 @@
+import re
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response, status
+from fastapi.responses import StreamingResponse
+from motor.motor_asyncio import AsyncIOMotorGridOut
+
+from app.services.storage import GridFSStorageService
+
+router = APIRouter(prefix="/api/files", tags=["files"])
+
+_BYTE_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+# Stored files never change (a new upload gets a new id), so caches may keep them forever
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+async def get_storage(request: Request):
+    return request.app.state.storage  # type: ignore[attr-defined]
+
+
+def parse_range(header: str, length: int) -> tuple[int, int] | None:
+    """Inclusive (start, end) for a single ``bytes=`` range, or None to send the whole file.
+
+    Raises 416 for a range that lies outside the file. Multi-range requests are answered
+    with the whole file, which RFC 9110 allows.
+    """
+    match = _BYTE_RANGE.match(header.strip())
+    if match is None:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # Suffix range: the last N bytes
+        start, end = max(0, length - int(last)), length - 1
+    else:
+        start = int(first)
+        end = min(int(last), length - 1) if last else length - 1
+    if start >= length or start > end:
+        raise HTTPException(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{length}"},
+        )
+    return start, end
+
+
+async def _read_range(grid_out: AsyncIOMotorGridOut, start: int, end: int):
+    """Yield bytes start..end (inclusive) one GridFS chunk at a time."""
+    grid_out.seek(start)
+    remaining = end - start + 1
+    while remaining > 0:
+        chunk = await grid_out.readchunk()
+        if not chunk:
+            break
+        chunk = chunk[:remaining]
+        remaining -= len(chunk)
+        yield chunk
+
+
+@router.api_route("/{file_id}", methods=["GET", "HEAD"])
+async def get_file(
+    file_id: str,
+    request: Request,
+    range_header: str | None = Header(default=None, alias="Range"),
+    if_none_match: str | None = Header(default=None, alias="If-None-Match"),
+    if_range: str | None = Header(default=None, alias="If-Range"),
+    storage=Depends(get_storage),
+):
+    """Stream a file stored in GridFS, with ETag revalidation and single byte ranges."""
+    if not isinstance(storage, GridFSStorageService):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="File not found")
+    grid_out = await storage.open(file_id)
+    if grid_out is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="File not found")
+
+    etag = f'"{grid_out._id}"'
+    headers = {
+        "ETag": etag,
+        "Accept-Ranges": "bytes",
+        "Cache-Control": IMMUTABLE_CACHE_CONTROL,
+    }
+    if if_none_match is not None and etag in (tag.strip().removeprefix("W/") for tag in if_none_match.split(",")):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    length = grid_out.length
+    metadata = grid_out.metadata or {}
+    media_type = metadata.get("contentType") or "application/octet-stream"
+
+    byte_range = None
+    if range_header and (if_range is None or if_range.strip() == etag):
+        byte_range = parse_range(range_header, length)
+    start, end = byte_range or (0, length - 1)
+    headers["Content-Length"] = str(max(0, end - start + 1))
+    status_code = status.HTTP_200_OK
+    if byte_range is not None:
+        status_code = status.HTTP_206_PARTIAL_CONTENT
+        headers["Content-Range"] = f"bytes {start}-{end}/{length}"
+
+    if request.method == "HEAD" or length == 0:
+        return Response(status_code=status_code, headers=headers, media_type=media_type)
+    return StreamingResponse(
+        _read_range(grid_out, start, end),
+        status_code=status_code,
+        headers=headers,
+        media_type=media_type,
+    )
@@ -1,12 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException, Request, status, BackgroundTasks
+import time
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status, BackgroundTasks
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from beanie import PydanticObjectId
+from beanie.operators import In, Set
 
 from app.core.config import Settings
 from app.models.payment import Payment, PaymentStatus
 from app.models.player import Player, RegistrationStatus
+from app.models.projections import PaymentStatusView, PlayerStateView, PlayerStatusView
+from app.services.change_feed import SSE_KEEPALIVE, sse_message
+from app.services.payment_events import PaymentEvents, PaymentOutcome
+from app.services.rate_limit import RateLimiter
 from app.services.razorpay import RazorpayService
 from app.services.email_service import send_success_email
+from app.services.stats import record_payment_captured, record_status_change
+from app.services.waitlist import SLOT_HOLDING_STATUSES, adjust_slots
 
 router = APIRouter(prefix="/api/payments", tags=["payments"])
 
@@ -42,21 +52,89 @@ async def get_razorpay(request: Request) -> RazorpayService:
     return request.app.state.razorpay  # type: ignore[attr-defined]
 
 
+async def get_rate_limiter(request: Request) -> RateLimiter:
+    return request.app.state.rate_limiter  # type: ignore[attr-defined]
+
+
+async def get_payment_events(request: Request) -> PaymentEvents:
+    return request.app.state.payment_events  # type: ignore[attr-defined]
+
+
+async def _capture_payment(
+    payment: Payment,
+    razorpay_payment_id: str,
+    razorpay_signature: str | None = None,
+) -> bool:
+    """Atomically mark a payment CAPTURED; False if it already was (e.g. the webhook won the race)."""
+    changes = {
+        Payment.status: PaymentStatus.CAPTURED,
+        Payment.razorpay_payment_id: razorpay_payment_id,
+    }
+    if razorpay_signature is not None:
+        changes[Payment.razorpay_signature] = razorpay_signature
+
+    result = await Payment.find(
+        Payment.id == payment.id,
+        Payment.status != PaymentStatus.CAPTURED,
+    ).update_many(Set(changes))
+    if result.modified_count == 0:
+        return False
+
+    payment.status = PaymentStatus.CAPTURED
+    payment.razorpay_payment_id = razorpay_payment_id
+    if razorpay_signature is not None:
+        payment.razorpay_signature = razorpay_signature
+    await record_payment_captured(payment.amount)
+    return True
+
+
+async def _mark_player_paid(player_id: PydanticObjectId) -> None:
+    previous = await Player.get_motor_collection().find_one_and_update(
+        {"_id": player_id, "registration_status": {"$ne": RegistrationStatus.PAID.value}},
+        {"$set": {"registration_status": RegistrationStatus.PAID.value}, "$inc": {"revision": 1}},
+        projection={"registration_status": True},
+    )
+    if previous is not None:
+        await record_status_change(previous["registration_status"], RegistrationStatus.PAID)
+        if previous["registration_status"] not in SLOT_HOLDING_STATUSES:
+            # A late payment (e.g. after expiry) takes a slot even when none is free
+            await adjust_slots(1)
+
+
+async def _claim_confirmation_email(payment: Payment) -> bool:
+    """Flip confirmation_email_sent exactly once so verify and webhook never both send."""
+    result = await Payment.find(
+        Payment.id == payment.id,
+        Payment.confirmation_email_sent == False,  # noqa: E712
+    ).update_many(Set({Payment.confirmation_email_sent: True}))
+    if result.modified_count == 0:
+        return False
+    payment.confirmation_email_sent = True
+    return True
+
+
 @router.post("/create-order", response_model=CreateOrderResponse)
 async def create_order(
     payload: CreateOrderRequest,
     settings: Settings = Depends(get_settings),
     razorpay: RazorpayService = Depends(get_razorpay),
+    limiter: RateLimiter = Depends(get_rate_limiter),
 ):
+    await limiter.check("player", payload.player_id)
     player_id = PydanticObjectId(payload.player_id)
-    player = await Player.get(player_id)
+    player = await Player.find_one(Player.id == player_id).project(PlayerStateView)
     if not player:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Player not found")
 
     if player.registration_status == RegistrationStatus.PAID:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Already paid")
 
-    existing_payment = await Payment.find_one(Payment.player_id == player_id, Payment.status == PaymentStatus.CAPTURED)
+    if player.registration_status == RegistrationStatus.EXPIRED:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Payment window has expired")
+
+    existing_payment = await Payment.find_one(
+        Payment.player_id == player_id, Payment.status == PaymentStatus.CAPTURED
+    ).project(PaymentStatusView)
     if existing_payment:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Payment already captured")
 
@@ -86,7 +164,10 @@ async def verify_payment(
     background_tasks: BackgroundTasks,
     settings: Settings = Depends(get_settings),
     razorpay: RazorpayService = Depends(get_razorpay),
+    payment_events: PaymentEvents = Depends(get_payment_events),
 ):
+    # No per-player limit here: that budget is create-order's, and a player who retried checkout
+    # a few times must still be able to confirm the payment they made
     player_id = PydanticObjectId(payload.player_id)
 
     payment = await Payment.find_one(Payment.razorpay_order_id == payload.razorpay_order_id, Payment.player_id == player_id)
@@ -100,37 +181,33 @@ async def verify_payment(
     )
 
     if not is_valid:
-        payment.status = PaymentStatus.FAILED
-        payment.razorpay_payment_id = payload.razorpay_payment_id
-        payment.razorpay_signature = payload.razorpay_signature
-        await payment.save()
+        if payment.status != PaymentStatus.CAPTURED:
+            payment.status = PaymentStatus.FAILED
+            payment.razorpay_payment_id = payload.razorpay_payment_id
+            payment.razorpay_signature = payload.razorpay_signature
+            await payment.save()
+            payment_events.publish(player_id)
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid signature")
 
-    payment.status = PaymentStatus.CAPTURED
-    payment.razorpay_payment_id = payload.razorpay_payment_id
-    payment.razorpay_signature = payload.razorpay_signature
-    await payment.save()
+    await _capture_payment(payment, payload.razorpay_payment_id, payload.razorpay_signature)
 
-    player = await Player.get(player_id)
+    player = await Player.find_one(Player.id == player_id).project(PlayerStatusView)
     if player:
-        player.registration_status = RegistrationStatus.PAID
-        await player.save()
+        await _mark_player_paid(player.id)
+        payment_events.publish(player.id)
 
         # Send confirmation email if not already sent
-        if not payment.confirmation_email_sent:
-            full_name = f"{player.first_name} {player.last_name}"
+        if await _claim_confirmation_email(payment):
+            full_name = f"{player.personal.first_name} {player.personal.last_name}"
             amount_inr = payment.amount // 100  # Convert paise to rupees
             
             background_tasks.add_task(
                 send_success_email,
-                to_email=player.email,
+                to_email=player.personal.email,
                 name=full_name,
                 player_id=str(player.id),
                 amount=amount_inr
             )
-            
-            payment.confirmation_email_sent = True
-            await payment.save()
 
     return VerifyPaymentResponse(status="CAPTURED", message="Payment verified")
 
@@ -141,6 +218,7 @@ async def razorpay_webhook(
     background_tasks: BackgroundTasks,
     settings: Settings = Depends(get_settings),
     razorpay: RazorpayService = Depends(get_razorpay),
+    payment_events: PaymentEvents = Depends(get_payment_events),
 ):
     """Handle Razorpay webhook events."""
     if not settings.razorpay_webhook_secret:
@@ -191,31 +269,103 @@ async def razorpay_webhook(
             return {"status": "ignored", "reason": "payment record not found"}
 
         # Update payment status
-        payment.status = PaymentStatus.CAPTURED
-        payment.razorpay_payment_id = payment_id
-        await payment.save()
+        await _capture_payment(payment, payment_id)
 
         # Update player status
-        player = await Player.get(payment.player_id)
+        player = await Player.find_one(Player.id == payment.player_id).project(PlayerStatusView)
         if player:
-            player.registration_status = RegistrationStatus.PAID
-            await player.save()
-            
+            await _mark_player_paid(player.id)
+            payment_events.publish(player.id)
+
             # Send confirmation email
-            if not payment.confirmation_email_sent:
-                full_name = f"{player.first_name} {player.last_name}"
+            if await _claim_confirmation_email(payment):
+                full_name = f"{player.personal.first_name} {player.personal.last_name}"
                 amount_inr = payment.amount // 100  # Convert paise to rupees
                 
                 # Send email asynchronously (non-blocking)
                 background_tasks.add_task(
                     send_success_email,
-                    to_email=player.email,
+                    to_email=player.personal.email,
                     name=full_name,
                     player_id=str(player.id),
                     amount=amount_inr
                 )
-                
-                payment.confirmation_email_sent = True
-                await payment.save()
+
+    # payment.failed comes for each failed attempt; the player may retry on the same order, so
+    # it is recorded as the latest attempt's status and the checkout page keeps waiting
+    elif event_type == "payment.failed":
+        payment_entity = payload.get("payload", {}).get("payment", {}).get("entity", {})
+        order_id = payment_entity.get("order_id")
+        if not order_id:
+            return {"status": "ignored", "reason": "missing order_id"}
+
+        result = await Payment.find(
+            Payment.razorpay_order_id == order_id,
+            In(Payment.status, [PaymentStatus.CREATED, PaymentStatus.FAILED]),
+        ).update_many(Set({Payment.status: PaymentStatus.FAILED, Payment.razorpay_payment_id: payment_entity.get("id")}))
+        if result.modified_count:
+            payment = await Payment.find_one(Payment.razorpay_order_id == order_id).project(PaymentStatusView)
+            if payment:
+                payment_events.publish(payment.player_id)
 
     return {"status": "ok"}
+
+
+STATUS_STREAM_MAX_SECONDS = 600
+STATUS_STREAM_KEEPALIVE_SECONDS = 15
+
+
+def _parse_player_id(player_id: str) -> PydanticObjectId:
+    try:
+        return PydanticObjectId(player_id)
+    except Exception as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Player not found") from exc
+
+
+@router.get("/status/{player_id}", response_model=PaymentOutcome)
+async def payment_status(
+    player_id: str,
+    wait: float = Query(default=0, ge=0, le=30, description="Long-poll: seconds to wait for a final outcome"),
+    payment_events: PaymentEvents = Depends(get_payment_events),
+):
+    """Payment outcome for a player; with ``wait`` it returns as soon as it changes or is CAPTURED."""
+    outcome = await payment_events.wait_for_outcome(_parse_player_id(player_id), wait)
+    if outcome is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Player not found")
+    return outcome
+
+
+@router.get("/status/{player_id}/stream")
+async def payment_status_stream(
+    player_id: str,
+    payment_events: PaymentEvents = Depends(get_payment_events),
+):
+    """Server-Sent Events: a ``status`` event now and on every change until CAPTURED, then close.
+
+    A FAILED event reports a failed attempt; the stream stays open for a retry until its deadline.
+    """
+    object_id = _parse_player_id(player_id)
+    outcome = await payment_events.wait_for_outcome(object_id, 0)
+    if outcome is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Player not found")
+
+    async def stream():
+        current = outcome
+        yield b"retry: 3000\n\n"
+        yield sse_message("status", current.model_dump())
+        deadline = time.monotonic() + STATUS_STREAM_MAX_SECONDS
+        while not current.is_final and time.monotonic() < deadline:
+            latest = await payment_events.wait_for_outcome(object_id, STATUS_STREAM_KEEPALIVE_SECONDS)
+            if latest is None:
+                return
+            if latest != current:
+                current = latest
+                yield sse_message("status", current.model_dump())
+            else:
+                yield SSE_KEEPALIVE
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
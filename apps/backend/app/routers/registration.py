@@ -1,12 +1,35 @@
 from datetime import datetime, timezone
 
-from fastapi import APIRouter, Depends, File, Form, HTTPException, Request, UploadFile, status
-from pydantic import BaseModel
+from fastapi import APIRouter, Depends, File, Form, Header, HTTPException, Request, Response, UploadFile, status
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ValidationError
+from pymongo import ReturnDocument
 from pymongo.errors import DuplicateKeyError
 
-from app.models.player import Player, RegistrationStatus
+from app.core.identity import email_key, phone_key
+from app.core.profiling import span
+from app.models.player import (
+    BattingType,
+    BowlingType,
+    CricketDetails,
+    FIELD_PATHS,
+    JerseyDetails,
+    PersonalDetails,
+    PlayedJyplS7,
+    Player,
+    RegistrationStatus,
+    TshirtSize,
+    WicketKeeper,
+    flatten_details,
+    nest_details,
+)
 from app.models.config import AppConfig
+from app.models.projections import PlayerContactView, PlayerIdView
+from app.services.rate_limit import RateLimiter
+from app.services.stats import get_stats, record_player_changed, record_player_created
 from app.services.storage import StorageService
+from app.services.uploads import ResumableUploads
+from app.services.waitlist import waitlist_position
 
 router = APIRouter(prefix="/api", tags=["registration"])
 
@@ -14,6 +37,11 @@ MAX_FILE_BYTES = 10 * 1024 * 1024
 PHOTO_MIMES = {"image/jpeg", "image/png", "image/heic", "image/heif"}
 CARD_MIMES = {"image/jpeg", "image/png", "image/heic", "image/heif", "application/pdf"}
 
+# Checked by UploadGuardMiddleware while the multipart body streams in
+UPLOAD_ROUTES = [("POST", "/api/register"), ("PUT", r"/api/player/[^/]+")]
+UPLOAD_FIELD_TYPES = {"photo": PHOTO_MIMES, "visiting_card": CARD_MIMES}
+MAX_UPLOAD_REQUEST_BYTES = 2 * MAX_FILE_BYTES + 1024 * 1024
+
 
 class RegisterResponse(BaseModel):
     player_id: str
@@ -57,12 +85,63 @@ class PlayerDetailsResponse(BaseModel):
     registration_status: str
 
 
+PLAYER_DETAILS_FIELDS = tuple(PlayerDetailsResponse.model_fields)
+PLAYER_DETAILS_PROJECTION = {"personal": 1, "cricket": 1, "jersey": 1, "registration_status": 1, "revision": 1}
+
+
+def revision_etag(revision: int) -> str:
+    return f'"{revision}"'
+
+
+def etag_matches(header: str, revision: int) -> bool:
+    """True if an If-Match / If-None-Match header lists this revision's ETag (or is ``*``)."""
+    etag = revision_etag(revision)
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def _path_value(player: Player, path: str):
+    """The value at a dotted document path (``jersey.size``) of a Player."""
+    value = player
+    for name in path.split("."):
+        value = getattr(value, name)
+    return value
+
+
 async def get_storage(request: Request) -> StorageService:
     return request.app.state.storage  # type: ignore[attr-defined]
 
 
+async def get_rate_limiter(request: Request) -> RateLimiter:
+    return request.app.state.rate_limiter  # type: ignore[attr-defined]
+
+
+async def get_uploads(request: Request) -> ResumableUploads:
+    return request.app.state.uploads  # type: ignore[attr-defined]
+
+
+async def store_file(
+    field: str,
+    file: UploadFile | None,
+    upload_id: str | None,
+    allowed_mimes: set[str],
+    storage: StorageService,
+    uploads: ResumableUploads,
+) -> str | None:
+    """URL for a form file: a completed resumable upload if referenced, else the inline part."""
+    if upload_id:
+        return await uploads.resolve(upload_id, field)
+    if file and file.filename:
+        return await storage.save_upload(file, allowed_mimes, MAX_FILE_BYTES)
+    return None
+
+
 @router.post("/register", response_model=RegisterResponse)
 async def register_player(
+    response: Response,
     # Personal Details
     first_name: str = Form(...),
     last_name: str = Form(...),
@@ -71,86 +150,109 @@ async def register_player(
     residential_area: str = Form(...),
     firm_name: str = Form(...),
     designation: str = Form(...),
-    photo: UploadFile = File(...),
-    visiting_card: UploadFile = File(...),
+    # Either the files themselves, or ids of completed /api/uploads
+    photo: UploadFile = File(None),
+    visiting_card: UploadFile = File(None),
+    photo_upload_id: str | None = Form(default=None),
+    visiting_card_upload_id: str | None = Form(default=None),
     # Cricket Details
-    batting_type: str = Form(...),
-    bowling_type: str = Form(...),
-    wicket_keeper: str = Form(...),
+    batting_type: BattingType = Form(...),
+    bowling_type: BowlingType = Form(...),
+    wicket_keeper: WicketKeeper = Form(...),
     # Jersey Details
     name_on_jersey: str = Form(...),
-    tshirt_size: str = Form(...),
+    tshirt_size: TshirtSize = Form(...),
     waist_size: int = Form(...),
     # JYPL Season 8 Details
-    played_jypl_s7: str = Form(...),
+    played_jypl_s7: PlayedJyplS7 = Form(...),
     jypl_s7_team: str = Form(default=""),
     storage: StorageService = Depends(get_storage),
+    uploads: ResumableUploads = Depends(get_uploads),
+    limiter: RateLimiter = Depends(get_rate_limiter),
 ):
+    await limiter.check("email", email_key(email))
+
     # Check registration status
-    cfg = await AppConfig.find_one({})
+    with span("config"):
+        cfg = await AppConfig.find_one({})
     if cfg and not cfg.registration_open:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Registration is currently closed")
 
-    # Basic phone validation: require at least 10 digits (ignoring formatting)
-    digit_only_phone = "".join(ch for ch in phone if ch.isdigit())
-    if len(digit_only_phone) < 10:
+    # Phone must normalise to E.164 (ten digits, or a full international number)
+    normalized_phone = phone_key(phone)
+    if normalized_phone is None:
         raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Phone must have at least 10 digits")
 
     # Duplicate checks - do these before cap check to avoid confusion
-    if await Player.find_one(Player.email == email):
+    with span("duplicate_check"):
+        email_taken = await Player.find_one(Player.email_key == email_key(email)).project(PlayerIdView)
+        phone_taken = not email_taken and await Player.find_one(Player.phone_key == normalized_phone).project(PlayerIdView)
+    if email_taken:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Email already registered")
-    if await Player.find_one(Player.phone == phone):
+    if phone_taken:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Phone already registered")
 
     # Check registration cap
     registration_cap = cfg.registration_cap if cfg else 200
-    current_count = await Player.count()
+    with span("capacity_check"):
+        current_count = await Player.count()
     if current_count >= registration_cap:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail=f"Registration has reached maximum capacity of {registration_cap} players"
         )
 
-    photo_url = await storage.save_upload(photo, PHOTO_MIMES, MAX_FILE_BYTES)
-    card_url = await storage.save_upload(visiting_card, CARD_MIMES, MAX_FILE_BYTES)
-
-    player = Player(
-        # Personal Details
-        first_name=first_name,
-        last_name=last_name,
-        email=email,
-        phone=phone,
-        residential_area=residential_area,
-        firm_name=firm_name,
-        designation=designation,
-        photo_url=photo_url,
-        visiting_card_url=card_url,
-        # Cricket Details
-        batting_type=batting_type,
-        bowling_type=bowling_type,
-        wicket_keeper=wicket_keeper,
-        # Jersey Details
-        name_on_jersey=name_on_jersey,
-        tshirt_size=tshirt_size,
-        waist_size=waist_size,
-        # JYPL Season 8 Details
-        played_jypl_s7=played_jypl_s7,
-        jypl_s7_team=jypl_s7_team,
-        registration_status=RegistrationStatus.WAITLIST,
-        created_at=datetime.now(timezone.utc),
-    )
+    if not (photo_upload_id or (photo and photo.filename)):
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Photo is required")
+    if not (visiting_card_upload_id or (visiting_card and visiting_card.filename)):
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Visiting card is required")
+    photo_url = await store_file("photo", photo, photo_upload_id, PHOTO_MIMES, storage, uploads)
+    card_url = await store_file("visiting_card", visiting_card, visiting_card_upload_id, CARD_MIMES, storage, uploads)
 
     try:
-        await player.insert()
+        player = Player(
+            personal=PersonalDetails(
+                first_name=first_name,
+                last_name=last_name,
+                email=email,
+                phone=phone,
+                area=residential_area,
+                firm=firm_name,
+                designation=designation,
+                photo_url=photo_url,
+                card_url=card_url,
+            ),
+            cricket=CricketDetails(
+                batting=batting_type,
+                bowling=bowling_type,
+                keeper=wicket_keeper,
+                jypl_s7=played_jypl_s7,
+                jypl_s7_team=jypl_s7_team,
+            ),
+            jersey=JerseyDetails(name=name_on_jersey, size=tshirt_size, waist=waist_size),
+            registration_status=RegistrationStatus.WAITLIST,
+            created_at=datetime.now(timezone.utc),
+        )
+    except ValidationError as exc:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Invalid player details") from exc
+
+    try:
+        with span("insert"):
+            await player.insert()
     except DuplicateKeyError as exc:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Duplicate email or phone") from exc
 
+    with span("stats"):
+        await record_player_created(player)
+
+    response.headers["ETag"] = revision_etag(player.revision)
     return RegisterResponse(player_id=str(player.id), message="Added to Waitlist", status=RegistrationStatus.WAITLIST.value)
 
 
 @router.put("/player/{player_id}", response_model=RegisterResponse)
 async def update_player(
     player_id: str,
+    response: Response,
     # Personal Details
     first_name: str = Form(...),
     last_name: str = Form(...),
@@ -161,20 +263,34 @@ async def update_player(
     designation: str = Form(...),
     photo: UploadFile = File(None),
     visiting_card: UploadFile = File(None),
+    photo_upload_id: str | None = Form(default=None),
+    visiting_card_upload_id: str | None = Form(default=None),
     # Cricket Details
-    batting_type: str = Form(...),
-    bowling_type: str = Form(...),
-    wicket_keeper: str = Form(...),
+    batting_type: BattingType = Form(...),
+    bowling_type: BowlingType = Form(...),
+    wicket_keeper: WicketKeeper = Form(...),
     # Jersey Details
     name_on_jersey: str = Form(...),
-    tshirt_size: str = Form(...),
+    tshirt_size: TshirtSize = Form(...),
     waist_size: int = Form(...),
     # JYPL Season 8 Details
-    played_jypl_s7: str = Form(...),
+    played_jypl_s7: PlayedJyplS7 = Form(...),
     jypl_s7_team: str = Form(default=""),
+    if_match: str | None = Header(default=None, alias="If-Match"),
     storage: StorageService = Depends(get_storage),
+    uploads: ResumableUploads = Depends(get_uploads),
 ):
-    """Update existing player details"""
+    """Update existing player details.
+
+    Requires the ETag from GET /api/player/{id} (or the previous PUT) in If-Match; only
+    the fields that differ are written, and only if nobody else wrote the player since.
+    """
+    if if_match is None:
+        raise HTTPException(
+            status_code=status.HTTP_428_PRECONDITION_REQUIRED,
+            detail="If-Match header is required; reload the player and retry"
+        )
+
     try:
         from beanie import PydanticObjectId
         player = await Player.get(PydanticObjectId(player_id))
@@ -190,51 +306,95 @@ async def update_player(
             detail="Player not found"
         )
 
+    # Fail before storing any uploads; the guarded write below catches later races
+    if not etag_matches(if_match, player.revision):
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="Player was changed elsewhere; reload and try again"
+        )
+
     # Basic phone validation
-    digit_only_phone = "".join(ch for ch in phone if ch.isdigit())
-    if len(digit_only_phone) < 10:
+    normalized_phone = phone_key(phone)
+    if normalized_phone is None:
         raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Phone must have at least 10 digits")
 
     # Check for duplicate email/phone (excluding current player)
-    if email != player.email:
-        if await Player.find_one(Player.email == email):
+    normalized_email = email_key(email)
+    if normalized_email != player.email_key:
+        if await Player.find_one(Player.email_key == normalized_email, Player.id != player.id).project(PlayerIdView):
             raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Email already registered")
     
-    if phone != player.phone:
-        if await Player.find_one(Player.phone == phone):
+    if normalized_phone != player.phone_key:
+        if await Player.find_one(Player.phone_key == normalized_phone, Player.id != player.id).project(PlayerIdView):
             raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Phone already registered")
 
-    # Update fields
-    player.first_name = first_name
-    player.last_name = last_name
-    player.email = email
-    player.phone = phone
-    player.residential_area = residential_area
-    player.firm_name = firm_name
-    player.designation = designation
-    player.batting_type = batting_type
-    player.bowling_type = bowling_type
-    player.wicket_keeper = wicket_keeper
-    player.name_on_jersey = name_on_jersey
-    player.tshirt_size = tshirt_size
-    player.waist_size = waist_size
-    player.played_jypl_s7 = played_jypl_s7
-    player.jypl_s7_team = jypl_s7_team
+    submitted = {
+        "first_name": first_name,
+        "last_name": last_name,
+        "email": email,
+        "phone": phone,
+        "residential_area": residential_area,
+        "firm_name": firm_name,
+        "designation": designation,
+        "batting_type": batting_type,
+        "bowling_type": bowling_type,
+        "wicket_keeper": wicket_keeper,
+        "name_on_jersey": name_on_jersey,
+        "tshirt_size": tshirt_size,
+        "waist_size": waist_size,
+        "played_jypl_s7": played_jypl_s7,
+        "jypl_s7_team": jypl_s7_team,
+    }
 
     # Update files only if new ones are provided
-    if photo and photo.filename:
-        player.photo_url = await storage.save_upload(photo, PHOTO_MIMES, MAX_FILE_BYTES)
-    if visiting_card and visiting_card.filename:
-        player.visiting_card_url = await storage.save_upload(visiting_card, CARD_MIMES, MAX_FILE_BYTES)
-
-    await player.save()
-    return RegisterResponse(player_id=str(player.id), message="Details Updated", status=player.registration_status.value)
+    photo_url = await store_file("photo", photo, photo_upload_id, PHOTO_MIMES, storage, uploads)
+    if photo_url:
+        submitted["photo_url"] = photo_url
+    card_url = await store_file("visiting_card", visiting_card, visiting_card_upload_id, CARD_MIMES, storage, uploads)
+    if card_url:
+        submitted["visiting_card_url"] = card_url
+
+    document = player.model_dump()
+    for section, values in nest_details(submitted).items():
+        document[section] = document[section] | values
+    try:
+        updated = Player.model_validate(document)
+    except ValidationError as exc:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Invalid player details") from exc
+    updated.fill_identity_keys()
+
+    paths = [*(FIELD_PATHS[field] for field in submitted), "email_key", "phone_key"]
+    changes = {path: value for path in paths if (value := _path_value(updated, path)) != _path_value(player, path)}
+    if changes:
+        try:
+            # Documents written before revisions existed have no revision field yet
+            current_revision = player.revision if player.revision else {"$in": [0, None]}
+            result = await Player.get_motor_collection().find_one_and_update(
+                {"_id": player.id, "revision": current_revision},
+                {"$set": changes, "$inc": {"revision": 1}},
+                projection={"revision": True},
+                return_document=ReturnDocument.AFTER,
+            )
+        except DuplicateKeyError as exc:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Duplicate email or phone") from exc
+        if result is None:
+            raise HTTPException(
+                status_code=status.HTTP_412_PRECONDITION_FAILED,
+                detail="Player was changed elsewhere; reload and try again"
+            )
+        updated.revision = result["revision"]
+        await record_player_changed(player, updated)
+
+    response.headers["ETag"] = revision_etag(updated.revision)
+    return RegisterResponse(player_id=str(player.id), message="Details Updated", status=updated.registration_status.value)
 
 
 @router.post("/resume-payment", response_model=ResumePaymentResponse)
-async def resume_payment(request: ResumePaymentRequest):
+async def resume_payment(request: ResumePaymentRequest, limiter: RateLimiter = Depends(get_rate_limiter)):
     """Check if a player with pending payment exists and return their details"""
-    player = await Player.find_one(Player.email == request.email)
+    normalized_email = email_key(request.email)
+    await limiter.check("email", normalized_email)
+    player = await Player.find_one(Player.email_key == normalized_email).project(PlayerContactView)
     
     if not player:
         raise HTTPException(
@@ -249,61 +409,90 @@ async def resume_payment(request: ResumePaymentRequest):
         )
     
     if player.registration_status == RegistrationStatus.WAITLIST:
+        position = await waitlist_position(player.id)
+        queue = f" (position {position[0]} of {position[1]})" if position else ""
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Your registration is currently in waitlist. You will be notified once approved."
+            detail=f"Your registration is currently in waitlist{queue}. You will be notified once approved."
+        )
+
+    if player.registration_status == RegistrationStatus.EXPIRED:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Your payment window has expired. Please contact the organizers."
         )
     
     return ResumePaymentResponse(
         player_id=str(player.id),
-        email=player.email,
-        first_name=player.first_name,
-        last_name=player.last_name,
-        phone=player.phone,
+        email=player.personal.email,
+        first_name=player.personal.first_name,
+        last_name=player.personal.last_name,
+        phone=player.personal.phone,
         registration_status=player.registration_status.value,
         message="Resume payment available"
     )
 
 
 @router.get("/player/{player_id}", response_model=PlayerDetailsResponse)
-async def get_player_details(player_id: str):
-    """Get player details by ID for resume/edit functionality"""
+async def get_player_details(
+    player_id: str,
+    if_none_match: str | None = Header(default=None, alias="If-None-Match"),
+):
+    """Get player details by ID for resume/edit functionality; 304 if the client's ETag is current"""
     try:
         from beanie import PydanticObjectId
-        player = await Player.get(PydanticObjectId(player_id))
+        object_id = PydanticObjectId(player_id)
     except Exception:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Player not found"
         )
-    
+
+    player = await Player.get_motor_collection().find_one({"_id": object_id}, PLAYER_DETAILS_PROJECTION)
     if not player:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Player not found"
         )
-    
-    return PlayerDetailsResponse(
-        player_id=str(player.id),
-        first_name=player.first_name,
-        last_name=player.last_name,
-        email=player.email,
-        phone=player.phone,
-        residential_area=player.residential_area,
-        firm_name=player.firm_name,
-        designation=player.designation,
-        photo_url=player.photo_url,
-        visiting_card_url=player.visiting_card_url,
-        batting_type=player.batting_type,
-        bowling_type=player.bowling_type,
-        wicket_keeper=player.wicket_keeper,
-        name_on_jersey=player.name_on_jersey,
-        tshirt_size=player.tshirt_size,
-        waist_size=player.waist_size,
-        played_jypl_s7=player.played_jypl_s7,
-        jypl_s7_team=player.jypl_s7_team,
-        registration_status=player.registration_status.value,
-    )
+
+    etag = revision_etag(player.get("revision") or 0)
+    if if_none_match is not None and etag_matches(if_none_match, player.get("revision") or 0):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+    # Render the projected document directly, without validating it into a model
+    details = flatten_details(player) | {"registration_status": player.get("registration_status")}
+    details = {field: details.get(field) for field in PLAYER_DETAILS_FIELDS}
+    details["player_id"] = str(player["_id"])
+    details["jypl_s7_team"] = details["jypl_s7_team"] or ""
+    return ORJSONResponse(details, headers={"ETag": etag})
+
+
+class WaitlistPositionResponse(BaseModel):
+    player_id: str
+    position: int
+    waitlist_length: int
+
+
+@router.get("/waitlist/position", response_model=WaitlistPositionResponse)
+async def get_waitlist_position(player_id: str):
+    """Public endpoint: a waitlisted player's 1-based place in the FIFO queue."""
+    try:
+        from beanie import PydanticObjectId
+        object_id = PydanticObjectId(player_id)
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Player not found"
+        )
+
+    position = await waitlist_position(object_id)
+    if position is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Player is not on the waitlist"
+        )
+
+    return WaitlistPositionResponse(player_id=player_id, position=position[0], waitlist_length=position[1])
 
 
 class PublicConfigResponse(BaseModel):
@@ -318,8 +507,8 @@ async def get_public_config():
     """Public endpoint: expose registration open/closed status for frontend."""
     cfg = await AppConfig.find_one({})
     registration_cap = cfg.registration_cap if cfg else 200
-    current_count = await Player.count()
-    
+    current_count = (await get_stats()).total
+
     return PublicConfigResponse(
         registration_open=cfg.registration_open if cfg else True,
         registration_cap_reached=current_count >= registration_cap,
@@ -0,0 +1,90 @@
+from datetime import datetime
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, status
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, Field
+
+from app.models.upload import UploadSession
+from app.services.uploads import ResumableUploads
+
+router = APIRouter(prefix="/api/uploads", tags=["uploads"])
+
+
+class CreateUploadRequest(BaseModel):
+    field: Literal["photo", "visiting_card"]
+    filename: str = Field(default="upload", max_length=255)
+    content_type: str
+    length: int = Field(..., gt=0)
+
+
+class UploadStatusResponse(BaseModel):
+    upload_id: str
+    field: str
+    offset: int
+    length: int
+    complete: bool
+    chunk_bytes: int
+    expires_at: datetime
+
+
+async def get_uploads(request: Request) -> ResumableUploads:
+    return request.app.state.uploads  # type: ignore[attr-defined]
+
+
+def _status_response(session: UploadSession, uploads: ResumableUploads, status_code: int = 200) -> ORJSONResponse:
+    body = UploadStatusResponse(
+        upload_id=session.id,
+        field=session.field,
+        offset=session.offset,
+        length=session.length,
+        complete=session.url is not None,
+        chunk_bytes=uploads.chunk_bytes,
+        expires_at=session.expires_at,
+    )
+    return ORJSONResponse(
+        body.model_dump(mode="json"),
+        status_code=status_code,
+        headers={
+            "Upload-Offset": str(session.offset),
+            "Upload-Length": str(session.length),
+            "Cache-Control": "no-store",
+        },
+    )
+
+
+@router.post("", response_model=UploadStatusResponse, status_code=status.HTTP_201_CREATED)
+async def create_upload(payload: CreateUploadRequest, uploads: ResumableUploads = Depends(get_uploads)):
+    """Start a resumable upload; PATCH the bytes to /api/uploads/{upload_id} afterwards."""
+    session = await uploads.create(payload.field, payload.filename, payload.content_type, payload.length)
+    response = _status_response(session, uploads, status.HTTP_201_CREATED)
+    response.headers["Location"] = f"{router.prefix}/{session.id}"
+    return response
+
+
+@router.head("/{upload_id}")
+@router.get("/{upload_id}", response_model=UploadStatusResponse)
+async def get_upload(upload_id: str, uploads: ResumableUploads = Depends(get_uploads)):
+    """Current offset of an upload; resume by PATCHing from there."""
+    return _status_response(await uploads.get(upload_id), uploads)
+
+
+@router.patch("/{upload_id}", response_model=UploadStatusResponse)
+async def append_upload(
+    upload_id: str,
+    request: Request,
+    upload_offset: int = Header(..., alias="Upload-Offset", ge=0),
+    uploads: ResumableUploads = Depends(get_uploads),
+):
+    """Append the raw request body (``application/offset+octet-stream``) at Upload-Offset."""
+    # Read at most one chunk; a larger body is refused without buffering the rest
+    data = bytearray()
+    async for piece in request.stream():
+        data += piece
+        if len(data) > uploads.chunk_bytes:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Chunks are limited to {uploads.chunk_bytes} bytes",
+            )
+    session = await uploads.append(upload_id, upload_offset, bytes(data))
+    return _status_response(session, uploads)
@@ -0,0 +1,75 @@
+"""Production server entry point.
+
+Runs uvicorn with WEB_CONCURRENCY worker processes (default: available CPUs, capped at 4),
+uvloop and httptools when installed, keep-alive longer than typical load-balancer idle
+timeouts, a deep accept backlog and graceful draining on shutdown. With several workers a
+shared PROMETHEUS_MULTIPROC_DIR is prepared so /metrics aggregates all of them.
+
+Usage (from apps/backend):
+    python -m app.server
+    WEB_CONCURRENCY=8 python -m app.server --port 9000
+    python -m app.server --app benchmarks.mock_mongo_app:app --workers 2
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+from importlib.util import find_spec
+
+import uvicorn
+
+from app.core.config import Settings, get_settings
+
+DEFAULT_MAX_WORKERS = 4
+
+
+def default_workers() -> int:
+    # sched_getaffinity respects container CPU pinning; cpu_count reports the host
+    available = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+    return max(1, min(available, DEFAULT_MAX_WORKERS))
+
+
+def prepare_multiprocess_metrics() -> None:
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        return
+    metrics_dir = os.path.join(tempfile.gettempdir(), f"walle-metrics-{os.getpid()}")
+    shutil.rmtree(metrics_dir, ignore_errors=True)
+    os.makedirs(metrics_dir)
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = metrics_dir
+
+
+def run(settings: Settings, app: str = "app.main:app", workers: int | None = None, port: int | None = None) -> None:
+    workers = workers or settings.web_concurrency or default_workers()
+    if workers > 1:
+        prepare_multiprocess_metrics()
+
+    uvicorn.run(
+        app,
+        host=settings.host,
+        port=port or settings.port,
+        workers=workers,
+        loop="uvloop" if find_spec("uvloop") else "asyncio",
+        http="httptools" if find_spec("httptools") else "h11",
+        timeout_keep_alive=settings.keep_alive_seconds,
+        backlog=settings.backlog,
+        timeout_graceful_shutdown=settings.graceful_timeout_seconds,
+        proxy_headers=True,
+        forwarded_allow_ips=settings.forwarded_allow_ips,
+        # RequestIdMiddleware writes the access log
+        access_log=False,
+        server_header=False,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--app", default="app.main:app", help="ASGI application import string")
+    parser.add_argument("--workers", type=int, help="Overrides WEB_CONCURRENCY")
+    parser.add_argument("--port", type=int, help="Overrides PORT")
+    args = parser.parse_args()
+    run(get_settings(), app=args.app, workers=args.workers, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
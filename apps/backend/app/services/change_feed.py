@@ -0,0 +1,195 @@
+"""Shared MongoDB change-stream watcher fanned out to in-process subscribers.
+
+Each worker runs at most one change stream over ``players`` and ``payments``, started when
+the first subscriber arrives, and turns every change into a compact ``FeedEvent``. Event IDs
+are the change stream's resume tokens, which are identical on every worker, so a client that
+reconnects with ``Last-Event-ID`` can be replayed from the recent-history ring on whichever
+worker it lands on. Subscribers get bounded queues: a client that falls behind loses the
+backlog and is told to resync instead of slowing everyone else down.
+
+Change streams need a replica set (Atlas always is). On a standalone server the watcher
+keeps retrying with backoff and subscribers only see keep-alives.
+"""
+
+import asyncio
+import logging
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+import orjson
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo.errors import OperationFailure
+
+from app.models.player import PATH_FIELDS, flatten_details
+from app.models.projections import PlayerListView, projection_of
+
+logger = logging.getLogger(__name__)
+
+# Fields each collection is allowed to expose on the feed; players use the flat API names
+FEED_FIELDS = {
+    "players": frozenset(PATH_FIELDS.get(path, path) for path in projection_of(PlayerListView)) - {"_id"},
+    "payments": frozenset({"player_id", "status", "amount", "currency", "created_at"}),
+}
+CHANGE_STREAM_HISTORY_LOST = 286
+MAX_RETRY_SECONDS = 30.0
+
+
+@dataclass(frozen=True)
+class FeedEvent:
+    id: str
+    collection: str
+    operation: str
+    document_id: str
+    fields: dict[str, Any] = field(default_factory=dict)
+
+    def payload(self) -> dict[str, Any]:
+        return {"op": self.operation, "id": self.document_id, "fields": self.fields}
+
+
+def sse_message(event: str, data: Any, event_id: str | None = None) -> bytes:
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.append(f"data: {orjson.dumps(data, default=str).decode()}")
+    return ("\n".join(lines) + "\n\n").encode()
+
+
+SSE_KEEPALIVE = b": keep-alive\n\n"
+
+
+class Subscription:
+    def __init__(self, queue_size: int, predicate: Callable[[FeedEvent], bool] | None = None):
+        self.queue: asyncio.Queue[FeedEvent] = asyncio.Queue(maxsize=queue_size)
+        self.predicate = predicate
+        self.lagged = False
+
+    def offer(self, event: FeedEvent) -> None:
+        if self.predicate is not None and not self.predicate(event):
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.lagged = True
+
+    def take_lag(self) -> bool:
+        """True (once) if events were dropped; the backlog is discarded so the client resyncs."""
+        if not self.lagged:
+            return False
+        self.lagged = False
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        return True
+
+    async def get(self, timeout: float) -> FeedEvent | None:
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class ChangeFeedHub:
+    def __init__(self, database: AsyncIOMotorDatabase, history_size: int = 1000, queue_size: int = 256):
+        self.database = database
+        self.queue_size = queue_size
+        self._history: deque[FeedEvent] = deque(maxlen=history_size)
+        self._subscribers: set[Subscription] = set()
+        self._resume_token: dict[str, Any] | None = None
+        self._task: asyncio.Task | None = None
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(
+        self,
+        predicate: Callable[[FeedEvent], bool] | None = None,
+        last_event_id: str | None = None,
+    ) -> tuple[Subscription, list[FeedEvent] | None]:
+        """Register a subscriber. The second value is the replay after ``last_event_id``,
+        or None when that event is no longer in the history and the client must resync."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._watch())
+
+        subscription = Subscription(self.queue_size, predicate)
+        self._subscribers.add(subscription)
+
+        replay: list[FeedEvent] | None = []
+        if last_event_id:
+            history = list(self._history)
+            position = next((index for index, event in enumerate(history) if event.id == last_event_id), None)
+            if position is None:
+                replay = None
+            else:
+                replay = [
+                    event for event in history[position + 1:]
+                    if predicate is None or predicate(event)
+                ]
+        return subscription, replay
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._subscribers.discard(subscription)
+
+    async def aclose(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _watch(self) -> None:
+        pipeline = [{"$match": {"ns.coll": {"$in": list(FEED_FIELDS)}}}]
+        delay = 1.0
+        while True:
+            try:
+                async with self.database.watch(pipeline, resume_after=self._resume_token) as stream:
+                    delay = 1.0
+                    async for change in stream:
+                        self._resume_token = change["_id"]
+                        self._publish(change)
+            except OperationFailure as exc:
+                if exc.code == CHANGE_STREAM_HISTORY_LOST:
+                    # Oplog rolled past our token: start fresh and make every client resync
+                    self._resume_token = None
+                    for subscription in self._subscribers:
+                        subscription.lagged = True
+                logger.warning("Change stream failed; retrying", extra={"error": str(exc), "retry_in": delay})
+            except Exception as exc:
+                logger.warning("Change stream interrupted; retrying", extra={"error": str(exc), "retry_in": delay})
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, MAX_RETRY_SECONDS)
+
+    def _publish(self, change: dict[str, Any]) -> None:
+        collection = change["ns"]["coll"]
+        allowed = FEED_FIELDS[collection]
+        operation = change["operationType"]
+        if operation == "insert":
+            source = change.get("fullDocument") or {}
+        elif operation == "update":
+            source = change.get("updateDescription", {}).get("updatedFields", {})
+        elif operation == "replace":
+            source = change.get("fullDocument") or {}
+        else:
+            source = {}
+        if collection == "players":
+            # Stored subdocuments and dotted update paths -> the listing's flat fields
+            source = source | flatten_details(source)
+
+        fields = {key: value for key, value in source.items() if key in allowed}
+        if operation in ("update", "replace") and not fields:
+            return
+
+        event = FeedEvent(
+            id=change["_id"]["_data"],
+            collection=collection,
+            operation=operation,
+            document_id=str(change["documentKey"]["_id"]),
+            fields=fields,
+        )
+        self._history.append(event)
+        for subscription in self._subscribers:
+            subscription.offer(event)
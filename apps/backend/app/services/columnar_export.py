@@ -0,0 +1,195 @@
+"""Columnar (Parquet / Arrow IPC) export of every player joined with their payment.
+
+Players are read from one cursor in batches; each batch's payments come from a single
+``$in`` query on the player_id index, the rows become one Arrow record batch (a Parquet
+row group), and whatever the writer produced is yielded before the next batch is read, so
+memory stays at about one batch however large the season is. Columns are typed: ints for
+waist_size and amount (paise), UTC timestamps, and dictionary-encoded categoricals with a
+fixed dictionary per enum, shared by every batch.
+
+pyarrow is optional. It is imported on first use; without it the admin route answers 501.
+"""
+
+import asyncio
+from datetime import datetime
+from enum import Enum
+from functools import cache
+from typing import Any, AsyncIterator
+
+from app.models.payment import Payment, PaymentStatus
+from app.models.player import CODED_PATHS, FIELD_PATHS, Player, RegistrationStatus
+
+# format -> (media type, file extension)
+EXPORT_FORMATS = {
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+    "arrow": ("application/vnd.apache.arrow.stream", "arrows"),
+}
+DEFAULT_BATCH_SIZE = 2000
+
+PLAYER_PROJECTION = {
+    "personal": 1, "cricket": 1, "jersey": 1, "registration_status": 1, "created_at": 1, "approved_at": 1,
+}
+PAYMENT_PROJECTION = {"player_id": 1, "status": 1, "amount": 1, "currency": 1, "created_at": 1, "razorpay_payment_id": 1}
+INT_FIELDS = {"waist_size"}
+
+
+def _category(enum: type[Enum]) -> tuple[dict[str, int], list[str]]:
+    """(stored value -> dictionary index, dictionary) for an enum column; coded enums use labels."""
+    return (
+        {member.value: index for index, member in enumerate(enum)},
+        [getattr(member, "label", member.value) for member in enum],
+    )
+
+
+CATEGORIES = {
+    **{field: _category(CODED_PATHS[path]) for field, path in FIELD_PATHS.items() if path in CODED_PATHS},
+    "registration_status": _category(RegistrationStatus),
+    "payment_status": _category(PaymentStatus),
+}
+
+
+@cache
+def _pyarrow():
+    # Deferred so that workers which never export do not pay for importing pyarrow
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError:  # pragma: no cover - optional dependency not installed
+        return None
+    return pyarrow
+
+
+def columnar_export_available() -> bool:
+    return _pyarrow() is not None
+
+
+@cache
+def export_schema():
+    pa = _pyarrow()
+    categorical = pa.dictionary(pa.int8(), pa.string())
+    timestamp = pa.timestamp("ms", tz="UTC")
+    fields = [pa.field("player_id", pa.string(), nullable=False)]
+    for field in FIELD_PATHS:
+        if field in CATEGORIES:
+            fields.append(pa.field(field, categorical))
+        elif field in INT_FIELDS:
+            fields.append(pa.field(field, pa.int32()))
+        else:
+            fields.append(pa.field(field, pa.string()))
+    fields += [
+        pa.field("registration_status", categorical),
+        pa.field("created_at", timestamp),
+        pa.field("approved_at", timestamp),
+        pa.field("payment_status", categorical),
+        pa.field("amount", pa.int64()),
+        pa.field("currency", pa.string()),
+        pa.field("payment_created_at", timestamp),
+        pa.field("razorpay_payment_id", pa.string()),
+    ]
+    return pa.schema(fields)
+
+
+def _payment_rank(payment: dict[str, Any]) -> tuple[bool, datetime]:
+    """One payment per player is exported: the captured one if any, otherwise the latest attempt."""
+    return payment["status"] == PaymentStatus.CAPTURED.value, payment.get("created_at") or datetime.min
+
+
+def _column(pa, name: str, values: list, arrow_type):
+    if name in CATEGORIES:
+        index, dictionary = CATEGORIES[name]
+        indices = pa.array([index.get(value) for value in values], type=arrow_type.index_type)
+        return pa.DictionaryArray.from_arrays(indices, pa.array(dictionary, type=pa.string()))
+    return pa.array(values, type=arrow_type)
+
+
+def build_record_batch(players: list[dict[str, Any]], payments: list[dict[str, Any]]):
+    """One Arrow record batch from raw player documents and their raw payments."""
+    pa = _pyarrow()
+    schema = export_schema()
+    chosen: dict[Any, dict] = {}
+    for payment in payments:
+        current = chosen.get(payment["player_id"])
+        chosen[payment["player_id"]] = payment if current is None else max(current, payment, key=_payment_rank)
+
+    values: dict[str, list] = {"player_id": [str(player["_id"]) for player in players]}
+    for field, path in FIELD_PATHS.items():
+        section, key = path.split(".", 1)
+        values[field] = [player.get(section, {}).get(key) for player in players]
+    for field in ("registration_status", "created_at", "approved_at"):
+        values[field] = [player.get(field) for player in players]
+    joined = [chosen.get(player["_id"], {}) for player in players]
+    values["payment_status"] = [payment.get("status") for payment in joined]
+    values["amount"] = [payment.get("amount") for payment in joined]
+    values["currency"] = [payment.get("currency") for payment in joined]
+    values["payment_created_at"] = [payment.get("created_at") for payment in joined]
+    values["razorpay_payment_id"] = [payment.get("razorpay_payment_id") for payment in joined]
+
+    columns = [_column(pa, field.name, values[field.name], field.type) for field in schema]
+    return pa.RecordBatch.from_arrays(columns, schema=schema)
+
+
+class _DrainableSink:
+    """Write-only file object that holds what a pyarrow writer produced until drained."""
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        chunk = bytes(data)
+        self._chunks.append(chunk)
+        self._position += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _open_writer(file_format: str, sink: _DrainableSink):
+    pa = _pyarrow()
+    schema = export_schema()
+    if file_format == "parquet":
+        return pa.parquet.ParquetWriter(pa.PythonFile(sink, mode="w"), schema, compression="zstd")
+    return pa.ipc.new_stream(pa.PythonFile(sink, mode="w"), schema)
+
+
+async def export_players(file_format: str, batch_size: int = DEFAULT_BATCH_SIZE) -> AsyncIterator[bytes]:
+    """Yield the export file for `file_format` ("parquet" or "arrow") piece by piece."""
+    sink = _DrainableSink()
+    writer = _open_writer(file_format, sink)
+
+    def write(players: list[dict], payments: list[dict]) -> None:
+        writer.write_batch(build_record_batch(players, payments))
+
+    async def flush(players: list[dict]) -> bytes:
+        payments = await Payment.get_motor_collection().find(
+            {"player_id": {"$in": [player["_id"] for player in players]}}, PAYMENT_PROJECTION
+        ).to_list(length=None)
+        # Building and encoding the batch is CPU-bound; keep it off the event loop
+        await asyncio.to_thread(write, players, payments)
+        return sink.drain()
+
+    cursor = Player.get_motor_collection().find({}, PLAYER_PROJECTION, batch_size=batch_size).sort("created_at", 1)
+    players: list[dict] = []
+    async for player in cursor:
+        players.append(player)
+        if len(players) >= batch_size:
+            yield await flush(players)
+            players = []
+    if players:
+        yield await flush(players)
+    await asyncio.to_thread(writer.close)
+    yield sink.drain()
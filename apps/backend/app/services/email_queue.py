@@ -0,0 +1,80 @@
+"""In-process queue for concurrent, rate-limited email delivery."""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable
+
+from app.core.logging import request_id_var
+from app.core.metrics import EMAIL_QUEUE_DEPTH
+
+logger = logging.getLogger(__name__)
+
+EmailJob = Callable[..., Awaitable[bool]]
+
+
+class EmailQueue:
+    """Fan emails out to a small pool of workers without exceeding the provider rate limit.
+
+    Jobs are the existing ``send_*_email`` coroutines plus their keyword arguments, so
+    callers enqueue exactly what they would otherwise have awaited inline.
+    """
+
+    def __init__(self, concurrency: int = 4, rate_per_second: float = 2.0):
+        self.concurrency = max(1, concurrency)
+        self.min_interval = 1.0 / rate_per_second if rate_per_second > 0 else 0.0
+        self._queue: asyncio.Queue[tuple[EmailJob, dict[str, Any], str | None]] = asyncio.Queue()
+        self._workers: list[asyncio.Task] = []
+        self._rate_lock = asyncio.Lock()
+        self._next_slot = 0.0
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    def start(self) -> None:
+        if self._workers:
+            return
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.concurrency)]
+
+    def enqueue(self, job: EmailJob, **kwargs: Any) -> None:
+        # Carry the enqueuing request's ID so delivery logs can be traced back to it
+        self._queue.put_nowait((job, kwargs, request_id_var.get()))
+        EMAIL_QUEUE_DEPTH.inc()
+
+    async def _wait_for_slot(self) -> None:
+        # Hand out evenly spaced send slots; workers sleep until theirs comes up.
+        async with self._rate_lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.min_interval
+        delay = slot - now
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def _worker(self) -> None:
+        while True:
+            job, kwargs, request_id = await self._queue.get()
+            EMAIL_QUEUE_DEPTH.dec()
+            token = request_id_var.set(request_id)
+            try:
+                await self._wait_for_slot()
+                await job(**kwargs)
+            except Exception:
+                logger.exception("Email job failed", extra={"job": getattr(job, "__name__", repr(job))})
+            finally:
+                request_id_var.reset(token)
+                self._queue.task_done()
+
+    async def aclose(self, timeout: float = 10.0) -> None:
+        """Give queued emails a bounded chance to go out, then stop the workers."""
+        if not self._workers:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
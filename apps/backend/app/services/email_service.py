@@ -1,65 +1,54 @@
 """Email service for sending registration confirmation emails via Resend API."""
 
+import logging
+
 import httpx
-from fastapi_mail import MessageSchema # Keeping MessageSchema for compatibility with existing imports, or we can define simple dataclass
 from app.core.config import get_settings
+from app.core.metrics import EMAILS_SENT, track_external_call
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
 
-# We can mimic MessageSchema if we want to remove fastapi-mail dep entirely,
-# but for now, let's assume valid imports or just use simple dicts/dataclasses if fastapi_mail is removed.
-# To be safe and clean, let's keep MessageSchema if it's imported elsewhere, 
-# BUT the plan said "Remove SMTP Logic", so let's stick to using the existing MessageSchema to avoid breaking route imports
-# OR better: Refactor imports in routes if we remove fastapi-mail.
-# Let's check imports in routers/admin.py: "from app.services.email_service import send_approval_email"
-# It doesn't import MessageSchema usually.
-# Let's check the previous file content... MessageSchema was imported from fastapi_mail.
-# If we remove fastapi_mail dependency, we need to provide a replacement for MessageSchema or change the function signatures.
-# Let's keep fastapi_mail for Schema ONLY for now to minimize friction, or just defined a simple class.
-# Actually, the user wants "Remove SMTP completely".
-# Let's define a local MessageSchema to break the dependency on fastapi-mail if possible.
-
-class SimpleMessageSchema:
-    def __init__(self, subject, recipients, body, subtype="html"):
-        self.subject = subject
-        self.recipients = recipients
-        self.body = body
-        self.subtype = subtype
 
 async def send_via_resend(subject: str, recipients: list[str], html_body: str) -> bool:
     """Send email via Resend API (HTTP)."""
     if not settings.resend_api_key:
-        print("⚠️ No RESEND_API_KEY configured. Cannot send email.")
+        logger.warning("No RESEND_API_KEY configured; cannot send email")
         return False
 
     to_email = recipients[0] # Assuming single recipient for now as per logic
-    print(f"🔄 Attempting to send via Resend API to {to_email}...")
+    logger.debug("Sending email via Resend", extra={"to": to_email, "subject": subject})
     
     try:
         async with httpx.AsyncClient() as client:
-            response = await client.post(
-                "https://api.resend.com/emails",
-                headers={
-                    "Authorization": f"Bearer {settings.resend_api_key}",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "from": "JYPL Registration <admin@eigensu.in>",
-                    "to": recipients,
-                    "subject": subject,
-                    "html": html_body
-                },
-                timeout=15.0
-            )
+            with track_external_call("resend", "send_email"):
+                response = await client.post(
+                    settings.resend_api_url,
+                    headers={
+                        "Authorization": f"Bearer {settings.resend_api_key}",
+                        "Content-Type": "application/json"
+                    },
+                    json={
+                        "from": "JYPL Registration <admin@eigensu.in>",
+                        "to": recipients,
+                        "subject": subject,
+                        "html": html_body
+                    },
+                    timeout=15.0
+                )
             
+            EMAILS_SENT.labels("ok" if response.status_code == 200 else "rejected").inc()
             if response.status_code == 200:
-                print(f"✅ Email sent successfully via Resend API to {to_email}")
+                logger.info("Email sent", extra={"to": to_email, "subject": subject, "sampled": True})
                 return True
             else:
-                print(f"⚠️ Resend API failed: {response.status_code} - {response.text}")
+                logger.warning(
+                    "Resend API rejected email",
+                    extra={"to": to_email, "subject": subject, "status": response.status_code, "body": response.text[:500]},
+                )
                 return False
     except Exception as e:
-        print(f"⚠️ Resend API Exception: {str(e)}")
+        logger.warning("Resend API call failed", extra={"to": to_email, "subject": subject, "error": str(e)})
         return False
 
 
@@ -72,11 +61,10 @@ async def send_email(subject: str, to_email: str, html_body: str) -> bool:
         return True
 
     # 2. Manual Fallback
-    print(f"❌ RESEND API FAILED.")
-    print(f"👇 ================= MANUAL ACTION REQUIRED ================= 👇")
-    print(f"Please send this Payment Link manually to the user:")
-    print(f"🔗 https://jypl-waitlist.wallearena.com")
-    print(f"👆 ========================================================== 👆")
+    logger.error(
+        "Email delivery failed; manual action required",
+        extra={"to": to_email, "subject": subject, "manual_link": "https://jypl-waitlist.wallearena.com"},
+    )
     return True
 
 
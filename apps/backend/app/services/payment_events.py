@@ -0,0 +1,154 @@
+"""Per-player payment outcome notifications for the checkout page.
+
+verify and the webhook call ``publish`` after they write a payment outcome, which wakes any
+waiter for that player in this worker. Outcomes written by other workers arrive through the
+change feed (``ChangeFeedHub``), and every waiter also re-reads the database on a slow poll
+interval, so a missed notification or a deployment without change streams only delays an
+answer instead of losing it. The database stays the source of truth: a wake-up just
+triggers a re-read.
+"""
+
+import asyncio
+import logging
+import time
+from collections import defaultdict
+
+from beanie import PydanticObjectId
+from pydantic import BaseModel
+
+from app.models.payment import Payment, PaymentStatus
+from app.models.player import Player, RegistrationStatus
+from app.models.projections import PaymentStatusView, PlayerStateView
+from app.services.change_feed import ChangeFeedHub, FeedEvent
+
+logger = logging.getLogger(__name__)
+
+# Only a capture ends checkout: Razorpay sends payment.failed for each failed attempt and the
+# player can retry on the same order, so FAILED is the latest attempt's status, not an outcome
+TERMINAL_PAYMENT_STATUSES = {PaymentStatus.CAPTURED.value}
+# Payment writes that change what a waiter would report
+OUTCOME_CHANGING_STATUSES = {PaymentStatus.CAPTURED.value, PaymentStatus.FAILED.value}
+
+
+class PaymentOutcome(BaseModel):
+    player_id: str
+    # CAPTURED is final; FAILED means the last attempt failed (a retry may still succeed),
+    # PENDING that an order exists, NONE that checkout never started
+    payment_status: str
+    registration_status: str
+
+    @property
+    def is_final(self) -> bool:
+        return self.payment_status in TERMINAL_PAYMENT_STATUSES
+
+
+async def read_outcome(player_id: PydanticObjectId) -> PaymentOutcome | None:
+    player = await Player.find_one(Player.id == player_id).project(PlayerStateView)
+    if player is None:
+        return None
+    if player.registration_status == RegistrationStatus.PAID:
+        payment_status = PaymentStatus.CAPTURED.value
+    else:
+        latest = await (
+            Payment.find(Payment.player_id == player_id)
+            .sort(-Payment.created_at)
+            .limit(1)
+            .project(PaymentStatusView)
+            .to_list()
+        )
+        if not latest:
+            payment_status = "NONE"
+        elif latest[0].status == PaymentStatus.CREATED:
+            payment_status = "PENDING"
+        else:
+            payment_status = latest[0].status.value
+    return PaymentOutcome(
+        player_id=str(player_id),
+        payment_status=payment_status,
+        registration_status=player.registration_status.value,
+    )
+
+
+def _is_payment_outcome(event: FeedEvent) -> bool:
+    return event.collection == "payments" and event.fields.get("status") in OUTCOME_CHANGING_STATUSES
+
+
+class PaymentEvents:
+    def __init__(self, change_feed: ChangeFeedHub | None = None, poll_seconds: float = 10.0):
+        self.change_feed = change_feed
+        self.poll_seconds = poll_seconds
+        self._waiters: dict[str, set[asyncio.Event]] = defaultdict(set)
+        self._bridge: asyncio.Task | None = None
+
+    def publish(self, player_id: PydanticObjectId | str) -> None:
+        for waiter in self._waiters.get(str(player_id), ()):
+            waiter.set()
+
+    async def wait_for_outcome(self, player_id: PydanticObjectId, timeout: float) -> PaymentOutcome | None:
+        """Current outcome, waiting up to ``timeout`` seconds for it to change or become final."""
+        key = str(player_id)
+        waiter = asyncio.Event()
+        self._waiters[key].add(waiter)
+        self._ensure_bridge()
+        try:
+            deadline = time.monotonic() + timeout
+            first = None
+            while True:
+                waiter.clear()
+                outcome = await read_outcome(player_id)
+                first = first or outcome
+                remaining = deadline - time.monotonic()
+                # A failed attempt is reported as soon as it happens, but is not final
+                if outcome is None or outcome.is_final or outcome != first or remaining <= 0:
+                    return outcome
+                try:
+                    await asyncio.wait_for(waiter.wait(), min(self.poll_seconds, remaining))
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self._waiters[key].discard(waiter)
+            if not self._waiters[key]:
+                del self._waiters[key]
+
+    def _ensure_bridge(self) -> None:
+        if self.change_feed is not None and self._bridge is None:
+            self._bridge = asyncio.create_task(self._run_bridge(self.change_feed))
+
+    async def _run_bridge(self, change_feed: ChangeFeedHub) -> None:
+        """Forward outcomes written by other workers, seen on the shared change stream."""
+        subscription, _ = change_feed.subscribe(predicate=_is_payment_outcome)
+        try:
+            while True:
+                event = await subscription.get(timeout=60)
+                if subscription.take_lag():
+                    # Dropped events: let every waiter re-read
+                    for key in list(self._waiters):
+                        self.publish(key)
+                if event is None or not self._waiters:
+                    continue
+                player_id = event.fields.get("player_id")
+                if player_id is None:
+                    # Update events only carry changed fields; look up the owner
+                    document = await Payment.get_motor_collection().find_one(
+                        {"_id": PydanticObjectId(event.document_id)}, {"player_id": 1}
+                    )
+                    player_id = document and document.get("player_id")
+                if player_id is not None:
+                    self.publish(player_id)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Payment outcome bridge stopped")
+            self._bridge = None  # the next waiter restarts it
+        finally:
+            change_feed.unsubscribe(subscription)
+
+    async def aclose(self) -> None:
+        if self._bridge is None:
+            return
+        self._bridge.cancel()
+        try:
+            await self._bridge
+        except asyncio.CancelledError:
+            pass
+        self._bridge = None
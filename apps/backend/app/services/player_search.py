@@ -0,0 +1,56 @@
+"""Server-side filtering and search for the admin players listing."""
+
+import re
+from typing import Any
+
+from app.core.identity import email_key, phone_key_prefix
+from app.models.payment import Payment, PaymentStatus
+from app.models.player import PlayedJyplS7, RegistrationStatus, TshirtSize
+
+_PHONE_QUERY = re.compile(r"^\+?[\d\s()-]+$")
+
+
+def search_clause(q: str) -> dict[str, Any]:
+    """Anchored prefix match when the query looks like an email or phone, full-text otherwise.
+
+    Email and phone queries are normalised the way the identity keys are, so "+91 98200"
+    finds "098200-12345", and the anchored regexes are answered from the email_key/phone_key
+    indexes; names and firms go through the `player_search_text` text index.
+    """
+    q = q.strip()
+    if "@" in q:
+        return {"email_key": {"$regex": f"^{re.escape(email_key(q))}"}}
+    if _PHONE_QUERY.match(q):
+        return {"phone_key": {"$regex": f"^{re.escape(phone_key_prefix(q))}"}}
+    return {"$text": {"$search": q}}
+
+
+async def build_player_filter(
+    registration_status: RegistrationStatus | None = None,
+    payment_status: PaymentStatus | None = None,
+    tshirt_size: TshirtSize | None = None,
+    played_jypl_s7: PlayedJyplS7 | None = None,
+    q: str | None = None,
+) -> dict[str, Any]:
+    """Translate admin listing filters into a Mongo filter on the players collection."""
+    clauses: list[dict[str, Any]] = []
+    if registration_status is not None:
+        clauses.append({"registration_status": registration_status.value})
+    if tshirt_size is not None:
+        clauses.append({"jersey.size": tshirt_size.value})
+    if played_jypl_s7 is not None:
+        clauses.append({"cricket.jypl_s7": played_jypl_s7.value})
+    if payment_status is not None:
+        # Payments live in their own collection; resolve the matching players first
+        player_ids = await Payment.get_motor_collection().distinct(
+            "player_id", {"status": payment_status.value}
+        )
+        clauses.append({"_id": {"$in": player_ids}})
+    if q and q.strip():
+        clauses.append(search_clause(q))
+
+    if not clauses:
+        return {}
+    if len(clauses) == 1:
+        return clauses[0]
+    return {"$and": clauses}
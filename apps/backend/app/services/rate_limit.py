@@ -0,0 +1,184 @@
+"""Token-bucket rate limiting for the public endpoints.
+
+Buckets live in process memory by default. With RATE_LIMIT_STORE=mongo they are kept in a
+shared ``rate_limits`` collection and updated with a single atomic pipeline update, so every
+worker draws from the same bucket.
+"""
+
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Protocol
+
+from fastapi import HTTPException, status
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import Settings
+
+logger = logging.getLogger(__name__)
+
+PERIOD_SECONDS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    capacity: int
+    period_seconds: int
+
+    @property
+    def refill_per_second(self) -> float:
+        return self.capacity / self.period_seconds
+
+    @classmethod
+    def parse(cls, value: str) -> "RateLimit":
+        """Parse limits written as ``"10/minute"``."""
+        count, _, period = value.partition("/")
+        try:
+            return cls(capacity=int(count), period_seconds=PERIOD_SECONDS[period.strip().lower()])
+        except (KeyError, ValueError) as exc:
+            raise ValueError(f"Invalid rate limit {value!r}; expected '<count>/<second|minute|hour|day>'") from exc
+
+
+class BucketStore(Protocol):
+    async def take(self, key: str, limit: RateLimit) -> float:
+        """Consume one token; return 0 when allowed, otherwise seconds until a token is available."""
+        ...
+
+
+class MemoryBucketStore:
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    async def take(self, key: str, limit: RateLimit) -> float:
+        now = time.monotonic()
+        tokens, updated = self._buckets.pop(key, (float(limit.capacity), now))
+        tokens = min(limit.capacity, tokens + (now - updated) * limit.refill_per_second)
+
+        retry_after = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            retry_after = (1 - tokens) / limit.refill_per_second
+
+        self._buckets[key] = (tokens, now)
+        if len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return retry_after
+
+
+class MongoBucketStore:
+    def __init__(self, database: AsyncIOMotorDatabase, collection_name: str = "rate_limits"):
+        self.collection = database[collection_name]
+
+    async def ensure_indexes(self) -> None:
+        await self.collection.create_index("expires_at", expireAfterSeconds=0, name="expires_at_ttl")
+
+    async def take(self, key: str, limit: RateLimit) -> float:
+        now = datetime.now(timezone.utc)
+        elapsed_seconds = {"$divide": [{"$subtract": [now, {"$ifNull": ["$updated_at", now]}]}, 1000]}
+        refilled = {
+            "$min": [
+                limit.capacity,
+                {"$add": [{"$ifNull": ["$tokens", limit.capacity]}, {"$multiply": [elapsed_seconds, limit.refill_per_second]}]},
+            ]
+        }
+        document = await self.collection.find_one_and_update(
+            {"_id": key},
+            [
+                {"$set": {"tokens": refilled, "updated_at": now}},
+                {"$set": {"allowed": {"$gte": ["$tokens", 1]}}},
+                {
+                    "$set": {
+                        "tokens": {"$cond": ["$allowed", {"$subtract": ["$tokens", 1]}, "$tokens"]},
+                        "expires_at": now + timedelta(seconds=limit.period_seconds),
+                    }
+                },
+            ],
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+        if document["allowed"]:
+            return 0.0
+        return (1 - document["tokens"]) / limit.refill_per_second
+
+
+class RateLimiter:
+    def __init__(self, store: BucketStore, limits: dict[str, RateLimit], enabled: bool = True):
+        self.store = store
+        self.limits = limits
+        self.enabled = enabled
+
+    async def retry_after(self, name: str, key: str) -> float:
+        """Seconds the caller must wait, or 0. Store failures fail open rather than blocking signups."""
+        limit = self.limits.get(name)
+        if not self.enabled or limit is None:
+            return 0.0
+        try:
+            return await self.store.take(f"{name}:{key}", limit)
+        except Exception:
+            logger.warning("Rate limit store unavailable; allowing request", exc_info=True, extra={"limit": name})
+            return 0.0
+
+    async def check(self, name: str, key: str) -> None:
+        retry_after = await self.retry_after(name, key)
+        if retry_after > 0:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests, please try again later",
+                headers={"Retry-After": str(max(1, round(retry_after)))},
+            )
+
+
+class RateLimitMiddleware:
+    """Per-IP limits for expensive routes, enforced before the request body is read."""
+
+    def __init__(self, app: ASGIApp, limiter: RateLimiter, routes: dict[tuple[str, str], str]):
+        self.app = app
+        self.limiter = limiter
+        self.routes = routes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            name = self.routes.get((scope["method"], scope["path"]))
+            client = scope.get("client")
+            if name is not None and client:
+                retry_after = await self.limiter.retry_after(name, client[0])
+                if retry_after > 0:
+                    response = JSONResponse(
+                        {"detail": "Too many requests, please try again later"},
+                        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                        headers={"Retry-After": str(max(1, round(retry_after)))},
+                    )
+                    await response(scope, receive, send)
+                    return
+        await self.app(scope, receive, send)
+
+
+def build_rate_limiter(settings: Settings) -> RateLimiter:
+    limits = {
+        "register_ip": settings.rate_limit_register_per_ip,
+        "resume_payment_ip": settings.rate_limit_resume_payment_per_ip,
+        "create_order_ip": settings.rate_limit_create_order_per_ip,
+        "upload_ip": settings.rate_limit_upload_per_ip,
+        "email": settings.rate_limit_per_email,
+        "player": settings.rate_limit_per_player,
+    }
+    return RateLimiter(
+        MemoryBucketStore(),
+        {name: RateLimit.parse(value) for name, value in limits.items()},
+        enabled=settings.rate_limit_enabled,
+    )
+
+
+IP_LIMITED_ROUTES = {
+    ("POST", "/api/register"): "register_ip",
+    ("POST", "/api/resume-payment"): "resume_payment_ip",
+    ("POST", "/api/payments/create-order"): "create_order_ip",
+    ("POST", "/api/uploads"): "upload_ip",
+}
@@ -5,18 +5,21 @@ from typing import Any
 import httpx
 from fastapi import HTTPException, status
 
+from app.core.metrics import track_external_call
+
 
 class RazorpayService:
-    def __init__(self, key_id: str, key_secret: str):
+    def __init__(self, key_id: str, key_secret: str, base_url: str = "https://api.razorpay.com/v1"):
         self.key_id = key_id
         self.key_secret = key_secret
-        self.base_url = "https://api.razorpay.com/v1"
+        self.base_url = base_url.rstrip("/")
         self._client = httpx.AsyncClient(auth=(self.key_id, self.key_secret), timeout=10)
 
     async def create_order(self, amount: int, currency: str, receipt: str) -> dict[str, Any]:
         payload = {"amount": amount, "currency": currency, "receipt": receipt}
         try:
-            response = await self._client.post(f"{self.base_url}/orders", json=payload)
+            with track_external_call("razorpay", "create_order"):
+                response = await self._client.post(f"{self.base_url}/orders", json=payload)
         except httpx.HTTPError as exc:  # network failures
             raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=str(exc)) from exc
 
@@ -0,0 +1,126 @@
+"""Incremental maintenance of the admin dashboard stats document."""
+
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any
+
+from app.models.payment import Payment, PaymentStatus
+from app.models.player import CodedEnum, Player, RegistrationStatus, display_value
+from app.models.stats import DashboardStats
+
+DASHBOARD_KEY = "dashboard"
+
+# Stats breakdown -> Player document path it counts. Coded fields are counted under their
+# labels, so the dashboard shows "Right-Hand" rather than "R".
+BREAKDOWN_FIELDS = {
+    "by_tshirt_size": "jersey.size",
+    "by_waist_size": "jersey.waist",
+    "by_batting_type": "cricket.batting",
+    "by_bowling_type": "cricket.bowling",
+}
+
+
+def _bucket(value: Any) -> str:
+    """Turn a field value into a safe sub-document key ('.' and '$' are not allowed)."""
+    if isinstance(value, CodedEnum):
+        value = value.label
+    elif isinstance(value, RegistrationStatus):
+        value = value.value
+    text = str(value).strip() if value is not None else ""
+    return text.replace(".", "_").replace("$", "_") or "(blank)"
+
+
+def player_deltas(player: Player, sign: int = 1) -> Counter:
+    """Deltas that adding (sign=1) or removing (sign=-1) this player applies to the stats."""
+    deltas: Counter = Counter()
+    deltas["total"] += sign
+    deltas[f"by_status.{_bucket(player.registration_status)}"] += sign
+    for breakdown, path in BREAKDOWN_FIELDS.items():
+        section, name = path.split(".")
+        deltas[f"{breakdown}.{_bucket(getattr(getattr(player, section), name))}"] += sign
+    return deltas
+
+
+async def apply_deltas(deltas: Counter | dict[str, int]) -> None:
+    changes = {path: amount for path, amount in deltas.items() if amount}
+    if not changes:
+        return
+    await DashboardStats.get_motor_collection().update_one(
+        {"key": DASHBOARD_KEY},
+        {"$inc": changes, "$set": {"updated_at": datetime.now(timezone.utc)}},
+        upsert=True,
+    )
+
+
+async def record_player_created(player: Player) -> None:
+    await apply_deltas(player_deltas(player))
+
+
+async def record_player_changed(before: Player, after: Player) -> None:
+    deltas = player_deltas(after)
+    deltas.subtract(player_deltas(before))
+    await apply_deltas(deltas)
+
+
+async def record_status_change(
+    old_status: RegistrationStatus | str,
+    new_status: RegistrationStatus | str,
+    count: int = 1,
+) -> None:
+    if count <= 0 or _bucket(old_status) == _bucket(new_status):
+        return
+    await apply_deltas({
+        f"by_status.{_bucket(old_status)}": -count,
+        f"by_status.{_bucket(new_status)}": count,
+    })
+
+
+async def record_payment_captured(amount_paise: int) -> None:
+    await apply_deltas({"payments_captured": 1, "revenue_paise": amount_paise})
+
+
+async def get_stats() -> DashboardStats:
+    """Return the stats document, building it on first use."""
+    stats = await DashboardStats.find_one(DashboardStats.key == DASHBOARD_KEY)
+    if stats is None:
+        stats = await rebuild_stats()
+    return stats
+
+
+async def rebuild_stats() -> DashboardStats:
+    """Recompute every counter from scratch.
+
+    Increments that land while the aggregation runs are overwritten, so run this when
+    write traffic is quiet (or simply run it again).
+    """
+    facets: dict[str, list[dict]] = {"total": [{"$count": "n"}]}
+    facet_fields = {"by_status": "registration_status", **BREAKDOWN_FIELDS}
+    for breakdown, field in facet_fields.items():
+        facets[breakdown] = [{"$group": {"_id": f"${field}", "n": {"$sum": 1}}}]
+
+    player_rows = await Player.get_motor_collection().aggregate([{"$facet": facets}]).to_list(length=1)
+    row = player_rows[0] if player_rows else {}
+
+    payment_rows = await Payment.get_motor_collection().aggregate([
+        {"$match": {"status": PaymentStatus.CAPTURED.value}},
+        {"$group": {"_id": None, "n": {"$sum": 1}, "amount": {"$sum": "$amount"}}},
+    ]).to_list(length=1)
+    payments = payment_rows[0] if payment_rows else {}
+
+    now = datetime.now(timezone.utc)
+    document = {
+        "total": row["total"][0]["n"] if row.get("total") else 0,
+        "payments_captured": payments.get("n", 0),
+        "revenue_paise": payments.get("amount", 0),
+        "updated_at": now,
+        "rebuilt_at": now,
+    }
+    for breakdown, field in facet_fields.items():
+        document[breakdown] = {
+            _bucket(display_value(field, group["_id"])): group["n"] for group in row.get(breakdown, [])
+        }
+
+    await DashboardStats.get_motor_collection().update_one(
+        {"key": DASHBOARD_KEY}, {"$set": document}, upsert=True
+    )
+    return await DashboardStats.find_one(DashboardStats.key == DASHBOARD_KEY)  # type: ignore[return-value]
@@ -1,11 +1,17 @@
+import re
 from pathlib import Path
 from typing import Iterable
 from uuid import uuid4
 
 import aiofiles
-import cloudinary
-import cloudinary.uploader
 from fastapi import HTTPException, UploadFile, status
+from gridfs.errors import NoFile
+from motor.motor_asyncio import AsyncIOMotorDatabase, AsyncIOMotorGridFSBucket, AsyncIOMotorGridOut
+
+from app.core.metrics import track_storage_upload
+
+# GridFS file ids: uuid4().hex
+_FILE_ID = re.compile(r"^[0-9a-f]{32}$")
 
 
 class StorageService:
@@ -31,12 +37,17 @@ class StorageService:
                 detail="File exceeds maximum allowed size",
             )
 
-        suffix = Path(file.filename or "upload").suffix or self._infer_suffix(file.content_type)
+        return await self.save_bytes(content, file.content_type, file.filename)
+
+    async def save_bytes(self, content: bytes, content_type: str | None, filename: str | None) -> str:
+        """Store already-validated bytes and return their public URL."""
+        suffix = Path(filename or "upload").suffix or self._infer_suffix(content_type)
         filename = f"{uuid4().hex}{suffix}"
         target = self.base_dir / filename
 
-        async with aiofiles.open(target, "wb") as buffer:
-            await buffer.write(content)
+        with track_storage_upload("local", len(content)):
+            async with aiofiles.open(target, "wb") as buffer:
+                await buffer.write(content)
 
         return f"{self.base_url}{filename}"
 
@@ -56,6 +67,11 @@ class StorageService:
 
 class CloudinaryStorageService:
     def __init__(self, cloud_name: str, api_key: str, api_secret: str, folder: str = "uploads"):
+        # Imported here so local-storage deployments never pay for the SDK at startup
+        import cloudinary
+        import cloudinary.uploader
+
+        self.uploader = cloudinary.uploader
         cloudinary.config(
             cloud_name=cloud_name,
             api_key=api_key,
@@ -81,25 +97,30 @@ class CloudinaryStorageService:
                 detail="File exceeds maximum allowed size",
             )
 
+        return await self.save_bytes(content, file.content_type, file.filename)
+
+    async def save_bytes(self, content: bytes, content_type: str | None, filename: str | None) -> str:
+        """Store already-validated bytes and return their public URL."""
         # Determine resource type based on content type
         resource_type = "raw"
-        if file.content_type and file.content_type.startswith("image/"):
+        if content_type and content_type.startswith("image/"):
             resource_type = "image"
-        elif file.content_type == "application/pdf":
+        elif content_type == "application/pdf":
             resource_type = "raw"
 
         # Generate a unique public_id
-        suffix = Path(file.filename or "upload").suffix
+        suffix = Path(filename or "upload").suffix
         public_id = f"{self.folder}/{uuid4().hex}{suffix}"
 
         try:
             # Upload to Cloudinary
-            result = cloudinary.uploader.upload(
-                content,
-                public_id=public_id,
-                resource_type=resource_type,
-                folder=self.folder
-            )
+            with track_storage_upload("cloudinary", len(content)):
+                result = self.uploader.upload(
+                    content,
+                    public_id=public_id,
+                    resource_type=resource_type,
+                    folder=self.folder
+                )
             return result["secure_url"]
         except Exception as e:
             raise HTTPException(
@@ -108,6 +129,80 @@ class CloudinaryStorageService:
             )
 
 
+class GridFSStorageService:
+    """Files kept in MongoDB GridFS: durable across redeploys and shared by every worker.
+
+    Uploads are streamed into the bucket one GridFS chunk at a time, and files are served
+    back by GET /api/files/{file_id} (app.routers.files), so the returned URLs point there.
+    That route is public, so file ids are random uuid4 hex strings rather than ObjectIds,
+    which would let one known URL lead to the files uploaded around it.
+    """
+
+    def __init__(
+        self,
+        database: AsyncIOMotorDatabase,
+        base_url: str = "/api/files",
+        bucket_name: str = "uploads",
+        chunk_size_bytes: int = 255 * 1024,
+    ):
+        self.bucket = AsyncIOMotorGridFSBucket(database, bucket_name=bucket_name, chunk_size_bytes=chunk_size_bytes)
+        self.base_url = base_url.rstrip("/") + "/"
+        self.chunk_size_bytes = chunk_size_bytes
+
+    async def save_upload(self, file: UploadFile, allowed_mimes: Iterable[str], max_bytes: int) -> str:
+        if file.content_type not in allowed_mimes:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unsupported file type: {file.content_type}",
+            )
+
+        grid_in = self.bucket.open_upload_stream_with_id(
+            uuid4().hex,
+            Path(file.filename or "upload").name,
+            metadata={"contentType": file.content_type},
+        )
+        written = 0
+        with track_storage_upload("gridfs", file.size or 0):
+            try:
+                while chunk := await file.read(self.chunk_size_bytes):
+                    written += len(chunk)
+                    if written > max_bytes:
+                        raise HTTPException(
+                            status_code=status.HTTP_400_BAD_REQUEST,
+                            detail="File exceeds maximum allowed size",
+                        )
+                    await grid_in.write(chunk)
+                if written == 0:
+                    raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="File is empty")
+            except BaseException:
+                # Removes the chunks already written
+                await grid_in.abort()
+                raise
+            await grid_in.close()
+        return f"{self.base_url}{grid_in._id}"
+
+    async def save_bytes(self, content: bytes, content_type: str | None, filename: str | None) -> str:
+        """Store already-validated bytes and return their public URL."""
+        with track_storage_upload("gridfs", len(content)):
+            file_id = uuid4().hex
+            await self.bucket.upload_from_stream_with_id(
+                file_id,
+                Path(filename or "upload").name,
+                content,
+                metadata={"contentType": content_type},
+            )
+        return f"{self.base_url}{file_id}"
+
+    async def open(self, file_id: str) -> AsyncIOMotorGridOut | None:
+        """Open a stored file for reading, or None if there is no such file."""
+        if not _FILE_ID.match(file_id):
+            return None
+        try:
+            return await self.bucket.open_download_stream(file_id)
+        except NoFile:
+            return None
+
+
 class UnsupportedStorageMode(Exception):
     """Raised when an unsupported storage mode is requested."""
 
@@ -119,10 +214,17 @@ def build_storage_service(
     cloudinary_cloud_name: str | None = None,
     cloudinary_api_key: str | None = None,
     cloudinary_api_secret: str | None = None,
-    cloudinary_folder: str = "uploads"
-) -> StorageService | CloudinaryStorageService:
+    cloudinary_folder: str = "uploads",
+    database: AsyncIOMotorDatabase | None = None,
+    gridfs_bucket: str = "uploads",
+    gridfs_chunk_bytes: int = 255 * 1024,
+) -> StorageService | CloudinaryStorageService | GridFSStorageService:
     if mode == "local":
         return StorageService(uploads_dir, base_url)
+    elif mode == "gridfs":
+        if database is None:
+            raise UnsupportedStorageMode("GridFS storage needs a database")
+        return GridFSStorageService(database, bucket_name=gridfs_bucket, chunk_size_bytes=gridfs_chunk_bytes)
     elif mode == "cloudinary":
         if not all([cloudinary_cloud_name, cloudinary_api_key, cloudinary_api_secret]):
             raise UnsupportedStorageMode("Cloudinary credentials not configured")
@@ -0,0 +1,160 @@
+"""Resumable uploads: files sent ahead of the registration form in offset-addressed chunks.
+
+The protocol follows tus (https://tus.io) in spirit. A client creates an upload with the
+file's field, type and total length, then PATCHes bytes at ``Upload-Offset`` until the
+offset reaches the length. After a dropped connection it asks the server for the current
+offset (HEAD) and carries on from there instead of starting over. Chunks are kept in Mongo
+so any worker can take the next PATCH; when the last one lands the file is assembled,
+sniffed, handed to the configured storage backend and the chunks are deleted. The
+registration form then references the upload id instead of carrying the file.
+
+Sessions and chunks carry a TTL index on ``expires_at``, so abandoned uploads are removed
+by the database.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Mapping
+
+from fastapi import HTTPException, status
+from pymongo.errors import DuplicateKeyError
+
+from app.core.upload_guard import SNIFF_BYTES, sniff_mime
+from app.models.upload import UploadChunk, UploadSession
+from app.services.storage import CloudinaryStorageService, StorageService
+
+
+class ResumableUploads:
+    def __init__(
+        self,
+        storage: StorageService | CloudinaryStorageService,
+        field_types: Mapping[str, Iterable[str]],
+        max_file_bytes: int,
+        chunk_bytes: int,
+        expiry: timedelta,
+    ):
+        self.storage = storage
+        self.field_types = {field: set(types) for field, types in field_types.items()}
+        self.max_file_bytes = max_file_bytes
+        self.chunk_bytes = chunk_bytes
+        self.expiry = expiry
+
+    async def create(self, field: str, filename: str, content_type: str, length: int) -> UploadSession:
+        allowed = self.field_types.get(field)
+        if allowed is None:
+            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=f"Unknown upload field: {field}")
+        if content_type not in allowed:
+            raise HTTPException(
+                status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                detail=f"Unsupported file type: {content_type}",
+            )
+        if length <= 0:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="File is empty")
+        if length > self.max_file_bytes:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail="File exceeds maximum allowed size",
+            )
+
+        now = datetime.now(timezone.utc)
+        session = UploadSession(
+            field=field,
+            filename=filename,
+            content_type=content_type,
+            length=length,
+            created_at=now,
+            expires_at=now + self.expiry,
+        )
+        await session.insert()
+        return session
+
+    async def get(self, upload_id: str) -> UploadSession:
+        session = await UploadSession.get(upload_id)
+        if session is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Upload not found or expired")
+        return session
+
+    async def append(self, upload_id: str, offset: int, data: bytes) -> UploadSession:
+        """Write ``data`` at ``offset``; the offset must equal what the server already has."""
+        session = await self.get(upload_id)
+        if session.url is not None:
+            # A retried final PATCH whose response was lost
+            return session
+        if offset != session.offset:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Upload-Offset {offset} does not match the server offset {session.offset}",
+                headers={"Upload-Offset": str(session.offset)},
+            )
+        if len(data) > self.chunk_bytes or offset + len(data) > session.length:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail="Chunk is larger than allowed or runs past the declared length",
+            )
+
+        if offset == 0 and data:
+            self._check_type(session, sniff_mime(data[:SNIFF_BYTES]))
+
+        if data:
+            chunks = UploadChunk.get_motor_collection()
+            try:
+                await chunks.insert_one({
+                    "upload_id": session.id,
+                    "offset": offset,
+                    "data": data,
+                    "expires_at": session.expires_at,
+                })
+            except DuplicateKeyError:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="Another request already wrote this chunk",
+                )
+            # Advance only from the offset this request was checked against
+            result = await UploadSession.get_motor_collection().update_one(
+                {"_id": session.id, "offset": offset},
+                {"$set": {"offset": offset + len(data)}},
+            )
+            if result.modified_count != 1:
+                await chunks.delete_one({"upload_id": session.id, "offset": offset})
+                raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Upload offset moved concurrently")
+            session.offset = offset + len(data)
+
+        if session.offset == session.length:
+            await self._complete(session)
+        return session
+
+    async def resolve(self, upload_id: str, field: str) -> str:
+        """Stored URL of a completed upload made for ``field``."""
+        session = await UploadSession.get(upload_id)
+        if session is None or session.field != field:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"Unknown or expired {field} upload",
+            )
+        if session.url is None:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"The {field} upload is not complete ({session.offset} of {session.length} bytes)",
+            )
+        return session.url
+
+    def _check_type(self, session: UploadSession, sniffed: str) -> None:
+        if sniffed not in self.field_types[session.field]:
+            raise HTTPException(
+                status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                detail=f"File content does not match an allowed type (detected {sniffed})",
+            )
+
+    async def _complete(self, session: UploadSession) -> None:
+        chunks = UploadChunk.get_motor_collection()
+        parts = await chunks.find({"upload_id": session.id}, {"offset": 1, "data": 1}).sort("offset", 1).to_list(None)
+        content = b"".join(part["data"] for part in parts)
+        if len(content) != session.length:
+            # Chunks expired underneath a very slow upload
+            raise HTTPException(status_code=status.HTTP_410_GONE, detail="Upload data expired; start a new upload")
+
+        sniffed = sniff_mime(content[:SNIFF_BYTES])
+        self._check_type(session, sniffed)
+        url = await self.storage.save_bytes(content, sniffed, session.filename)
+        await UploadSession.get_motor_collection().update_one({"_id": session.id}, {"$set": {"url": url}})
+        session.url = url
+        await chunks.delete_many({"upload_id": session.id})
@@ -0,0 +1,234 @@
+"""Background waitlist scheduler: FIFO auto-promotion and payment-window expiry.
+
+Cap slots are counted in AppConfig.slots_held. The scheduler takes a slot with a conditional
+``$inc`` that only matches below the cap before it promotes anyone, so promotions cannot
+overshoot the cap however long a tick runs; admin approvals, late payments and expiries
+adjust the counter as they move players in or out of the slot-holding statuses.
+"""
+
+import asyncio
+import logging
+import os
+import socket
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+from beanie import PydanticObjectId
+from beanie.operators import In, Inc, Set
+
+from app.models.config import AppConfig
+from app.models.player import Player, RegistrationStatus
+from app.models.projections import PlayerStatusView
+from app.services.email_queue import EmailQueue
+from app.services.email_service import send_approval_email
+from app.services.stats import record_status_change
+
+logger = logging.getLogger(__name__)
+
+# Statuses that hold one of the `registration_cap` slots
+SLOT_HOLDING_STATUSES = [
+    RegistrationStatus.PAID,
+    RegistrationStatus.APPROVED,
+    RegistrationStatus.PENDING_PAYMENT,
+]
+UNPAID_APPROVED_STATUSES = [
+    RegistrationStatus.APPROVED,
+    RegistrationStatus.PENDING_PAYMENT,
+]
+
+
+class WaitlistScheduler:
+    """Periodically expire unpaid approvals and promote the oldest waitlisted players.
+
+    Every uvicorn worker runs one of these. A lease on the AppConfig document elects a
+    single leader per tick to avoid duplicate work; correctness does not depend on it. Each
+    promotion first claims a slot on the counter and each transition is a conditional update
+    on the current status, so a stale leader can neither promote a player twice nor promote
+    past the cap.
+    """
+
+    def __init__(
+        self,
+        email_queue: EmailQueue,
+        interval_seconds: int = 60,
+        payment_window_hours: int = 48,
+    ):
+        self.email_queue = email_queue
+        self.interval_seconds = max(1, interval_seconds)
+        self.payment_window = timedelta(hours=payment_window_hours) if payment_window_hours > 0 else None
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def aclose(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        # The lease lives on the config document, which is no longer created during boot
+        await AppConfig.get_or_create()
+        while True:
+            try:
+                await self.run_once()
+            except Exception:
+                logger.exception("Waitlist scheduler tick failed")
+            await asyncio.sleep(self.interval_seconds)
+
+    async def run_once(self) -> tuple[int, int]:
+        """Run one expiry + promotion pass. Returns (expired, promoted)."""
+        if not await self._acquire_lease():
+            return 0, 0
+        expired = await self.expire_unpaid()
+        promoted = await self.promote()
+        if expired or promoted:
+            logger.info("Waitlist scheduler tick", extra={"expired": expired, "promoted": promoted})
+        return expired, promoted
+
+    async def _acquire_lease(self) -> bool:
+        now = datetime.now(timezone.utc)
+        lease = await AppConfig.get_motor_collection().find_one_and_update(
+            {
+                "$or": [
+                    {"scheduler_lease_until": None},
+                    {"scheduler_lease_until": {"$lt": now}},
+                    {"scheduler_lease_owner": self.owner},
+                ]
+            },
+            {
+                "$set": {
+                    "scheduler_lease_owner": self.owner,
+                    "scheduler_lease_until": now + timedelta(seconds=self.interval_seconds * 2),
+                }
+            },
+        )
+        return lease is not None
+
+    async def expire_unpaid(self) -> int:
+        if self.payment_window is None:
+            return 0
+        cutoff = datetime.now(timezone.utc) - self.payment_window
+        expired = 0
+        # One guarded update per source status so the stats deltas stay exact
+        for unpaid_status in UNPAID_APPROVED_STATUSES:
+            result = await Player.find(
+                Player.registration_status == unpaid_status,
+                Player.approved_at < cutoff,
+            ).update_many(Set({Player.registration_status: RegistrationStatus.EXPIRED}), Inc({Player.revision: 1}))
+            await record_status_change(unpaid_status, RegistrationStatus.EXPIRED, count=result.modified_count)
+            await adjust_slots(-result.modified_count)
+            expired += result.modified_count
+        return expired
+
+    async def promote(self) -> int:
+        cfg = await AppConfig.get_or_create()
+        if cfg.slots_held is None:
+            # Normally counted by the migrate command; only written if still unset
+            await AppConfig.get_motor_collection().update_one(
+                {"_id": cfg.id, "slots_held": None}, {"$set": {"slots_held": await count_held_slots()}}
+            )
+            cfg = await AppConfig.get_or_create()
+        registration_cap = cfg.registration_cap
+        free_slots = registration_cap - cfg.slots_held
+        if free_slots <= 0:
+            return 0
+
+        candidates = await Player.find(
+            Player.registration_status == RegistrationStatus.WAITLIST
+        ).sort("+created_at").limit(free_slots).project(PlayerStatusView).to_list()
+
+        promoted = 0
+        for candidate in candidates:
+            if not await claim_slot(registration_cap):
+                # Taken by an approval or payment since the read above
+                break
+            result = await Player.find(
+                Player.id == candidate.id,
+                Player.registration_status == RegistrationStatus.WAITLIST,
+            ).update_many(
+                Set({
+                    Player.registration_status: RegistrationStatus.APPROVED,
+                    Player.approved_at: datetime.now(timezone.utc),
+                }),
+                Inc({Player.revision: 1}),
+            )
+            if result.modified_count != 1:
+                # Approved, rejected or promoted elsewhere since we read it; return the slot
+                await adjust_slots(-1)
+                continue
+            promoted += 1
+            self.email_queue.enqueue(
+                send_approval_email,
+                to_email=candidate.personal.email,
+                name=f"{candidate.personal.first_name} {candidate.personal.last_name}",
+                player_id=str(candidate.id),
+            )
+        await record_status_change(RegistrationStatus.WAITLIST, RegistrationStatus.APPROVED, count=promoted)
+        return promoted
+
+
+async def count_held_slots() -> int:
+    return await Player.find(In(Player.registration_status, SLOT_HOLDING_STATUSES)).count()
+
+
+async def sync_slot_counter() -> int:
+    """Recount AppConfig.slots_held from the players; returns the count."""
+    held = await count_held_slots()
+    await AppConfig.get_motor_collection().update_one({}, {"$set": {"slots_held": held}})
+    return held
+
+
+async def claim_slot(registration_cap: int) -> bool:
+    """Atomically take one slot if the counter is below the cap (and the cap is unchanged)."""
+    claimed = await AppConfig.get_motor_collection().find_one_and_update(
+        {"registration_cap": registration_cap, "slots_held": {"$lt": registration_cap}},
+        {"$inc": {"slots_held": 1}},
+    )
+    return claimed is not None
+
+
+async def adjust_slots(delta: int) -> None:
+    """Count players entering (+) or leaving (-) the slot-holding statuses outside claim_slot.
+
+    Admin approvals are counted rather than refused at the cap, as before. An uncounted
+    (None) counter is left alone; it is counted in full when first needed.
+    """
+    if delta:
+        await AppConfig.get_motor_collection().update_one(
+            {"slots_held": {"$ne": None}}, {"$inc": {"slots_held": delta}}
+        )
+
+
+async def waitlist_position(player_id: PydanticObjectId) -> tuple[int, int] | None:
+    """Return (position, queue length) for a waitlisted player, or None if not on the waitlist.
+
+    Both numbers are range counts on the (registration_status, created_at) index, so they
+    cost index keys only and never touch player documents. Players registered in the same
+    millisecond are ordered by _id.
+    """
+    collection = Player.get_motor_collection()
+    waitlisted = {"registration_status": RegistrationStatus.WAITLIST.value}
+    player = await collection.find_one({"_id": player_id, **waitlisted}, {"created_at": 1})
+    if player is None:
+        return None
+
+    created_at = player["created_at"]
+    ahead, total = await asyncio.gather(
+        collection.count_documents({
+            **waitlisted,
+            "$or": [
+                {"created_at": {"$lt": created_at}},
+                {"created_at": created_at, "_id": {"$lt": player_id}},
+            ],
+        }),
+        collection.count_documents(waitlisted),
+    )
+    return ahead + 1, total
@@ -0,0 +1 @@
+"""Performance benchmarks, run from apps/backend as ``python -m benchmarks.<name>``."""
@@ -0,0 +1,34 @@
+"""Shared setup for benchmarks: a seeded scratch database, real or in-memory."""
+
+import argparse
+
+from beanie import init_beanie
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+
+from app.commands.seed import seed_database
+from app.core.database import DOCUMENT_MODELS
+
+
+def add_database_arguments(parser: argparse.ArgumentParser, default_players: int = 1000) -> None:
+    parser.add_argument("--mongo-url", default="mongodb://localhost:27017")
+    parser.add_argument("--db", default="walle_bench", help="Scratch database; it is wiped and reseeded")
+    parser.add_argument("--players", type=int, default=default_players)
+    parser.add_argument(
+        "--mock",
+        action="store_true",
+        help="Use mongomock-motor instead of a real server (measures the Python side only)",
+    )
+
+
+async def open_seeded_database(args: argparse.Namespace) -> tuple[object, AsyncIOMotorDatabase]:
+    """Connect, initialise Beanie and seed `args.players` synthetic registrations."""
+    if args.mock:
+        from mongomock_motor import AsyncMongoMockClient
+
+        client = AsyncMongoMockClient()
+    else:
+        client = AsyncIOMotorClient(args.mongo_url)
+    database = client[args.db]
+    await init_beanie(database=database, document_models=DOCUMENT_MODELS)
+    await seed_database(database, args.players)
+    return client, database
@@ -0,0 +1,130 @@
+"""Storage backends wired up for the conformance suite and the storage benchmark.
+
+Each harness builds a backend exactly as build_storage_service would, plus a way to read a
+stored file back from the URL it returned. Cloudinary talks to benchmarks.fakes.cloudinary_app
+on a loopback port (the SDK call is blocking, so the fake runs on its own thread); GridFS
+needs a reachable MongoDB and uses a scratch database that is dropped afterwards.
+"""
+
+import asyncio
+import tempfile
+import threading
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import AsyncIterator, Awaitable, Callable
+
+import uvicorn
+from fastapi import UploadFile
+from starlette.datastructures import Headers
+
+from app.services.storage import build_storage_service
+from benchmarks.fakes import cloudinary_app
+from benchmarks.loadtest import free_port
+
+BACKENDS = ("local", "cloudinary", "gridfs")
+
+
+@dataclass
+class StorageHarness:
+    name: str
+    storage: object
+    read_back: Callable[[str], Awaitable[bytes | None]]
+    # Regex the returned URLs must match
+    url_pattern: str
+
+
+def upload_file(content: bytes, content_type: str, filename: str = "upload.png") -> UploadFile:
+    """An UploadFile like the one FastAPI builds from a multipart part (spooled, 1 MiB in memory)."""
+    spooled = tempfile.SpooledTemporaryFile(max_size=1024 * 1024)
+    spooled.write(content)
+    spooled.seek(0)
+    return UploadFile(
+        file=spooled,
+        filename=filename,
+        size=len(content),
+        headers=Headers({"content-type": content_type}),
+    )
+
+
+class _ThreadedServer:
+    """uvicorn on a background thread, so blocking SDK calls on the main loop can reach it."""
+
+    def __init__(self, app, port: int):
+        self.server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+
+    async def __aenter__(self):
+        self.thread.start()
+        while not self.server.started:
+            await asyncio.sleep(0.05)
+        return self
+
+    async def __aexit__(self, *exc):
+        self.server.should_exit = True
+        await asyncio.to_thread(self.thread.join)
+
+
+@asynccontextmanager
+async def open_backend(name: str, mongo_url: str = "mongodb://localhost:27017") -> AsyncIterator[StorageHarness]:
+    if name == "local":
+        with tempfile.TemporaryDirectory(prefix="walle-storage-") as directory:
+            base = Path(directory)
+            storage = build_storage_service("local", base, base_url="/uploads")
+
+            async def read_local(url: str) -> bytes | None:
+                path = base / url.removeprefix("/uploads/")
+                return path.read_bytes() if path.is_file() else None
+
+            yield StorageHarness(name, storage, read_local, r"^/uploads/[0-9a-f]{32}\.[a-z]+$")
+
+    elif name == "cloudinary":
+        import cloudinary
+
+        fake = cloudinary_app()
+        port = free_port()
+        async with _ThreadedServer(fake, port):
+            storage = build_storage_service(
+                "cloudinary",
+                Path(tempfile.gettempdir()),
+                base_url="/uploads",
+                cloudinary_cloud_name="walle-bench",
+                cloudinary_api_key="bench-key",
+                cloudinary_api_secret="bench-secret",
+                cloudinary_folder="bench",
+            )
+            cloudinary.config(upload_prefix=f"http://127.0.0.1:{port}")
+
+            async def read_cloudinary(url: str) -> bytes | None:
+                public_id = url.split("/upload/", 1)[-1]
+                return fake.state.files.get(public_id)
+
+            yield StorageHarness(
+                name, storage, read_cloudinary, r"^https://res\.cloudinary\.test/walle-bench/(image|raw)/upload/bench/"
+            )
+
+    elif name == "gridfs":
+        from motor.motor_asyncio import AsyncIOMotorClient
+
+        client = AsyncIOMotorClient(mongo_url, serverSelectionTimeoutMS=2000)
+        try:
+            # Raises ServerSelectionTimeoutError now rather than in the middle of a check
+            await client.admin.command("ping")
+        except Exception:
+            client.close()
+            raise
+        database = client[f"walle_storage_{free_port()}"]
+        try:
+            storage = build_storage_service("gridfs", Path(tempfile.gettempdir()), "/uploads", database=database)
+
+            async def read_gridfs(url: str) -> bytes | None:
+                grid_out = await storage.open(url.rsplit("/", 1)[-1])
+                return await grid_out.read() if grid_out is not None else None
+
+            yield StorageHarness(name, storage, read_gridfs, r"^/api/files/[0-9a-f]{32}$")
+        finally:
+            await client.drop_database(database.name)
+            client.close()
+
+    else:
+        raise ValueError(f"Unknown storage backend: {name}")
@@ -0,0 +1,127 @@
+"""Admin export paths: the CSV route vs the columnar Parquet / Arrow IPC export.
+
+Every path exports the seeded players joined with their payments. Reported per path:
+wall time of a full export, output size, Python heap peak seen by tracemalloc during a
+separate pass (tracemalloc slows allocation, so it is kept out of the timed pass) and,
+for the columnar paths, the peak of Arrow's own allocations, which tracemalloc cannot see.
+The columnar files are read back to check they hold one row per player.
+
+Usage (from apps/backend):
+    python -m benchmarks.bench_export --players 20000
+    python -m benchmarks.bench_export --mock --players 2000
+"""
+
+import argparse
+import asyncio
+import io
+import time
+import tracemalloc
+from types import SimpleNamespace
+from typing import AsyncIterator, Callable
+
+import pyarrow as pa
+import pyarrow.ipc
+import pyarrow.parquet
+
+from app.routers.admin import export_players_csv
+from app.services.columnar_export import export_players
+from benchmarks._common import add_database_arguments, open_seeded_database
+
+# export_players_csv only reads the admin credentials from its settings
+BENCH_SETTINGS = SimpleNamespace(admin_username="bench", admin_password="bench")
+
+
+async def csv_chunks(batch_size: int) -> AsyncIterator[bytes]:
+    response = await export_players_csv(username="bench", password="bench", settings=BENCH_SETTINGS)
+    async for chunk in response.body_iterator:
+        yield chunk.encode() if isinstance(chunk, str) else chunk
+
+
+def columnar_chunks(file_format: str) -> Callable[[int], AsyncIterator[bytes]]:
+    return lambda batch_size: export_players(file_format, batch_size)
+
+
+def read_back_rows(name: str, data: bytes) -> int | None:
+    if name == "parquet":
+        return pyarrow.parquet.read_metadata(io.BytesIO(data)).num_rows
+    if name == "arrow":
+        return pyarrow.ipc.open_stream(data).read_all().num_rows
+    return None
+
+
+async def run_export(chunks: AsyncIterator[bytes]) -> tuple[bytes, int]:
+    """Consume an export; returns (output, peak bytes Arrow had allocated while it ran).
+
+    The Arrow figure is sampled every millisecond, since batches are built and freed on a
+    worker thread between chunks.
+    """
+    peak = pa.total_allocated_bytes()
+    done = asyncio.Event()
+
+    async def sample() -> None:
+        nonlocal peak
+        while not done.is_set():
+            peak = max(peak, pa.total_allocated_bytes())
+            await asyncio.sleep(0.001)
+
+    sampler = asyncio.create_task(sample())
+    output = bytearray()
+    try:
+        async for chunk in chunks:
+            output += chunk
+    finally:
+        done.set()
+        await sampler
+    return bytes(output), peak
+
+
+async def bench_path(name: str, export: Callable[[int], AsyncIterator[bytes]], batch_size: int) -> dict:
+    await run_export(export(batch_size))  # warm-up
+
+    started = time.perf_counter()
+    data, arrow_peak = await run_export(export(batch_size))
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    try:
+        await run_export(export(batch_size))
+        _, heap_peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "path": name,
+        "seconds": elapsed,
+        "bytes": len(data),
+        "heap_peak_mb": heap_peak / 1e6,
+        "arrow_peak_mb": arrow_peak / 1e6,
+        "rows": read_back_rows(name, data),
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_database_arguments(parser, default_players=20000)
+    parser.add_argument("--batch-size", type=int, default=2000, help="Players per record batch")
+    args = parser.parse_args()
+
+    paths: dict[str, Callable[[int], AsyncIterator[bytes]]] = {
+        "csv": csv_chunks,
+        "parquet": columnar_chunks("parquet"),
+        "arrow": columnar_chunks("arrow"),
+    }
+    client, _ = await open_seeded_database(args)
+    try:
+        print(f"{'path':<8} {'seconds':>8} {'MB':>8} {'heap MB':>8} {'arrow MB':>9} {'rows':>7}")
+        for name, export in paths.items():
+            row = await bench_path(name, export, args.batch_size)
+            print(
+                f"{row['path']:<8} {row['seconds']:>8.2f} {row['bytes'] / 1e6:>8.2f} {row['heap_peak_mb']:>8.1f} "
+                f"{row['arrow_peak_mb']:>9.1f} {row['rows'] if row['rows'] is not None else '-':>7}"
+            )
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
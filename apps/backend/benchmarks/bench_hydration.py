@@ -0,0 +1,80 @@
+"""Full Beanie document hydration vs projection models on admin-sized pages.
+
+For each strategy the benchmark loads `--page-size` players per request and reports the
+per-request CPU time (time.process_time) and the allocations made while doing it
+(tracemalloc: bytes allocated at peak and number of live blocks created).
+
+Usage (from apps/backend):
+    python -m benchmarks.bench_hydration --mongo-url mongodb://localhost:27017
+    python -m benchmarks.bench_hydration --mock        # no server needed
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+import tracemalloc
+from typing import Awaitable, Callable
+
+from app.models.player import Player
+from app.models.projections import PlayerIdView, PlayerListView, PlayerStateView
+from benchmarks._common import add_database_arguments, open_seeded_database
+
+
+async def measure(fetch: Callable[[], Awaitable[list]], requests: int) -> dict[str, float]:
+    cpu_ms, peak_kib, blocks = [], [], []
+    await fetch()  # warm up connection pool and caches
+    for _ in range(requests):
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        started = time.process_time()
+        rows = await fetch()
+        cpu_ms.append((time.process_time() - started) * 1000)
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        peak_kib.append(peak / 1024)
+        blocks.append(sum(stat.count_diff for stat in after.compare_to(before, "filename")))
+        del rows
+    return {
+        "cpu_ms": statistics.median(cpu_ms),
+        "peak_kib": statistics.median(peak_kib),
+        "blocks": statistics.median(blocks),
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_database_arguments(parser, default_players=1000)
+    parser.add_argument("--page-size", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=20)
+    args = parser.parse_args()
+
+    client, _ = await open_seeded_database(args)
+    page = args.page_size
+    strategies: dict[str, Callable[[], Awaitable[list]]] = {
+        "full Player documents": lambda: Player.find_all().limit(page).to_list(),
+        "PlayerListView projection": lambda: Player.find_all().limit(page).project(PlayerListView).to_list(),
+        "PlayerStateView projection": lambda: Player.find_all().limit(page).project(PlayerStateView).to_list(),
+        "PlayerIdView projection": lambda: Player.find_all().limit(page).project(PlayerIdView).to_list(),
+    }
+    try:
+        print(f"{args.players} players, {page} rows per request, {args.requests} requests each")
+        print(f"{'strategy':<30} {'cpu ms/req':>11} {'peak KiB':>10} {'blocks':>9}")
+        baseline = None
+        for name, fetch in strategies.items():
+            result = await measure(fetch, args.requests)
+            if baseline is None:
+                baseline = result["cpu_ms"]
+            # process_time() can measure 0.0 for a tiny --requests/page
+            speedup = f"{baseline / result['cpu_ms']:.1f}x" if result["cpu_ms"] and baseline else "n/a"
+            print(
+                f"{name:<30} {result['cpu_ms']:>11.2f} {result['peak_kib']:>10.0f} "
+                f"{result['blocks']:>9.0f}  ({speedup})"
+            )
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,96 @@
+"""Cold-start import budget for app.main, measured with ``python -X importtime``.
+
+Imports app.main in fresh interpreters (--repeat times) and reports the median cumulative
+import time plus the heaviest top-level packages. Exits non-zero when the median exceeds
+--max-ms, or when any --forbid module (backends and tools that should load lazily) was
+imported at startup, so it can gate CI.
+
+Usage (from apps/backend):
+    python -m benchmarks.bench_import_time
+    python -m benchmarks.bench_import_time --max-ms 600 --repeat 7
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+from benchmarks.loadtest import BACKEND_DIR
+
+DEFAULT_FORBIDDEN = ("cloudinary", "fastapi_mail", "pyinstrument", "magic", "pyarrow")
+# Settings are read at import; any values will do since nothing connects
+DUMMY_ENV = {
+    "MONGO_URL": "mongodb://localhost:27017",
+    "MONGO_DB": "walle_import_bench",
+    "RAZORPAY_KEY_ID": "rzp_test_import",
+    "RAZORPAY_KEY_SECRET": "import-secret",
+    "ADMIN_PASSWORD": "import-admin",
+}
+
+
+def import_profile(module: str) -> dict[str, tuple[int, int]]:
+    """Return {module: (self_us, cumulative_us)} for one fresh interpreter."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR,
+        env={**os.environ, **DUMMY_ENV},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    profile = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        if self_us.isdigit():
+            profile[name] = (int(self_us), int(cumulative_us))
+    return profile
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--max-ms", type=float, default=800.0, help="Budget for the median cumulative import time")
+    parser.add_argument("--top", type=int, default=12)
+    parser.add_argument("--forbid", nargs="*", default=list(DEFAULT_FORBIDDEN))
+    args = parser.parse_args()
+
+    totals_ms: list[float] = []
+    packages: dict[str, list[int]] = defaultdict(list)
+    imported: set[str] = set()
+    for _ in range(args.repeat):
+        profile = import_profile(args.module)
+        totals_ms.append(profile[args.module][1] / 1000)
+        imported.update(profile)
+        # Attribute time to top-level packages via their own entry (cumulative covers submodules)
+        for name, (_, cumulative) in profile.items():
+            if "." not in name and name != args.module:
+                packages[name].append(cumulative)
+
+    median_ms = statistics.median(totals_ms)
+    print(f"import {args.module}: median {median_ms:.0f} ms over {args.repeat} runs "
+          f"(min {min(totals_ms):.0f}, max {max(totals_ms):.0f}); budget {args.max_ms:.0f} ms")
+    heaviest = sorted(packages.items(), key=lambda item: statistics.median(item[1]), reverse=True)[:args.top]
+    print(f"{'package':<24} {'cumulative ms':>14}")
+    for name, samples in heaviest:
+        print(f"{name:<24} {statistics.median(samples) / 1000:>14.1f}")
+
+    failures = []
+    if median_ms > args.max_ms:
+        failures.append(f"median import time {median_ms:.0f} ms exceeds budget of {args.max_ms:.0f} ms")
+    for name in args.forbid:
+        if name in imported:
+            failures.append(f"{name} is imported at startup; it should be imported lazily")
+    for failure in failures:
+        print(f"❌ {failure}")
+    if not failures:
+        print("✅ Within startup budget")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,130 @@
+"""Players collection footprint before and after the compact schema migration.
+
+Seeds --players synthetic registrations, rewrites them into the old flat shape (details as
+top-level fields, enum labels as free-form strings, the old index set) and measures; then
+runs migration 1 from app.commands.migrate, syncs the current indexes and measures again.
+Reported for each state:
+
+- average and total BSON document size
+- admin listing page: bytes of one 50-row projected page as it comes off the wire
+- storage size (compressed, on disk) and total index size, from collStats
+- working set: uncompressed data plus indexes, what the WiredTiger cache has to hold for
+  the collection to be served without disk reads
+
+Both states are compacted before collStats is read, so space freed by the in-place rewrite
+does not count against the new schema. With --mock only the document sizes are reported.
+
+Usage (from apps/backend):
+    python -m benchmarks.bench_schema_size --players 20000
+    python -m benchmarks.bench_schema_size --mock
+"""
+
+import argparse
+import asyncio
+import time
+
+import bson
+from beanie import init_beanie
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, DESCENDING, TEXT, IndexModel, ReplaceOne
+from pymongo.errors import OperationFailure
+
+from app.commands.migrate import compact_players
+from app.core.database import DOCUMENT_MODELS
+from app.models.player import PATH_FIELDS, SECTION_MODELS, flatten_details
+from app.models.projections import PlayerListView, projection_of
+from benchmarks._common import add_database_arguments, open_seeded_database
+
+# The players indexes as declared before the migration, on the flat field names
+LEGACY_INDEXES = [
+    IndexModel([("email_key", ASCENDING)], name="email_key", unique=True,
+               partialFilterExpression={"email_key": {"$type": "string"}}),
+    IndexModel([("phone_key", ASCENDING)], name="phone_key", unique=True,
+               partialFilterExpression={"phone_key": {"$type": "string"}}),
+    IndexModel([("created_at", DESCENDING)], name="created_at_-1"),
+    IndexModel([("registration_status", ASCENDING), ("created_at", DESCENDING)], name="registration_status_created_at"),
+    IndexModel([("registration_status", ASCENDING), ("approved_at", ASCENDING)], name="registration_status_approved_at"),
+    IndexModel([("tshirt_size", ASCENDING), ("created_at", DESCENDING)], name="tshirt_size_created_at"),
+    IndexModel([("played_jypl_s7", ASCENDING), ("created_at", DESCENDING)], name="played_jypl_s7_created_at"),
+    IndexModel(
+        [("first_name", TEXT), ("last_name", TEXT), ("email", TEXT), ("phone", TEXT), ("firm_name", TEXT)],
+        name="player_search_text",
+    ),
+]
+# The listing projection before the migration: PlayerListView's fields under their flat names
+LEGACY_LIST_PROJECTION = {PATH_FIELDS.get(path, path): 1 for path in projection_of(PlayerListView)}
+PAGE_SIZE = 50
+
+
+def legacy_document(document: dict) -> dict:
+    """The flat, labelled shape the registration route wrote before the migration."""
+    top_level = {key: value for key, value in document.items() if key not in SECTION_MODELS}
+    return top_level | flatten_details(document)
+
+
+async def rewrite_as_legacy(database: AsyncIOMotorDatabase, batch_size: int) -> None:
+    collection = database.players
+    batch: list[ReplaceOne] = []
+    async for document in collection.find({}, batch_size=batch_size):
+        batch.append(ReplaceOne({"_id": document["_id"]}, legacy_document(document)))
+        if len(batch) >= batch_size:
+            await collection.bulk_write(batch, ordered=False)
+            batch = []
+    if batch:
+        await collection.bulk_write(batch, ordered=False)
+    await collection.drop_indexes()
+    await collection.create_indexes(LEGACY_INDEXES)
+
+
+async def measure(database: AsyncIOMotorDatabase, projection: dict[str, int], mock: bool) -> dict[str, float]:
+    collection = database.players
+    sizes = [len(bson.encode(document)) async for document in collection.find({})]
+    page = await collection.find({}, projection).sort("created_at", -1).limit(PAGE_SIZE).to_list(length=PAGE_SIZE)
+    result = {
+        "avg document bytes": sum(sizes) / max(len(sizes), 1),
+        "total document KiB": sum(sizes) / 1024,
+        "listing page bytes": sum(len(bson.encode(document)) for document in page),
+    }
+    if mock:
+        return result
+
+    try:
+        await database.command("compact", "players")
+    except OperationFailure as exc:
+        print(f"   (compact not permitted here, sizes include free space: {exc.details.get('errmsg')})")
+    stats = await database.command("collStats", "players")
+    result["storage KiB"] = stats["storageSize"] / 1024
+    result["index KiB"] = stats["totalIndexSize"] / 1024
+    result["working set KiB"] = (stats["size"] + stats["totalIndexSize"]) / 1024
+    return result
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_database_arguments(parser, default_players=20000)
+    parser.add_argument("--batch-size", type=int, default=500, help="Players per bulk write in the migration")
+    args = parser.parse_args()
+
+    client, database = await open_seeded_database(args)
+    try:
+        await rewrite_as_legacy(database, args.batch_size)
+        before = await measure(database, LEGACY_LIST_PROJECTION, args.mock)
+
+        started = time.perf_counter()
+        rewritten, problems = await compact_players(args.batch_size)
+        elapsed = time.perf_counter() - started
+        await init_beanie(database=database, document_models=DOCUMENT_MODELS, allow_index_dropping=True)
+        after = await measure(database, projection_of(PlayerListView), args.mock)
+    finally:
+        client.close()
+
+    print(f"🧱 Migrated {rewritten} players in {elapsed:.2f}s ({rewritten / elapsed:,.0f}/s), {len(problems)} problems")
+    print(f"{'metric':<22} {'flat':>12} {'compact':>12} {'change':>8}")
+    for metric, old in before.items():
+        new = after[metric]
+        change = (new - old) / old * 100 if old else 0.0
+        print(f"{metric:<22} {old:>12,.1f} {new:>12,.1f} {change:>7.1f}%")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,93 @@
+"""Admin listing serialization: Pydantic models + jsonable_encoder vs raw rows + orjson.
+
+Measures how many complete listing responses per second each path can render at
+several page sizes. No database is involved; rows are synthetic raw documents shaped
+like the projected players query returns.
+
+Usage (from apps/backend):
+    python -m benchmarks.bench_serialization --sizes 50 500 5000
+"""
+
+import argparse
+import random
+import time
+from datetime import datetime, timezone
+from typing import Callable
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+from app.commands.seed import fake_player_document
+from app.models.player import flatten_details
+from app.models.projections import PlayerListView, projection_of
+from app.routers.admin import PlayerResponse, _player_row
+
+
+PLAIN_FIELDS = [field for field in PlayerResponse.model_fields if field not in ("id", "payment_status", "created_at")]
+
+
+def make_page(size: int) -> tuple[list[dict], dict]:
+    rng = random.Random(size)
+    # Top-level keys of the listing projection (whole subdocuments; the extra URLs are ignored)
+    fields = {path.split(".", 1)[0] for path in projection_of(PlayerListView)}
+    now = datetime.now(timezone.utc)
+    documents = [
+        {key: value for key, value in fake_player_document(i, rng, now).items() if key in fields}
+        for i in range(size)
+    ]
+    payments = {doc["_id"]: "CAPTURED" for doc in documents if doc["registration_status"] == "PAID"}
+    return documents, payments
+
+
+def pydantic_path(documents: list[dict], payments: dict) -> bytes:
+    """What the endpoint did before: model per row, then FastAPI's encoder and json.dumps."""
+    players = []
+    for doc in documents:
+        details = flatten_details(doc) | {"registration_status": doc["registration_status"]}
+        players.append(
+            PlayerResponse(
+                id=str(doc["_id"]),
+                **{field: details[field] for field in PLAIN_FIELDS},
+                payment_status=payments.get(doc["_id"]),
+                created_at=doc["created_at"].isoformat(),
+            )
+        )
+    content = {"players": players, "total": len(players), "page": 1, "limit": len(players)}
+    return JSONResponse(jsonable_encoder(content)).body
+
+
+def orjson_path(documents: list[dict], payments: dict) -> bytes:
+    content = {
+        "players": [_player_row(doc, payments.get(doc["_id"])) for doc in documents],
+        "total": len(documents),
+        "page": 1,
+        "limit": len(documents),
+    }
+    return ORJSONResponse(content).body
+
+
+def responses_per_second(render: Callable[[list[dict], dict], bytes], page: tuple, seconds: float) -> float:
+    render(*page)
+    count, started = 0, time.perf_counter()
+    while (elapsed := time.perf_counter() - started) < seconds:
+        render(*page)
+        count += 1
+    return count / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 500, 5000])
+    parser.add_argument("--seconds", type=float, default=2.0, help="Measurement time per path and size")
+    args = parser.parse_args()
+
+    print(f"{'page size':>9} {'pydantic resp/s':>16} {'orjson resp/s':>14} {'speedup':>8} {'bytes':>9}")
+    for size in args.sizes:
+        page = make_page(size)
+        slow = responses_per_second(pydantic_path, page, args.seconds)
+        fast = responses_per_second(orjson_path, page, args.seconds)
+        print(f"{size:>9} {slow:>16.1f} {fast:>14.1f} {fast / slow:>7.1f}x {len(orjson_path(*page)):>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Upload throughput and memory of each storage backend across file sizes and concurrency.
+
+For every (backend, size, concurrency) case, --uploads files go through ``save_upload`` with
+at most `concurrency` in flight, the way concurrent registrations would. Reported per case:
+uploads per second, MB/s of payload and the peak Python heap seen by tracemalloc during a
+separate pass of `concurrency` uploads (tracemalloc slows allocation, so it is kept out of
+the timed pass). Cloudinary runs against the local fake (benchmarks.fakes.cloudinary_app),
+so its numbers are the SDK's own overhead, not Cloudinary's; the SDK call blocks the event
+loop, which shows up as concurrency not helping. GridFS needs --mongo-url and is skipped
+when MongoDB is unreachable.
+
+Usage (from apps/backend):
+    python -m benchmarks.bench_storage
+    python -m benchmarks.bench_storage --backend local gridfs --sizes-kb 100 1024 10240 --concurrency 1 16
+"""
+
+import argparse
+import asyncio
+import json
+import time
+import tracemalloc
+from pathlib import Path
+
+from pymongo.errors import ServerSelectionTimeoutError
+
+from benchmarks._storage import BACKENDS, StorageHarness, open_backend, upload_file
+
+PNG_HEADER = bytes.fromhex("89504e470d0a1a0a0000000d49484452")
+MIMES = {"image/png"}
+
+
+async def upload_many(harness: StorageHarness, content: bytes, count: int, concurrency: int) -> None:
+    limit = asyncio.Semaphore(concurrency)
+
+    async def one() -> None:
+        async with limit:
+            await harness.storage.save_upload(upload_file(content, "image/png"), MIMES, len(content))
+
+    await asyncio.gather(*(one() for _ in range(count)))
+
+
+async def bench_case(harness: StorageHarness, size_kb: int, concurrency: int, uploads: int) -> dict:
+    content = PNG_HEADER + b"\0" * (size_kb * 1024 - len(PNG_HEADER))
+    await upload_many(harness, content, min(uploads, concurrency), concurrency)  # warm-up
+
+    started = time.perf_counter()
+    await upload_many(harness, content, uploads, concurrency)
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    try:
+        await upload_many(harness, content, concurrency, concurrency)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "backend": harness.name,
+        "size_kb": size_kb,
+        "concurrency": concurrency,
+        "uploads": uploads,
+        "uploads_per_s": uploads / elapsed,
+        "mb_per_s": uploads * len(content) / elapsed / 1e6,
+        "peak_heap_mb": peak / 1e6,
+    }
+
+
+def print_row(row: dict) -> None:
+    print(
+        f"{row['backend']:<11} {row['size_kb']:>8} {row['concurrency']:>6} {row['uploads_per_s']:>10.1f} "
+        f"{row['mb_per_s']:>8.1f} {row['peak_heap_mb']:>10.1f}"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend", nargs="*", choices=BACKENDS, default=list(BACKENDS))
+    parser.add_argument("--sizes-kb", nargs="*", type=int, default=[100, 1024, 5120, 10240])
+    parser.add_argument("--concurrency", nargs="*", type=int, default=[1, 8, 32])
+    parser.add_argument("--uploads", type=int, default=40, help="Timed uploads per case")
+    parser.add_argument("--mongo-url", default="mongodb://localhost:27017", help="For the gridfs backend")
+    parser.add_argument("--save", type=Path, default=None, help="Write the rows as JSON")
+    args = parser.parse_args()
+
+    rows = []
+    print(f"{'backend':<11} {'size KB':>8} {'conc':>6} {'uploads/s':>10} {'MB/s':>8} {'peak MB':>10}")
+    for name in args.backend:
+        try:
+            async with open_backend(name, args.mongo_url) as harness:
+                for size_kb in args.sizes_kb:
+                    for concurrency in args.concurrency:
+                        row = await bench_case(harness, size_kb, concurrency, args.uploads)
+                        print_row(row)
+                        rows.append(row)
+        except ServerSelectionTimeoutError:
+            print(f"{name:<11} skipped: MongoDB at {args.mongo_url} is not reachable")
+
+    if args.save:
+        args.save.write_text(json.dumps(rows, indent=2))
+        print(f"💾 Saved results to {args.save}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
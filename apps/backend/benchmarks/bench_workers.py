@@ -0,0 +1,134 @@
+"""Throughput scaling of the production server profile from 1 to N workers.
+
+For each worker count the benchmark boots ``python -m app.server`` (uvloop, httptools,
+tuned keep-alive), then hammers it from several client processes for a fixed duration so
+the load generator is not the bottleneck. Requests alternate between /api/health (HTTP
+stack only) and /api/config (two Mongo reads). Reports req/s, p50/p99 latency and the
+speed-up relative to one worker.
+
+With --mock each worker gets its own mongomock-motor database, which is fine for these
+read-only endpoints. For the full register -> payment funnel across workers use
+``python -m benchmarks.loadtest --workers N`` against a real MongoDB.
+
+Usage (from apps/backend):
+    python -m benchmarks.bench_workers --mock --max-workers 4
+    python -m benchmarks.bench_workers --mongo-url mongodb://localhost:27017 --max-workers 8 --duration 20
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import subprocess
+import sys
+import time
+
+import httpx
+
+from benchmarks.loadtest import ADMIN_PASSWORD, BACKEND_DIR, free_port, percentile, wait_until_ready
+
+DEFAULT_PATHS = ("/api/health", "/api/config")
+
+
+async def hammer(base_url: str, paths: list[str], connections: int, duration: float) -> tuple[list[float], int]:
+    latencies: list[float] = []
+    errors = 0
+    deadline = time.monotonic() + duration
+    limits = httpx.Limits(max_connections=connections, max_keepalive_connections=connections)
+
+    async def user(offset: int) -> None:
+        nonlocal errors
+        index = offset
+        while time.monotonic() < deadline:
+            path = paths[index % len(paths)]
+            index += 1
+            started = time.perf_counter()
+            try:
+                response = await client.get(path)
+                if response.status_code != 200:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        await asyncio.gather(*(user(offset) for offset in range(connections)))
+    return latencies, errors
+
+
+def client_process(args: tuple[str, list[str], int, float]) -> tuple[list[float], int]:
+    return asyncio.run(hammer(*args))
+
+
+def boot_server(args: argparse.Namespace, workers: int, port: int) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "MONGO_URL": args.mongo_url,
+        "MONGO_DB": args.db,
+        "RAZORPAY_KEY_ID": "rzp_test_bench",
+        "RAZORPAY_KEY_SECRET": "bench-secret",
+        "ADMIN_PASSWORD": ADMIN_PASSWORD,
+        "RATE_LIMIT_ENABLED": "false",
+        "LOG_LEVEL": "WARNING",
+        "HOST": "127.0.0.1",
+    }
+    command = [sys.executable, "-m", "app.server", "--workers", str(workers), "--port", str(port)]
+    if args.mock:
+        command += ["--app", "benchmarks.mock_mongo_app:app"]
+    return subprocess.Popen(command, cwd=BACKEND_DIR, env=env)
+
+
+def measure(args: argparse.Namespace, workers: int) -> dict[str, float]:
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    process = boot_server(args, workers, port)
+    try:
+        asyncio.run(wait_until_ready(base_url, process))
+        # Warm every worker's connection pool and lazily created documents
+        asyncio.run(hammer(base_url, args.paths, args.connections, 1.0))
+        job = (base_url, args.paths, args.connections, args.duration)
+        with multiprocessing.Pool(args.clients) as pool:
+            results = pool.map(client_process, [job] * args.clients)
+    finally:
+        process.terminate()
+        process.wait(timeout=60)
+
+    latencies = [sample for samples, _ in results for sample in samples]
+    errors = sum(count for _, count in results)
+    return {
+        "workers": workers,
+        "rps": len(latencies) / args.duration,
+        "p50_ms": percentile(latencies, 50),
+        "p99_ms": percentile(latencies, 99),
+        "error_rate": errors / len(latencies) if latencies else 0.0,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mongo-url", default="mongodb://localhost:27017")
+    parser.add_argument("--db", default="walle_bench")
+    parser.add_argument("--mock", action="store_true", help="Serve from mongomock-motor (one database per worker)")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds of load per worker count")
+    parser.add_argument("--clients", type=int, default=max(1, (os.cpu_count() or 2) // 2), help="Client processes")
+    parser.add_argument("--connections", type=int, default=32, help="Keep-alive connections per client process")
+    parser.add_argument("--paths", nargs="+", default=list(DEFAULT_PATHS))
+    args = parser.parse_args()
+
+    counts = sorted({1, *range(2, args.max_workers + 1, 2), args.max_workers})
+    rows = [measure(args, workers) for workers in counts]
+
+    base = rows[0]["rps"] or 1.0
+    print(f"{args.clients} client process(es) x {args.connections} connections, {args.duration:.0f}s per run, "
+          f"{'mongomock' if args.mock else 'mongo'}; paths: {' '.join(args.paths)}")
+    print(f"{'workers':>7} {'req/s':>10} {'speed-up':>9} {'p50 ms':>8} {'p99 ms':>8} {'errors':>8}")
+    for row in rows:
+        print(
+            f"{row['workers']:>7} {row['rps']:>10.0f} {row['rps'] / base:>8.2f}x {row['p50_ms']:>8.1f} "
+            f"{row['p99_ms']:>8.1f} {row['error_rate']:>8.2%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
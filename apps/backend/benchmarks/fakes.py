@@ -0,0 +1,62 @@
+"""Minimal stand-ins for the Razorpay and Resend HTTP APIs used by the load test."""
+
+import asyncio
+from uuid import uuid4
+
+from fastapi import FastAPI, Request
+
+
+def razorpay_app(latency_ms: float = 0.0) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/v1/orders")
+    async def create_order(request: Request):
+        payload = await request.json()
+        if latency_ms:
+            await asyncio.sleep(latency_ms / 1000)
+        return {
+            "id": f"order_{uuid4().hex[:14]}",
+            "entity": "order",
+            "amount": payload.get("amount"),
+            "currency": payload.get("currency", "INR"),
+            "receipt": payload.get("receipt"),
+            "status": "created",
+        }
+
+    return app
+
+
+def resend_app(latency_ms: float = 0.0) -> FastAPI:
+    app = FastAPI()
+    app.state.sent = 0
+
+    @app.post("/emails")
+    async def send_email(request: Request):
+        await request.body()
+        if latency_ms:
+            await asyncio.sleep(latency_ms / 1000)
+        app.state.sent += 1
+        return {"id": str(uuid4())}
+
+    return app
+
+
+def cloudinary_app() -> FastAPI:
+    """Accepts the SDK's upload call (point cloudinary's upload_prefix here) and keeps the bytes."""
+    app = FastAPI()
+    app.state.files = {}
+
+    @app.post("/v1_1/{cloud_name}/{resource_type}/upload")
+    async def upload(cloud_name: str, resource_type: str, request: Request):
+        form = await request.form()
+        content = await form["file"].read()
+        public_id = form.get("public_id") or uuid4().hex
+        app.state.files[public_id] = content
+        return {
+            "public_id": public_id,
+            "resource_type": resource_type,
+            "bytes": len(content),
+            "secure_url": f"https://res.cloudinary.test/{cloud_name}/{resource_type}/upload/{public_id}",
+        }
+
+    return app
@@ -0,0 +1,334 @@
+"""Load test for the registration -> payment funnel.
+
+Boots the app in a uvicorn subprocess against a scratch Mongo database (or mongomock-motor
+with --mock), with fake Razorpay and Resend servers running in-process. It then drives
+complete funnels at the requested concurrency:
+
+    /api/register (multipart, two files) -> /api/payments/create-order
+        -> /api/payments/verify -> /api/payments/webhook
+
+Reports throughput, p50/p95/p99 latency and error rate per endpoint. --save writes the
+results as JSON; --baseline compares against a saved run and exits non-zero when an
+endpoint regresses by more than --tolerance.
+
+Usage (from apps/backend):
+    python -m benchmarks.loadtest --mock --funnels 500 --concurrency 20
+    python -m benchmarks.loadtest --mongo-url mongodb://localhost:27017 --funnels 2000 \\
+        --concurrency 50 --save loadtest-baseline.json
+    python -m benchmarks.loadtest --mongo-url mongodb://localhost:27017 --funnels 2000 \\
+        --concurrency 50 --baseline loadtest-baseline.json
+"""
+
+import argparse
+import asyncio
+import hashlib
+import hmac
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Any, Awaitable
+from uuid import uuid4
+
+import httpx
+import uvicorn
+
+from benchmarks.fakes import razorpay_app, resend_app
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+ENDPOINTS = ("register", "create-order", "verify", "webhook")
+KEY_ID = "rzp_test_loadtest"
+KEY_SECRET = "loadtest-key-secret"
+WEBHOOK_SECRET = "loadtest-webhook-secret"
+ADMIN_PASSWORD = "loadtest-admin"
+# A PNG signature followed by padding: small, but passes type sniffing
+PNG_BYTES = bytes.fromhex("89504e470d0a1a0a0000000d49484452") + b"\0" * 4096
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def sign(secret: str, message: bytes) -> str:
+    return hmac.new(secret.encode(), message, hashlib.sha256).hexdigest()
+
+
+class Recorder:
+    def __init__(self) -> None:
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.errors: Counter = Counter()
+
+    async def timed(self, endpoint: str, request: Awaitable[httpx.Response]) -> httpx.Response | None:
+        started = time.perf_counter()
+        try:
+            response = await request
+        except httpx.HTTPError:
+            response = None
+        self.latencies[endpoint].append((time.perf_counter() - started) * 1000)
+        if response is None or response.status_code >= 400:
+            self.errors[endpoint] += 1
+            return None
+        return response
+
+
+async def run_funnel(client: httpx.AsyncClient, recorder: Recorder, index: int) -> None:
+    form = {
+        "first_name": "Load",
+        "last_name": f"Tester{index}",
+        "email": f"load{index}@example.com",
+        "phone": f"9{index:09d}",
+        "residential_area": "Mumbai",
+        "firm_name": "Load Jewellers",
+        "designation": "Partner",
+        "batting_type": "Right-Hand",
+        "bowling_type": "Right Arm Medium",
+        "wicket_keeper": "No",
+        "name_on_jersey": "LOAD",
+        "tshirt_size": "L",
+        "waist_size": "34",
+        "played_jypl_s7": "no",
+        "jypl_s7_team": "",
+    }
+    files = {
+        "photo": ("photo.png", PNG_BYTES, "image/png"),
+        "visiting_card": ("card.png", PNG_BYTES, "image/png"),
+    }
+    response = await recorder.timed("register", client.post("/api/register", data=form, files=files))
+    if response is None:
+        return
+    player_id = response.json()["player_id"]
+
+    response = await recorder.timed(
+        "create-order", client.post("/api/payments/create-order", json={"player_id": player_id})
+    )
+    if response is None:
+        return
+    order_id = response.json()["razorpay_order_id"]
+    payment_id = f"pay_{uuid4().hex[:14]}"
+
+    await recorder.timed(
+        "verify",
+        client.post(
+            "/api/payments/verify",
+            json={
+                "player_id": player_id,
+                "razorpay_order_id": order_id,
+                "razorpay_payment_id": payment_id,
+                "razorpay_signature": sign(KEY_SECRET, f"{order_id}|{payment_id}".encode()),
+            },
+        ),
+    )
+
+    body = json.dumps({
+        "event": "payment.captured",
+        "payload": {"payment": {"entity": {"id": payment_id, "order_id": order_id}}},
+    }).encode()
+    await recorder.timed(
+        "webhook",
+        client.post(
+            "/api/payments/webhook",
+            content=body,
+            headers={"Content-Type": "application/json", "X-Razorpay-Signature": sign(WEBHOOK_SECRET, body)},
+        ),
+    )
+
+
+async def drive(base_url: str, funnels: int, concurrency: int) -> tuple[Recorder, float]:
+    recorder = Recorder()
+    indexes = iter(range(funnels))
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=60, limits=limits) as client:
+        async def virtual_user() -> None:
+            for index in indexes:
+                await run_funnel(client, recorder, index)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(virtual_user() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    return recorder, elapsed
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered) + 0.5) - 1))
+    return ordered[rank]
+
+
+def summarize(recorder: Recorder, elapsed: float, meta: dict[str, Any]) -> dict[str, Any]:
+    endpoints = {}
+    for endpoint in ENDPOINTS:
+        samples = recorder.latencies.get(endpoint, [])
+        errors = recorder.errors.get(endpoint, 0)
+        endpoints[endpoint] = {
+            "requests": len(samples),
+            "errors": errors,
+            "error_rate": errors / len(samples) if samples else 0.0,
+            "throughput_rps": len(samples) / elapsed if elapsed else 0.0,
+            "p50_ms": percentile(samples, 50),
+            "p95_ms": percentile(samples, 95),
+            "p99_ms": percentile(samples, 99),
+        }
+    return {"meta": {**meta, "elapsed_s": elapsed}, "endpoints": endpoints}
+
+
+def compare(current: dict[str, Any], baseline: dict[str, Any], tolerance: float) -> list[str]:
+    regressions = []
+    for endpoint, now in current["endpoints"].items():
+        before = baseline.get("endpoints", {}).get(endpoint)
+        if not before or not now["requests"]:
+            continue
+        if before["p95_ms"] and now["p95_ms"] > before["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{endpoint}: p95 {before['p95_ms']:.1f} -> {now['p95_ms']:.1f} ms")
+        if before["throughput_rps"] and now["throughput_rps"] < before["throughput_rps"] * (1 - tolerance):
+            regressions.append(
+                f"{endpoint}: throughput {before['throughput_rps']:.1f} -> {now['throughput_rps']:.1f} req/s"
+            )
+        if now["error_rate"] > before["error_rate"] + 0.01:
+            regressions.append(f"{endpoint}: error rate {before['error_rate']:.2%} -> {now['error_rate']:.2%}")
+    return regressions
+
+
+def print_report(result: dict[str, Any]) -> None:
+    meta = result["meta"]
+    print(
+        f"{meta['funnels']} funnels at concurrency {meta['concurrency']} "
+        f"in {meta['elapsed_s']:.1f}s ({'mongomock' if meta['mock'] else 'mongo'}, {meta['workers']} worker(s))"
+    )
+    print(f"{'endpoint':<14} {'requests':>8} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>8}")
+    for endpoint, row in result["endpoints"].items():
+        print(
+            f"{endpoint:<14} {row['requests']:>8} {row['throughput_rps']:>8.1f} {row['p50_ms']:>8.1f} "
+            f"{row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f} {row['error_rate']:>8.2%}"
+        )
+
+
+async def start_fake(app: Any, port: int) -> tuple[uvicorn.Server, asyncio.Task]:
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+    return server, task
+
+
+def boot_app(args: argparse.Namespace, port: int, razorpay_port: int, resend_port: int, uploads: str) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "MONGO_URL": args.mongo_url,
+        "MONGO_DB": args.db,
+        "RAZORPAY_KEY_ID": KEY_ID,
+        "RAZORPAY_KEY_SECRET": KEY_SECRET,
+        "RAZORPAY_WEBHOOK_SECRET": WEBHOOK_SECRET,
+        "RAZORPAY_API_URL": f"http://127.0.0.1:{razorpay_port}/v1",
+        "RESEND_API_KEY": "re_loadtest",
+        "RESEND_API_URL": f"http://127.0.0.1:{resend_port}/emails",
+        "ADMIN_PASSWORD": ADMIN_PASSWORD,
+        "STORAGE_MODE": "local",
+        "UPLOADS_DIR": uploads,
+        "WAITLIST_AUTO_PROMOTE": "false",
+        # Every simulated user comes from 127.0.0.1
+        "RATE_LIMIT_ENABLED": "false",
+        "LOG_LEVEL": "WARNING",
+    }
+    target = "benchmarks.mock_mongo_app:app" if args.mock else "app.main:app"
+    command = [
+        sys.executable, "-m", "uvicorn", target,
+        "--host", "127.0.0.1", "--port", str(port),
+        "--log-level", "warning", "--workers", str(args.workers),
+    ]
+    return subprocess.Popen(command, cwd=BACKEND_DIR, env=env)
+
+
+async def wait_until_ready(base_url: str, process: subprocess.Popen, timeout: float = 60) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise SystemExit(f"App exited during startup with code {process.returncode}")
+            try:
+                if (await client.get("/api/health")).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.2)
+    raise SystemExit("App did not become ready in time")
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mongo-url", default="mongodb://localhost:27017")
+    parser.add_argument("--db", default="walle_loadtest", help="Scratch database; dropped before the run")
+    parser.add_argument("--mock", action="store_true", help="Run the app on mongomock-motor (single worker)")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--funnels", type=int, default=500, help="Complete register->webhook funnels to run")
+    parser.add_argument("--concurrency", type=int, default=20, help="Concurrent virtual users")
+    parser.add_argument("--razorpay-latency-ms", type=float, default=0.0)
+    parser.add_argument("--resend-latency-ms", type=float, default=0.0)
+    parser.add_argument("--save", type=Path, help="Write results JSON here")
+    parser.add_argument("--baseline", type=Path, help="Compare against a saved results JSON")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative regression (0.2 = 20%%)")
+    args = parser.parse_args()
+    if args.mock and args.workers != 1:
+        raise SystemExit("--mock keeps data in process memory; use --workers 1")
+
+    if not args.mock:
+        from motor.motor_asyncio import AsyncIOMotorClient
+
+        scratch = AsyncIOMotorClient(args.mongo_url)
+        await scratch.drop_database(args.db)
+        scratch.close()
+
+    razorpay_port, resend_port, app_port = free_port(), free_port(), free_port()
+    fakes = [
+        await start_fake(razorpay_app(args.razorpay_latency_ms), razorpay_port),
+        await start_fake(resend_app(args.resend_latency_ms), resend_port),
+    ]
+    base_url = f"http://127.0.0.1:{app_port}"
+    with tempfile.TemporaryDirectory(prefix="walle-loadtest-") as uploads:
+        process = boot_app(args, app_port, razorpay_port, resend_port, uploads)
+        try:
+            await wait_until_ready(base_url, process)
+            async with httpx.AsyncClient(base_url=base_url) as client:
+                await client.post(
+                    "/api/admin/config",
+                    params={"username": "admin", "password": ADMIN_PASSWORD},
+                    json={"registration_open": True, "registration_cap": args.funnels + 1000},
+                )
+            recorder, elapsed = await drive(base_url, args.funnels, args.concurrency)
+        finally:
+            process.terminate()
+            process.wait(timeout=30)
+            for server, task in fakes:
+                server.should_exit = True
+                await task
+
+    result = summarize(recorder, elapsed, {
+        "funnels": args.funnels,
+        "concurrency": args.concurrency,
+        "workers": args.workers,
+        "mock": args.mock,
+    })
+    print_report(result)
+    if args.save:
+        args.save.write_text(json.dumps(result, indent=2))
+        print(f"💾 Saved results to {args.save}")
+    if args.baseline:
+        regressions = compare(result, json.loads(args.baseline.read_text()), args.tolerance)
+        for line in regressions:
+            print(f"❌ {line}")
+        if regressions:
+            return 1
+        print("✅ No regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
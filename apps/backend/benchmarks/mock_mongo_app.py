@@ -0,0 +1,14 @@
+"""ASGI entry point that serves app.main against an in-memory mongomock-motor database.
+
+Used by the load test's --mock mode: ``uvicorn benchmarks.mock_mongo_app:app``.
+"""
+
+from mongomock_motor import AsyncMongoMockClient
+
+import app.core.database as database
+
+database.AsyncIOMotorClient = lambda *args, **kwargs: AsyncMongoMockClient()  # type: ignore[assignment]
+
+from app.main import app  # noqa: E402
+
+__all__ = ["app"]
@@ -0,0 +1,147 @@
+"""Conformance checks every storage backend in app.services.storage must pass.
+
+The routers only rely on the shared ``save_upload`` / ``save_bytes`` contract, so each backend
+is run through the same checks: disallowed MIME types, empty files and files over the limit
+are refused with a 400 before anything is stored; a file of exactly the limit is accepted;
+the returned URL has the backend's shape, is unique per upload, never echoes the client's
+filename, and reads back byte-for-byte.
+
+A backend that cannot be reached (GridFS without a MongoDB) is reported as skipped unless it
+was named explicitly. Exits non-zero on any failure.
+
+Usage (from apps/backend):
+    python -m benchmarks.storage_conformance
+    python -m benchmarks.storage_conformance --backend local cloudinary
+    python -m benchmarks.storage_conformance --backend gridfs --mongo-url mongodb://localhost:27017
+"""
+
+import argparse
+import asyncio
+import re
+import sys
+from typing import Awaitable, Callable
+
+from fastapi import HTTPException
+from pymongo.errors import ServerSelectionTimeoutError
+
+from benchmarks._storage import BACKENDS, StorageHarness, open_backend, upload_file
+
+MAX_BYTES = 64 * 1024
+IMAGE_MIMES = {"image/png", "image/jpeg"}
+PNG_HEADER = bytes.fromhex("89504e470d0a1a0a0000000d49484452")
+
+
+class ConformanceFailure(AssertionError):
+    """A backend broke the contract. Raised explicitly so the checks still run under python -O."""
+
+
+def expect(condition: bool, message: str) -> None:
+    if not condition:
+        raise ConformanceFailure(message)
+
+
+def png(size: int) -> bytes:
+    return (PNG_HEADER + bytes(range(256)) * (size // 256 + 1))[:size]
+
+
+async def expect_rejected(harness: StorageHarness, content: bytes, content_type: str, what: str) -> None:
+    try:
+        url = await harness.storage.save_upload(upload_file(content, content_type), IMAGE_MIMES, MAX_BYTES)
+    except HTTPException as exc:
+        expect(exc.status_code == 400, f"{what}: expected 400, got {exc.status_code}")
+        return
+    raise ConformanceFailure(f"{what}: accepted and stored as {url}")
+
+
+async def check_rejects_disallowed_mime(harness: StorageHarness) -> None:
+    await expect_rejected(harness, b"%PDF-1.4\n", "application/pdf", "disallowed MIME type")
+
+
+async def check_rejects_empty_file(harness: StorageHarness) -> None:
+    await expect_rejected(harness, b"", "image/png", "empty file")
+
+
+async def check_rejects_oversized_file(harness: StorageHarness) -> None:
+    await expect_rejected(harness, png(MAX_BYTES + 1), "image/png", "file one byte over the limit")
+
+
+async def check_accepts_file_at_limit(harness: StorageHarness) -> None:
+    content = png(MAX_BYTES)
+    url = await harness.storage.save_upload(upload_file(content, "image/png"), IMAGE_MIMES, MAX_BYTES)
+    expect(await harness.read_back(url) == content, "stored bytes differ from the upload")
+
+
+async def check_url_shape(harness: StorageHarness) -> None:
+    url = await harness.storage.save_upload(upload_file(png(1024), "image/png"), IMAGE_MIMES, MAX_BYTES)
+    expect(re.match(harness.url_pattern, url) is not None, f"{url!r} does not match {harness.url_pattern!r}")
+
+
+async def check_urls_unique(harness: StorageHarness) -> None:
+    content = png(2048)
+    first = await harness.storage.save_upload(upload_file(content, "image/png"), IMAGE_MIMES, MAX_BYTES)
+    second = await harness.storage.save_upload(upload_file(content, "image/png"), IMAGE_MIMES, MAX_BYTES)
+    expect(first != second, "the same upload twice produced the same URL")
+
+
+async def check_ignores_client_filename(harness: StorageHarness) -> None:
+    upload = upload_file(png(1024), "image/png", filename="../../etc/passwd.png")
+    url = await harness.storage.save_upload(upload, IMAGE_MIMES, MAX_BYTES)
+    expect(".." not in url and "passwd" not in url, f"client filename leaked into {url!r}")
+
+
+async def check_save_bytes_round_trip(harness: StorageHarness) -> None:
+    content = png(10_000)
+    url = await harness.storage.save_bytes(content, "image/png", "photo.png")
+    expect(re.match(harness.url_pattern, url) is not None, f"{url!r} does not match {harness.url_pattern!r}")
+    expect(await harness.read_back(url) == content, "save_bytes stored different bytes")
+
+
+CHECKS: list[Callable[[StorageHarness], Awaitable[None]]] = [
+    check_rejects_disallowed_mime,
+    check_rejects_empty_file,
+    check_rejects_oversized_file,
+    check_accepts_file_at_limit,
+    check_url_shape,
+    check_urls_unique,
+    check_ignores_client_filename,
+    check_save_bytes_round_trip,
+]
+
+
+async def run_backend(name: str, mongo_url: str, required: bool) -> int:
+    """Run every check against one backend; returns the number of failures."""
+    failures = 0
+    try:
+        async with open_backend(name, mongo_url) as harness:
+            print(f"🗄️  {name}")
+            for check in CHECKS:
+                label = check.__name__.removeprefix("check_").replace("_", " ")
+                try:
+                    await check(harness)
+                    print(f"   ✅ {label}")
+                except Exception as exc:
+                    failures += 1
+                    print(f"   ❌ {label}: {exc!r}")
+    except ServerSelectionTimeoutError:
+        if required:
+            print(f"🗄️  {name}\n   ❌ MongoDB at {mongo_url} is not reachable")
+            return 1
+        print(f"🗄️  {name}\n   ⏭️  skipped (MongoDB at {mongo_url} is not reachable)")
+    return failures
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend", nargs="*", choices=BACKENDS, default=None, help="Defaults to all")
+    parser.add_argument("--mongo-url", default="mongodb://localhost:27017", help="For the gridfs backend")
+    args = parser.parse_args()
+
+    failures = 0
+    for name in args.backend or BACKENDS:
+        failures += await run_backend(name, args.mongo_url, required=args.backend is not None)
+    print("✅ All backends conform" if not failures else f"❌ {failures} check(s) failed")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -79,6 +79,7 @@ export function RegistrationForm({
 
   const [stepIndex, setStepIndex] = useState(0);
   const [playerId, setPlayerId] = useState<string | null>(null);
+  const [playerEtag, setPlayerEtag] = useState<string | null>(null);
   const [order, setOrder] = useState<CreateOrderResponse | null>(null);
   const [modalOpen, setModalOpen] = useState(false);
   const [statusMessage, setStatusMessage] = useState<StatusMessage>(null);
@@ -118,6 +119,7 @@ export function RegistrationForm({
         });
 
         setPlayerId(resumePlayerId);
+        setPlayerEtag(playerData.etag ?? null);
 
         if (
           playerData.registration_status === "WAITLIST" ||
@@ -255,12 +257,17 @@ export function RegistrationForm({
       let response;
       if (playerId) {
         // Update existing player
-        response = await updatePlayer(playerId, formData);
+        // Never If-Match: * (it would overwrite concurrent edits); with no ETag in hand, fetch
+        // the current revision, and if the server still gives none let its 428 surface
+        const etag =
+          playerEtag ?? (await getPlayerDetails(playerId)).etag ?? null;
+        response = await updatePlayer(playerId, formData, etag);
       } else {
         // Register new player
         response = await registerPlayer(formData);
         setPlayerId(response.player_id);
       }
+      setPlayerEtag(response.etag ?? null);
 
       setStatusMessage({
         kind: "success",
@@ -2,6 +2,8 @@ export type RegisterResponse = {
   player_id: string;
   message: string;
   status?: string;
+  // Player revision from the ETag header; send it back as If-Match on updatePlayer
+  etag?: string | null;
 };
 
 export type CreateOrderResponse = {
@@ -46,6 +48,19 @@ export type PlayerDetailsResponse = {
   played_jypl_s7: string;
   jypl_s7_team: string;
   registration_status: string;
+  etag?: string | null;
+};
+
+export type PaymentStatusResponse = {
+  player_id: string;
+  payment_status: "CAPTURED" | "FAILED" | "PENDING" | "NONE";
+  registration_status: string;
+};
+
+export type WaitlistPositionResponse = {
+  player_id: string;
+  position: number;
+  waitlist_length: number;
 };
 
 export type PublicConfig = {
@@ -66,6 +81,13 @@ async function handleJson<T>(res: Response): Promise<T> {
   return res.json() as Promise<T>;
 }
 
+async function handleJsonWithEtag<T>(
+  res: Response,
+): Promise<T & { etag: string | null }> {
+  const body = await handleJson<T>(res);
+  return { ...body, etag: res.headers.get("ETag") };
+}
+
 export async function registerPlayer(
   formData: FormData,
 ): Promise<RegisterResponse> {
@@ -74,19 +96,22 @@ export async function registerPlayer(
     body: formData,
   });
 
-  return handleJson<RegisterResponse>(res);
+  return handleJsonWithEtag<RegisterResponse>(res);
 }
 
 export async function updatePlayer(
   playerId: string,
   formData: FormData,
+  etag: string | null,
 ): Promise<RegisterResponse> {
   const res = await fetch(`/api/player/${playerId}`, {
     method: "PUT",
+    // Without an ETag the server answers 428 rather than overwriting blindly
+    headers: etag ? { "If-Match": etag } : undefined,
     body: formData,
   });
 
-  return handleJson<RegisterResponse>(res);
+  return handleJsonWithEtag<RegisterResponse>(res);
 }
 
 export async function createOrder(
@@ -132,7 +157,93 @@ export async function getPlayerDetails(
   playerId: string,
 ): Promise<PlayerDetailsResponse> {
   const res = await fetch(`/api/player/${playerId}`);
-  return handleJson<PlayerDetailsResponse>(res);
+  return handleJsonWithEtag<PlayerDetailsResponse>(res);
+}
+
+export async function getPaymentStatus(
+  playerId: string,
+  waitSeconds = 0,
+): Promise<PaymentStatusResponse> {
+  const res = await fetch(
+    `/api/payments/status/${playerId}?wait=${waitSeconds}`,
+  );
+  return handleJson<PaymentStatusResponse>(res);
+}
+
+export async function getWaitlistPosition(
+  playerId: string,
+): Promise<WaitlistPositionResponse> {
+  const res = await fetch(`/api/waitlist/position?player_id=${playerId}`);
+  return handleJson<WaitlistPositionResponse>(res);
+}
+
+export type UploadStatus = {
+  upload_id: string;
+  field: "photo" | "visiting_card";
+  offset: number;
+  length: number;
+  complete: boolean;
+  chunk_bytes: number;
+  expires_at: string;
+};
+
+const UPLOAD_RETRY_DELAYS_MS = [1000, 2000, 5000, 10000, 20000];
+
+// Upload a file through /api/uploads in chunks, resuming from the server's offset after
+// network errors. Pass the returned upload_id as `<field>_upload_id` when registering.
+export async function uploadResumable(
+  file: File,
+  field: UploadStatus["field"],
+  onProgress?: (sent: number, total: number) => void,
+): Promise<string> {
+  const created = await fetch("/api/uploads", {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify({
+      field,
+      filename: file.name,
+      content_type: file.type,
+      length: file.size,
+    }),
+  });
+  let upload = await handleJson<UploadStatus>(created);
+  let failures = 0;
+
+  while (!upload.complete) {
+    const chunk = file.slice(upload.offset, upload.offset + upload.chunk_bytes);
+    try {
+      const res = await fetch(`/api/uploads/${upload.upload_id}`, {
+        method: "PATCH",
+        headers: {
+          "Content-Type": "application/offset+octet-stream",
+          "Upload-Offset": String(upload.offset),
+        },
+        body: chunk,
+      });
+      if (res.status === 409) {
+        // Our view of the offset is stale (e.g. a retried chunk had landed)
+        const current = await fetch(`/api/uploads/${upload.upload_id}`);
+        upload = await handleJson<UploadStatus>(current);
+        continue;
+      }
+      upload = await handleJson<UploadStatus>(res);
+      failures = 0;
+      onProgress?.(upload.offset, upload.length);
+    } catch (error) {
+      if (!(error instanceof TypeError) || failures >= UPLOAD_RETRY_DELAYS_MS.length) {
+        throw error;
+      }
+      // Network failure: wait, then ask the server how far it got
+      await new Promise((resolve) =>
+        setTimeout(resolve, UPLOAD_RETRY_DELAYS_MS[failures++]),
+      );
+      const current = await fetch(`/api/uploads/${upload.upload_id}`).catch(
+        () => null,
+      );
+      if (current) upload = await handleJson<UploadStatus>(current);
+    }
+  }
+  return upload.upload_id;
 }
 
 export async function getPublicConfig(): Promise<PublicConfig> {